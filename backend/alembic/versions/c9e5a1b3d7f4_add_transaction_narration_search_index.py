@@ -0,0 +1,46 @@
+"""add transaction narration search index
+
+Revision ID: c9e5a1b3d7f4
+Revises: b8d4f0a2c6e3
+Create Date: 2026-10-17 04:40:25.138782
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e5a1b3d7f4'
+down_revision: Union[str, Sequence[str], None] = 'b8d4f0a2c6e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Expression index, so it is written out rather than autogenerated
+NARRATION_SEARCH_VECTOR = "to_tsvector('simple'::regconfig, regexp_replace(narration, '[^[:alnum:]]+', ' ', 'g'))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built without blocking imports, which takes a while on large tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transaction_narration_search',
+            'transaction',
+            [sa.text(NARRATION_SEARCH_VECTOR)],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+    # The planner only has statistics for the indexed expression once the
+    # table is analyzed; until then it guesses that every search matches
+    # many rows and walks the date index instead
+    op.execute("ANALYZE transaction")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_transaction_narration_search', table_name='transaction', postgresql_concurrently=True)
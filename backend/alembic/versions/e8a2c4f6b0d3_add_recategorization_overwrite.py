@@ -0,0 +1,30 @@
+"""add recategorization overwrite
+
+Revision ID: e8a2c4f6b0d3
+Revises: d0f6b2c4e8a1
+Create Date: 2026-10-17 09:12:37.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a2c4f6b0d3'
+down_revision: Union[str, Sequence[str], None] = 'd0f6b2c4e8a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing jobs ran before categories were protected; they keep overwriting
+    op.add_column('recategorization', sa.Column('overwrite', sa.Boolean(), nullable=False, server_default=sa.true(), comment="Also recategorize transactions in categories other than 'others'"))
+    op.alter_column('recategorization', 'overwrite', server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('recategorization', 'overwrite')
@@ -1,12 +1,16 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import accounts, transactions, statement_formats, categories, analytics
+from app.api.v1.endpoints import accounts, transactions, statement_formats, categories, category_rules, recategorizations, analytics, imports, cache
 
 api_router = APIRouter()
 api_router.include_router(accounts.router, prefix="/accounts", tags=["accounts"])
 api_router.include_router(transactions.router, prefix="/transactions", tags=["transactions"])
 api_router.include_router(statement_formats.router, prefix="/statement-formats", tags=["statement-formats"])
 api_router.include_router(categories.router, prefix="/categories", tags=["categories"])
+api_router.include_router(category_rules.router, prefix="/category-rules", tags=["category-rules"])
+api_router.include_router(recategorizations.router, prefix="/recategorizations", tags=["recategorizations"])
 api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(imports.router, prefix="/imports", tags=["imports"])
+api_router.include_router(cache.router, prefix="/cache", tags=["cache"])
 
 from app.core.users import fastapi_users, auth_backend
 from app.schemas.user import UserRead, UserCreate, UserUpdate
@@ -0,0 +1,44 @@
+"""
+Conditional GET for list and analytics endpoints.
+
+conditional_get(*models) is a route dependency that derives an ETag from the
+change counters of the tables a response is built from (see
+crud_table_version.get_tag). The dependency runs before the endpoint: when the
+request's If-None-Match already holds that ETag it answers 304 Not Modified
+right away, so neither the endpoint's queries nor its serialization run.
+Otherwise the ETag is added to the response.
+
+Responses also carry Cache-Control: no-cache, which lets browsers keep them
+but makes them revalidate with If-None-Match on every use. No Last-Modified
+is sent: second-resolution dates cannot tell apart changes within the same
+second, which the counters can.
+"""
+from typing import Callable, Type
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import crud_table_version
+from app.db.base_class import Base
+from app.db.session import get_db
+
+
+def matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header value matches ``etag`` by weak comparison."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def conditional_get(*models: Type[Base]) -> Callable:
+    """Route dependency answering 304 while the tables of ``models`` are unchanged."""
+    async def check(request: Request, response: Response, db: AsyncSession = Depends(get_db)) -> None:
+        etag = f'W/"{await crud_table_version.get_tag(db, models)}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+    return check
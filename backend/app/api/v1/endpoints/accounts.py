@@ -1,13 +1,15 @@
 from typing import List, Any
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.conditional import conditional_get
 from app.db.session import get_db
+from app.models.account import BankAccount as BankAccountModel
 from app.schemas.account import BankAccount, BankAccountCreate, BankAccountUpdate
 from app.crud import crud_account
 
 router = APIRouter()
 
-@router.get("/", response_model=List[BankAccount])
+@router.get("/", response_model=List[BankAccount], dependencies=[Depends(conditional_get(BankAccountModel))])
 async def read_accounts(
     skip: int = 0,
     limit: int = 100,
@@ -1,84 +1,253 @@
-from typing import List
-from fastapi import APIRouter, Depends
+import math
+from datetime import date, datetime, timedelta
+from typing import Annotated, Any, List, Optional, Sequence, Tuple
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, select, cast, Date
+from sqlalchemy import Date, DateTime, String, cast, distinct, func, literal, null, select, union_all
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+from app.api.v1.conditional import conditional_get
+from app.core.cache import cached
+from app.crud.crud_rollup import ALL_CATEGORIES
 from app.db.session import get_db
+from app.models.category import Category
+from app.models.daily_category_rollup import DailyCategoryRollup
+from app.models.merchant import Merchant
 from app.models.transaction import Transaction
-from app.models.category import Category, transaction_category
-from app.schemas.analytics import ExpenseByCategory, ExpenseOverTime, ExpensesByCategoryResponse
+from app.schemas.analytics import AnalyticsResponse, ExpenseByCategory, ExpenseOverTime, ExpensesByCategoryResponse, Granularity, MerchantExpense
+from app.services.downsampling import lttb
 
-router = APIRouter()
+# Every analytics response is built from the rollups and category names, or
+# from transactions and merchants, which only change along with the rollups
+ANALYTICS_TABLES = (DailyCategoryRollup, Category)
+router = APIRouter(dependencies=[Depends(conditional_get(*ANALYTICS_TABLES))])
 
-@router.get("/expenses-by-category", response_model=ExpensesByCategoryResponse)
-async def get_expenses_by_category(
-    db: AsyncSession = Depends(get_db),
-    start_date: str | None = None,
-    end_date: str | None = None,
-):
-    """
-    Get total expenses grouped by category.
-    """
-    query = (
-        select(Category.name, func.sum(Transaction.withdrawal_amount).label("total"))
-        .join(transaction_category, Category.id == transaction_category.c.category_id)
-        .join(Transaction, transaction_category.c.transaction_id == Transaction.id)
-        .filter(Transaction.withdrawal_amount > 0)
-    )
+# Granularity=auto picks the finest granularity with at most this many buckets
+AUTO_BUCKETS = 120
+# Upper bound for max_points, the LTTB downsampling target
+MAX_POINTS = 5000
+# Most merchants top-merchants returns
+MAX_MERCHANTS = 100
+
+# Average bucket width in days, finest first
+BUCKET_DAYS = {
+    Granularity.day: 1,
+    Granularity.week: 7,
+    Granularity.month: 365.25 / 12,
+    Granularity.quarter: 365.25 / 4,
+    Granularity.year: 365.25,
+}
 
+def auto_granularity(first: date, last: date) -> Granularity:
+    """The finest granularity splitting ``first``..``last`` into at most AUTO_BUCKETS buckets."""
+    days = (last - first).days + 1
+    for granularity, width in BUCKET_DAYS.items():
+        if math.ceil(days / width) <= AUTO_BUCKETS:
+            return granularity
+    return Granularity.year
+
+def _expense_filter(start_date: datetime | None, end_date: datetime | None) -> ColumnElement:
+    """Rollup rows with expenses inside the (whole day) date bounds."""
+    expenses = DailyCategoryRollup.withdrawal_count > 0
     if start_date:
-        query = query.filter(Transaction.date >= start_date)
+        expenses &= DailyCategoryRollup.date >= start_date.date()
     if end_date:
-        query = query.filter(Transaction.date <= end_date)
-    
-    query = query.group_by(Category.name)
+        expenses &= DailyCategoryRollup.date <= end_date.date()
+    return expenses
 
-    result = await db.execute(query)
-    rows = result.all()
+async def _buckets(
+    db: AsyncSession,
+    granularity: Granularity,
+    expenses: ColumnElement,
+    start_date: datetime | None,
+    end_date: datetime | None,
+) -> Optional[Tuple[ColumnElement, ColumnElement]]:
+    """
+    The bucket date and days-with-expenses expressions for ``granularity``.
+
+    ``auto`` is resolved from the date bounds, looking up the first or last
+    day with expenses when a bound is missing; None means there are none.
+    """
+    if granularity == Granularity.auto:
+        first, last = (await db.execute(
+            select(func.min(DailyCategoryRollup.date), func.max(DailyCategoryRollup.date))
+            .filter(expenses & (DailyCategoryRollup.category_id == ALL_CATEGORIES))
+        )).one()
+        if first is None:
+            return None
+        granularity = auto_granularity(start_date.date() if start_date else first, end_date.date() if end_date else last)
 
-    total_expense = sum(r.total for r in rows) if rows else 0
+    if granularity == Granularity.day:
+        return DailyCategoryRollup.date, literal(1)
+    bucket = cast(func.date_trunc(granularity.value, cast(DailyCategoryRollup.date, DateTime)), Date)
+    return bucket, func.count(distinct(DailyCategoryRollup.date))
 
-    items = []
-    for name, amount in rows:
-        percentage = (amount / total_expense * 100) if total_expense > 0 else 0
-        items.append(ExpenseByCategory(
+def _category_totals(expenses: ColumnElement) -> Select:
+    """(name, total) of every category, summed by id before names are joined."""
+    totals = (
+        select(DailyCategoryRollup.category_id, func.sum(DailyCategoryRollup.withdrawal_total).label("total"))
+        .filter(expenses & (DailyCategoryRollup.category_id > ALL_CATEGORIES))
+        .group_by(DailyCategoryRollup.category_id)
+        .subquery()
+    )
+    return select(Category.name, totals.c.total).join(totals, Category.id == totals.c.category_id)
+
+def _time_series(expenses: ColumnElement, bucket: ColumnElement, days: ColumnElement) -> Select:
+    """(date, total, days) of every bucket, from the ALL_CATEGORIES rows."""
+    return (
+        select(bucket.label("date"), func.sum(DailyCategoryRollup.withdrawal_total).label("total"), days.label("days"))
+        .filter(expenses & (DailyCategoryRollup.category_id == ALL_CATEGORIES))
+        .group_by(bucket)
+    )
+
+def _category_items(rows: Sequence[Tuple[str, Any]]) -> List[ExpenseByCategory]:
+    """ExpenseByCategory items with percentages from (name, total) rows."""
+    total_expense = sum(total for _, total in rows)
+    return [
+        ExpenseByCategory(
             category_name=name,
             amount=float(amount),
-            percentage=round(percentage, 2)
-        ))
-    
+            percentage=round((amount / total_expense * 100) if total_expense > 0 else 0, 2),
+        )
+        for name, amount in rows
+    ]
+
+def _time_points(rows: Sequence[Tuple[date, Any, int]], max_points: Optional[int]) -> List[ExpenseOverTime]:
+    """ExpenseOverTime points from (date, total, days) rows, downsampled to ``max_points``."""
+    if max_points:
+        rows = [rows[i] for i in lttb([(day.toordinal(), float(total)) for day, total, _ in rows], max_points)]
+    return [ExpenseOverTime(date=day, amount=float(total), days=days) for day, total, days in rows]
+
+@router.get("/expenses-by-category", response_model=ExpensesByCategoryResponse)
+@cached("expenses-by-category", ExpensesByCategoryResponse, ANALYTICS_TABLES)
+async def get_expenses_by_category(
+    db: AsyncSession = Depends(get_db),
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+):
+    """
+    Get total expenses grouped by category.
+
+    Read from the daily rollups, so the date bounds cover whole days.
+    """
+    result = await db.execute(_category_totals(_expense_filter(start_date, end_date)))
+    items = _category_items(result.all())
+
     return ExpensesByCategoryResponse(
         items=items,
-        total_amount=float(total_expense)
+        total_amount=sum(item.amount for item in items)
     )
 
 @router.get("/expenses-over-time", response_model=List[ExpenseOverTime])
+@cached("expenses-over-time", List[ExpenseOverTime], ANALYTICS_TABLES)
 async def get_expenses_over_time(
     db: AsyncSession = Depends(get_db),
-    start_date: str | None = None,
-    end_date: str | None = None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    granularity: Granularity = Granularity.day,
+    max_points: Annotated[Optional[int], Query(ge=3, le=MAX_POINTS)] = None,
 ):
     """
     Get total expenses grouped by date.
-    """
-    # Cast datetime to date for grouping
-    date_cast = cast(Transaction.date, Date)
-    
-    query = (
-        select(date_cast.label("date"), func.sum(Transaction.withdrawal_amount).label("total"))
-        .filter(Transaction.withdrawal_amount > 0)
-    )
 
-    if start_date:
-        query = query.filter(Transaction.date >= start_date)
-    if end_date:
-        query = query.filter(Transaction.date <= end_date)
+    Read from the daily rollups, so the date bounds cover whole days.
+    Expenses are summed per day, week, month, quarter or year, each bucket
+    dated by its first day; ``auto`` picks the granularity from the width of
+    the range. ``max_points`` downsamples the buckets with LTTB.
+    """
+    expenses = _expense_filter(start_date, end_date)
+    buckets = await _buckets(db, granularity, expenses, start_date, end_date)
+    if buckets is None:
+        return []
 
-    query = query.group_by(date_cast).order_by(date_cast)
+    query = _time_series(expenses, *buckets).order_by("date")
 
     result = await db.execute(query)
-    rows = result.all()
+    return _time_points(result.all(), max_points)
+
+@router.get("/dashboard", response_model=AnalyticsResponse)
+@cached("dashboard", AnalyticsResponse, ANALYTICS_TABLES)
+async def get_dashboard(
+    db: AsyncSession = Depends(get_db),
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    granularity: Granularity = Granularity.day,
+    max_points: Annotated[Optional[int], Query(ge=3, le=MAX_POINTS)] = None,
+):
+    """
+    Get expenses by category and over time for the dashboard.
+
+    Takes the parameters of expenses-over-time and returns what
+    expenses-by-category and expenses-over-time would in one statement.
+    Category totals come from the per-category rollup rows and the time
+    series from the ALL_CATEGORIES rows, so every rollup row in the range is
+    read once.
+    """
+    expenses = _expense_filter(start_date, end_date)
+    buckets = await _buckets(db, granularity, expenses, start_date, end_date)
+    if buckets is None:
+        return AnalyticsResponse(by_category=[], over_time=[])
 
+    categories = _category_totals(expenses).subquery()
+    series = _time_series(expenses, *buckets).subquery()
+    rows = union_all(
+        select(categories.c.name, cast(null(), Date).label("date"), categories.c.total, literal(0).label("days")),
+        select(cast(null(), String), series.c.date, series.c.total, series.c.days),
+    ).subquery()
+
+    result = await db.execute(select(rows).order_by(rows.c.date))
+    by_category, over_time = [], []
+    for name, day, total, days in result.all():
+        if name is None:
+            over_time.append((day, total, days))
+        else:
+            by_category.append((name, total))
+
+    return AnalyticsResponse(
+        by_category=_category_items(by_category),
+        over_time=_time_points(over_time, max_points),
+    )
+
+@router.get("/top-merchants", response_model=List[MerchantExpense])
+@cached("top-merchants", List[MerchantExpense], ANALYTICS_TABLES)
+async def get_top_merchants(
+    db: AsyncSession = Depends(get_db),
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_MERCHANTS)] = 10,
+):
+    """
+    Get the merchants with the largest total expenses, largest first.
+
+    Merchants are extracted from narrations when transactions are stored,
+    so this is a GROUP BY on the merchant_id of expenses, which the
+    ix_transaction_merchant_expense index can answer without the table.
+    Date bounds cover whole days, as for the rollup based endpoints.
+    Transactions without a recognised merchant are left out.
+    """
+    expenses = (Transaction.withdrawal_amount > 0) & Transaction.merchant_id.is_not(None)
+    if start_date:
+        expenses &= Transaction.date >= datetime.combine(start_date.date(), datetime.min.time())
+    if end_date:
+        expenses &= Transaction.date < datetime.combine(end_date.date() + timedelta(days=1), datetime.min.time())
+    totals = (
+        select(
+            Transaction.merchant_id,
+            func.sum(Transaction.withdrawal_amount).label("total"),
+            func.count().label("count"),
+        )
+        .filter(expenses)
+        .group_by(Transaction.merchant_id)
+        .order_by(func.sum(Transaction.withdrawal_amount).desc(), Transaction.merchant_id)
+        .limit(limit)
+        .subquery()
+    )
+    result = await db.execute(
+        select(Merchant.id, Merchant.name, totals.c.total, totals.c.count)
+        .join(totals, Merchant.id == totals.c.merchant_id)
+        .order_by(totals.c.total.desc(), Merchant.id)
+    )
     return [
-        ExpenseOverTime(date=r.date, amount=float(r.total))
-        for r in rows
+        MerchantExpense(merchant_id=id, merchant_name=name, amount=float(total), count=count)
+        for id, name, total, count in result.all()
     ]
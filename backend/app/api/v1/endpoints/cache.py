@@ -0,0 +1,13 @@
+from typing import Any
+from fastapi import APIRouter
+from app.core.cache import analytics_cache
+from app.schemas.cache import CacheStats
+
+router = APIRouter()
+
+@router.get("/stats", response_model=CacheStats)
+async def read_cache_stats() -> Any:
+    """
+    Get hit, miss and eviction counts of this worker's analytics cache.
+    """
+    return analytics_cache.stats()
@@ -2,14 +2,16 @@ from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.conditional import conditional_get
 from app.db.session import get_db
+from app.models.category import Category as CategoryModel
 from app.crud import crud_category
 from app.schemas.category import Category, CategoryCreate, CategoryUpdate
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[Category])
+@router.get("/", response_model=List[Category], dependencies=[Depends(conditional_get(CategoryModel))])
 async def read_categories(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
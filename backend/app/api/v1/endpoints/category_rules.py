@@ -0,0 +1,93 @@
+from typing import Any, List
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.conditional import conditional_get
+from app.db.session import get_db
+from app.models.category_rule import CategoryRule as CategoryRuleModel
+from app.crud import crud_category, crud_category_rule
+from app.schemas.category_rule import CategoryRule, CategoryRuleCreate, CategoryRuleUpdate
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[CategoryRule], dependencies=[Depends(conditional_get(CategoryRuleModel))])
+async def read_category_rules(
+    db: AsyncSession = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+) -> Any:
+    """
+    Retrieve category rules in precedence order.
+    """
+    return await crud_category_rule.get_multi(db, skip=skip, limit=limit)
+
+
+@router.post("/", response_model=CategoryRule)
+async def create_category_rule(
+    *,
+    db: AsyncSession = Depends(get_db),
+    rule_in: CategoryRuleCreate,
+) -> Any:
+    """
+    Create a category rule. It applies to transactions created or imported from now on.
+    """
+    if not await crud_category.get(db=db, id=rule_in.category_id):
+        raise HTTPException(status_code=404, detail="Category not found")
+    return await crud_category_rule.create(db=db, obj_in=rule_in)
+
+
+@router.get("/{id}", response_model=CategoryRule)
+async def read_category_rule(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+) -> Any:
+    """
+    Get category rule by ID.
+    """
+    rule = await crud_category_rule.get(db=db, id=id)
+    if not rule:
+        raise HTTPException(status_code=404, detail="Category rule not found")
+    return rule
+
+
+@router.put("/{id}", response_model=CategoryRule)
+async def update_category_rule(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+    rule_in: CategoryRuleUpdate,
+) -> Any:
+    """
+    Update a category rule.
+    """
+    rule = await crud_category_rule.get(db=db, id=id)
+    if not rule:
+        raise HTTPException(status_code=404, detail="Category rule not found")
+    # The updated rule must still be a valid rule as a whole
+    try:
+        updated = CategoryRuleCreate.model_validate(
+            {**CategoryRule.model_validate(rule).model_dump(), **rule_in.model_dump(exclude_unset=True)}
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=e.errors()[0]["msg"])
+    if not await crud_category.get(db=db, id=updated.category_id):
+        raise HTTPException(status_code=404, detail="Category not found")
+    return await crud_category_rule.update(db=db, db_obj=rule, obj_in=rule_in)
+
+
+@router.delete("/{id}", response_model=CategoryRule)
+async def delete_category_rule(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+) -> Any:
+    """
+    Delete a category rule.
+    """
+    rule = await crud_category_rule.get(db=db, id=id)
+    if not rule:
+        raise HTTPException(status_code=404, detail="Category rule not found")
+    return await crud_category_rule.remove(db=db, id=id)
@@ -0,0 +1,26 @@
+from typing import Any, List
+from fastapi import APIRouter, HTTPException
+from app.schemas.import_job import ImportJob
+from app.services.import_jobs import import_jobs
+
+router = APIRouter()
+
+@router.get("/", response_model=List[ImportJob])
+async def read_import_jobs() -> Any:
+    """
+    Retrieve recent import jobs, newest first.
+    """
+    return import_jobs.list()
+
+@router.get("/{id}", response_model=ImportJob)
+async def read_import_job(
+    *,
+    id: str,
+) -> Any:
+    """
+    Get the progress of an import job.
+    """
+    job = import_jobs.get(id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
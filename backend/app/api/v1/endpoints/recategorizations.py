@@ -0,0 +1,89 @@
+from typing import Any, List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.crud import crud_recategorization
+from app.schemas.recategorization import Recategorization, RecategorizationCreate
+from app.services import recategorization
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[Recategorization])
+async def read_recategorizations(
+    db: AsyncSession = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+) -> Any:
+    """
+    Retrieve recategorization jobs, newest first.
+    """
+    return await crud_recategorization.get_multi(db, skip=skip, limit=limit)
+
+
+@router.post("/", response_model=Recategorization, status_code=202)
+async def create_recategorization(
+    *,
+    db: AsyncSession = Depends(get_db),
+    job_in: RecategorizationCreate,
+) -> Any:
+    """
+    Start applying the current category rules to existing transactions.
+
+    The job runs in the background; poll /recategorizations/{id} for progress.
+    """
+    job = await crud_recategorization.create(db=db, obj_in=job_in)
+    recategorization.start(job.id)
+    return job
+
+
+@router.get("/{id}", response_model=Recategorization)
+async def read_recategorization(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+) -> Any:
+    """
+    Get the progress of a recategorization job.
+    """
+    job = await crud_recategorization.get(db=db, id=id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Recategorization not found")
+    return job
+
+
+@router.post("/{id}/pause", response_model=Recategorization)
+async def pause_recategorization(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+) -> Any:
+    """
+    Pause a running job after its current batch.
+    """
+    job = await crud_recategorization.get(db=db, id=id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Recategorization not found")
+    if job.status != "running":
+        raise HTTPException(status_code=400, detail=f"Cannot pause a {job.status} recategorization")
+    return await crud_recategorization.set_status(db=db, db_obj=job, status="paused")
+
+
+@router.post("/{id}/resume", response_model=Recategorization, status_code=202)
+async def resume_recategorization(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+) -> Any:
+    """
+    Resume a paused or failed job after the last batch it committed.
+    """
+    job = await crud_recategorization.get(db=db, id=id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Recategorization not found")
+    if job.status not in ("paused", "failed"):
+        raise HTTPException(status_code=400, detail=f"Cannot resume a {job.status} recategorization")
+    job = await crud_recategorization.set_status(db=db, db_obj=job, status="running")
+    recategorization.start(job.id)
+    return job
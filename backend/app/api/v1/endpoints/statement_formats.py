@@ -1,13 +1,15 @@
 from typing import List, Any
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.conditional import conditional_get
 from app.db.session import get_db
+from app.models.statement_format import StatementFormat as StatementFormatModel
 from app.schemas.statement_format import StatementFormat, StatementFormatCreate, StatementFormatUpdate
 from app.crud import crud_statement_format
 
 router = APIRouter()
 
-@router.get("/", response_model=List[StatementFormat])
+@router.get("/", response_model=List[StatementFormat], dependencies=[Depends(conditional_get(StatementFormatModel))])
 async def read_statement_formats(
     skip: int = 0,
     limit: int = 100,
@@ -1,27 +1,178 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, BinaryIO, List, NamedTuple, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
+import hashlib
 import tempfile
 import os
-from app.db.session import get_db
-from app.crud import crud_transaction
+from app.core.config import settings
+from app.api.v1.conditional import conditional_get
+from app.db.session import AsyncSessionLocal, get_db
+from app.models.category import Category as CategoryModel
+from app.models.transaction import Transaction as TransactionModel
+from app.crud import crud_account, crud_category, crud_import_file, crud_transaction
 from app.crud import statement_format as crud_statement_format
-from app.schemas.transaction import Transaction, TransactionCreate, TransactionUpdate
-from app.services.statement_parser import extract_transactions
+from app.schemas.import_job import ImportJob
+from app.schemas.transaction import (
+    ExportFormat,
+    Transaction,
+    TransactionBatchItem,
+    TransactionBatchResult,
+    TransactionBatchSelection,
+    TransactionBatchUpdate,
+    TransactionCreate,
+    TransactionFilter,
+    TransactionPage,
+    TransactionUpdate,
+)
+from app.services import transaction_export
+from app.services.import_jobs import import_jobs, run_import_job
 
 router = APIRouter()
 
-@router.get("/", response_model=List[Transaction])
+SUPPORTED_EXTENSIONS = ('.xls', '.xlsx', '.csv', '.tsv')
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Largest page GET /transactions/ returns
+MAX_PAGE_SIZE = 1000
+# Most transactions one batch request may change
+MAX_BATCH_SIZE = 10_000
+
+class SavedUpload(NamedTuple):
+    path: str
+    sha256: str
+    size: int
+
+@router.get("/", response_model=TransactionPage, dependencies=[Depends(conditional_get(TransactionModel, CategoryModel))])
 async def read_transactions(
     db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    account_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category_id: Optional[int] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None,
+    narration: Optional[str] = None,
+) -> Any:
+    """
+    Retrieve transactions, newest first.
+    
+    Results are paged by cursor: pass the returned next_cursor back as
+    ``cursor`` to get the following page.
+    """
+    try:
+        after = crud_transaction.decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    filters = TransactionFilter(
+        account_id=account_id,
+        start_date=start_date,
+        end_date=end_date,
+        category_id=category_id,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        narration=narration,
+    )
+    # One extra row tells whether there is a next page
+    transactions = await crud_transaction.get_multi(db, filters=filters, after=after, limit=limit + 1)
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        next_cursor = crud_transaction.encode_cursor(transactions[-1])
+    return TransactionPage(items=transactions, next_cursor=next_cursor)
+
+@router.get("/search", response_model=TransactionPage, dependencies=[Depends(conditional_get(TransactionModel, CategoryModel))])
+async def search_transactions(
+    db: AsyncSession = Depends(get_db),
+    q: str = Query(..., min_length=1),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    account_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category_id: Optional[int] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None,
+) -> Any:
+    """
+    Search transaction narrations for the words of ``q``.
+    
+    Transactions containing every word come first, then those with words
+    starting with them, each newest first. Results are paged by cursor like
+    GET /transactions/.
+    """
+    try:
+        after = crud_transaction.decode_search_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    filters = TransactionFilter(
+        account_id=account_id,
+        start_date=start_date,
+        end_date=end_date,
+        category_id=category_id,
+        min_amount=min_amount,
+        max_amount=max_amount,
+    )
+    # One extra row tells whether there is a next page
+    results = await crud_transaction.search(db, query=q, filters=filters, after=after, limit=limit + 1)
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = crud_transaction.encode_search_cursor(*results[-1])
+    return TransactionPage(items=[transaction for _, transaction in results], next_cursor=next_cursor)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_transactions(
+    format: ExportFormat = ExportFormat.ndjson,
+    account_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category_id: Optional[int] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None,
+    narration: Optional[str] = None,
 ) -> Any:
     """
-    Retrieve transactions.
+    Export every transaction matching the filters, newest first, as NDJSON, CSV or Parquet.
+    
+    Takes the filters of GET /transactions/. The file is streamed as it is
+    read from the database, so exports of any size start right away and use
+    a fixed amount of server memory.
     """
-    transactions = await crud_transaction.get_multi(db, skip=skip, limit=limit)
-    return transactions
+    if format == ExportFormat.parquet:
+        try:
+            transaction_export.require_pyarrow()
+        except RuntimeError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+    
+    filters = TransactionFilter(
+        account_id=account_id,
+        start_date=start_date,
+        end_date=end_date,
+        category_id=category_id,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        narration=narration,
+    )
+    
+    # The response outlives request dependencies, so the export reads through a session of its own
+    async def batches():
+        async with AsyncSessionLocal() as db:
+            async for batch in crud_transaction.stream_export(db, filters=filters):
+                yield batch
+    
+    return StreamingResponse(
+        transaction_export.encode(batches(), format),
+        media_type=transaction_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format.value}"'},
+    )
 
 @router.post("/", response_model=Transaction)
 async def create_transaction(
@@ -35,82 +186,178 @@ async def create_transaction(
     transaction = await crud_transaction.create(db=db, obj_in=transaction_in)
     return transaction
 
-@router.post("/upload", response_model=dict)
+@router.post("/upload", response_model=ImportJob, status_code=202)
 async def upload_transactions(
     *,
     db: AsyncSession = Depends(get_db),
+    response: Response,
     file: UploadFile = File(...),
     statement_format_id: int = Form(...),
     account_id: int = Form(...),
+    force: bool = Form(False),
 ) -> Any:
     """
-    Upload and import transactions from bank statement file (XLSX/XLS).
+    Upload a bank statement file (XLSX/XLS/CSV/TSV) and start importing it.
+    
+    The import runs in the background; poll /imports/{id} with the returned
+    job id for progress and the final summary. A file already imported into
+    the same account with the same statement format is not imported again:
+    a completed job carrying the earlier summary is returned with status 200.
     
     Args:
-        file: Bank statement file (XLSX/XLS)
+        file: Bank statement file (XLSX/XLS/CSV/TSV)
         statement_format_id: ID of the StatementFormat to use for parsing
         account_id: ID of the bank account to associate transactions with
+        force: Import the file even if it was imported before
         
     Returns:
-        Dictionary with number of imported transactions and summary
+        The pending import job, or the completed one for a repeated upload
     """
     # Validate statement format exists
     statement_format = await crud_statement_format.get(db=db, id=statement_format_id)
     if not statement_format:
         raise HTTPException(status_code=404, detail="Statement format not found")
     
+    # Validate account exists, before a job is started for it
+    if not await crud_account.get(db=db, id=account_id):
+        raise HTTPException(status_code=404, detail="Account not found")
+    
     # Validate file type
-    if not file.filename.endswith(('.xls', '.xlsx')):
+    if not file.filename.lower().endswith(SUPPORTED_EXTENSIONS):
         raise HTTPException(
             status_code=400, 
-            detail="Invalid file type. Only .xls and .xlsx files are supported"
+            detail="Invalid file type. Only .xls, .xlsx, .csv and .tsv files are supported"
         )
     
-    # Save uploaded file to temporary location
-    temp_file = None
+    # Save uploaded file to a temporary location; the import job deletes it when done
     try:
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-        
-        # Extract transactions using statement parser
-        transactions = extract_transactions(
-            file_path=temp_file_path,
-            statement_format=statement_format,
-            account_id=account_id
-        )
-        
-        if not transactions:
-            raise HTTPException(
-                status_code=400,
-                detail="No transactions found in the file"
-            )
-        
-        # Bulk insert transactions
-        created_transactions = await crud_transaction.create_bulk(db=db, objs_in=transactions)
-        
-        # Calculate summary
-        total_withdrawals = sum(t.withdrawal_amount for t in created_transactions)
-        total_deposits = sum(t.deposit_amount for t in created_transactions)
-        
-        return {
-            "success": True,
-            "count": len(created_transactions),
-            "total_withdrawals": float(total_withdrawals),
-            "total_deposits": float(total_deposits),
-            "net": float(total_deposits - total_withdrawals)
-        }
-        
+        upload = await save_upload(file, settings.MAX_UPLOAD_SIZE)
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
-    finally:
-        # Clean up temporary file
-        if temp_file and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
+        raise HTTPException(status_code=500, detail=f"Error saving file: {str(e)}")
+    
+    job = import_jobs.create(
+        filename=file.filename,
+        account_id=account_id,
+        statement_format_id=statement_format_id,
+        sha256=upload.sha256,
+        size=upload.size,
+    )
+    
+    if not force:
+        import_file = await crud_import_file.get_current(
+            db, sha256=upload.sha256, account_id=account_id, statement_format=statement_format
+        )
+        if import_file:
+            os.unlink(upload.path)
+            job.complete_from(import_file)
+            response.status_code = 200
+            return job
+    
+    import_jobs.start(job, run_import_job(
+        job,
+        file_path=upload.path,
+        statement_format=statement_format,
+        batch_size=settings.IMPORT_BATCH_SIZE,
+        engine=settings.STATEMENT_PARSER_ENGINE,
+    ))
+    return job
+
+async def save_upload(file: UploadFile, max_size: int) -> SavedUpload:
+    """
+    Copy an upload to a temporary file in fixed-size chunks, hashing it on the way.
+    
+    By the time the endpoint runs, Starlette has already received the whole
+    request body into its own spooled file, so the size limit does not save
+    receiving an oversized upload; it is checked as chunks are copied so such
+    a file is not copied or hashed past the limit. The copy reads from the
+    spooled file one chunk at a time rather than loading it whole. Returns the
+    path of the temporary file with the file's SHA-256 and size.
+    """
+    too_large = HTTPException(status_code=413, detail=f"File too large. The limit is {max_size / (1024 * 1024):.4g} MB")
+    if file.size is not None and file.size > max_size:
+        raise too_large
+    
+    fd, temp_file_path = tempfile.mkstemp(suffix=os.path.splitext(file.filename)[1])
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            size = 0
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise too_large
+                await run_in_threadpool(_write_chunk, temp_file, digest, chunk)
+    except BaseException:
+        os.unlink(temp_file_path)
+        raise
+    return SavedUpload(temp_file_path, digest.hexdigest(), size)
+
+def _write_chunk(temp_file: BinaryIO, digest: Any, chunk: bytes) -> None:
+    digest.update(chunk)
+    temp_file.write(chunk)
+
+async def _batch_ids(db: AsyncSession, selection: TransactionBatchSelection) -> List[int]:
+    """Ids of the transactions a batch request selects, rejecting batches over MAX_BATCH_SIZE."""
+    if selection.ids is not None:
+        ids = list(dict.fromkeys(selection.ids))
+    else:
+        ids = await crud_transaction.get_ids(db, filters=selection.filters, limit=MAX_BATCH_SIZE + 1)
+    if len(ids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch can change at most {MAX_BATCH_SIZE} transactions; narrow the selection",
+        )
+    return ids
+
+def _batch_result(ids: List[int], done: List[int], status: str) -> TransactionBatchResult:
+    done = set(done)
+    return TransactionBatchResult(
+        items=[TransactionBatchItem(id=id, status=status if id in done else "not_found") for id in ids],
+        not_found=len(ids) - len(done),
+        **{status: len(done)},
+    )
+
+@router.post("/batch/update", response_model=TransactionBatchResult)
+async def update_transactions(
+    *,
+    db: AsyncSession = Depends(get_db),
+    batch_in: TransactionBatchUpdate,
+) -> Any:
+    """
+    Apply the same changes to many transactions in one database transaction.
+    
+    Transactions are selected by ``ids`` or by ``filters`` (those of
+    GET /transactions/), up to MAX_BATCH_SIZE of them. ``category_ids`` in the
+    changes replaces the categories of every selected transaction. Each
+    selected id is reported as updated or not_found.
+    """
+    changes = batch_in.changes
+    if changes.account_id is not None and not await crud_account.get(db=db, id=changes.account_id):
+        raise HTTPException(status_code=404, detail="Account not found")
+    for category_id in changes.category_ids or []:
+        if not await crud_category.get(db=db, id=category_id):
+            raise HTTPException(status_code=404, detail="Category not found")
+    ids = await _batch_ids(db, batch_in)
+    updated = await crud_transaction.update_many(db=db, ids=ids, obj_in=changes) if ids else []
+    return _batch_result(ids, updated, "updated")
+
+@router.post("/batch/delete", response_model=TransactionBatchResult)
+async def delete_transactions(
+    *,
+    db: AsyncSession = Depends(get_db),
+    batch_in: TransactionBatchSelection,
+) -> Any:
+    """
+    Delete many transactions in one database transaction.
+    
+    Transactions are selected like for /batch/update. Each selected id is
+    reported as deleted or not_found.
+    """
+    ids = await _batch_ids(db, batch_in)
+    deleted = await crud_transaction.remove_many(db=db, ids=ids) if ids else []
+    return _batch_result(ids, deleted, "deleted")
 
 @router.get("/{id}", response_model=Transaction)
 async def read_transaction(
@@ -0,0 +1,218 @@
+"""
+Cache for analytics responses.
+
+Analytics are read far more often than transactions change, so endpoint
+results are cached under a key made of the endpoint name, its parameters and
+a data version: the tag of the change counters of the tables the endpoint
+reads (see crud_table_version.get_tag). Every write bumps the counters of
+the tables it changes, so entries cached before it are never read again and
+age out of the cache. Being the value the ETag of the same response is
+derived from (see app.api.v1.conditional), a cached response always matches
+the ETag it is sent with, whichever worker cached it.
+
+Entries live in a bounded in-process LRU (ANALYTICS_CACHE_SIZE entries).
+With ANALYTICS_CACHE_URL set (redis://...), entries are also kept in a
+shared store so every worker sees the others' results; the redis package is
+then required.
+
+The shared store is anything with the async get/set methods of
+redis.asyncio.Redis, so tests can pass a local stand-in to AnalyticsCache.
+Failures of the shared store are logged and the cache falls back to the
+local LRU, so they never fail a request.
+"""
+import functools
+import inspect
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, Protocol, Sequence, Tuple, Type, TypeVar
+
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.crud import crud_table_version
+from app.db.base_class import Base
+
+T = TypeVar("T")
+
+KEY_PREFIX = "analytics"
+
+logger = logging.getLogger(__name__)
+
+
+class SharedStore(Protocol):
+    async def get(self, key: str) -> Optional[bytes]: ...
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None) -> Any: ...
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    shared_hits: int = 0
+    evictions: int = 0
+    shared_errors: int = 0
+    entries: int = 0
+    max_entries: int = 0
+    shared: bool = False
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry, with per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(found, value) for ``key``, marking it as most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+class AnalyticsCache:
+    def __init__(self, max_entries: int, ttl: int, shared: Optional[SharedStore] = None):
+        self.ttl = ttl
+        self.shared = shared
+        self._local = LRUCache(max_entries, ttl)
+        self._stats = CacheStats(max_entries=max_entries, shared=shared is not None)
+
+    @property
+    def enabled(self) -> bool:
+        return self._local.max_entries > 0
+
+    async def get_or_compute(
+        self,
+        name: str,
+        params: Dict[str, Any],
+        version: str,
+        response_type: Any,
+        compute: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        The cached result of ``name`` for ``params``, or ``compute()``'s, which is then cached.
+
+        ``version`` is the version of the data the result is computed from.
+        ``response_type`` is the type of the result, used to store it in the
+        shared store as JSON and validate it back.
+        """
+        if not self.enabled:
+            return await compute()
+
+        key = f"{KEY_PREFIX}:{version}:{name}:{json.dumps(params, sort_keys=True, default=_encode)}"
+        found, value = self._local.get(key)
+        if found:
+            self._stats.hits += 1
+            return value
+
+        adapter = TypeAdapter(response_type)
+        if self.shared is not None:
+            try:
+                stored = await self.shared.get(key)
+            except Exception as e:
+                stored = None
+                self._shared_failed("read an entry", e)
+            if stored is not None:
+                value = adapter.validate_json(stored)
+                self._local.set(key, value)
+                self._stats.hits += 1
+                self._stats.shared_hits += 1
+                return value
+
+        self._stats.misses += 1
+        value = await compute()
+        self._local.set(key, value)
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, adapter.dump_json(value), ex=self.ttl)
+            except Exception as e:
+                self._shared_failed("write an entry", e)
+        return value
+
+    def stats(self) -> CacheStats:
+        self._stats.entries = len(self._local)
+        self._stats.evictions = self._local.evictions
+        return CacheStats(**asdict(self._stats))
+
+    def _shared_failed(self, action: str, error: Exception) -> None:
+        self._stats.shared_errors += 1
+        logger.warning("Analytics cache: could not %s in the shared store: %s", action, error)
+
+
+def _encode(value: Any) -> Any:
+    """JSON form of parameter values json does not know, such as datetimes and enums."""
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def create_shared_store(url: str) -> SharedStore:
+    try:
+        import redis.asyncio
+    except ImportError as e:
+        raise RuntimeError("ANALYTICS_CACHE_URL needs the redis package (pip install redis)") from e
+    return redis.asyncio.from_url(url)
+
+
+analytics_cache = AnalyticsCache(
+    settings.ANALYTICS_CACHE_SIZE,
+    settings.ANALYTICS_CACHE_TTL,
+    create_shared_store(settings.ANALYTICS_CACHE_URL) if settings.ANALYTICS_CACHE_URL else None,
+)
+
+
+def cached(name: str, response_type: Any, models: Sequence[Type[Base]], exclude: Tuple[str, ...] = ("db",)):
+    """
+    Cache an async endpoint's results in analytics_cache.
+
+    The key is ``name``, the tag of the tables of ``models``, read with the
+    endpoint's ``db`` session, and every argument, defaults included, except
+    those in ``exclude``. The wrapper keeps the endpoint's signature for
+    FastAPI.
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            if not analytics_cache.enabled:
+                return await func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = {key: value for key, value in bound.arguments.items() if key not in exclude}
+            version = await crud_table_version.get_tag(bound.arguments["db"], models)
+            return await analytics_cache.get_or_compute(
+                name, params, version, response_type, lambda: func(*args, **kwargs)
+            )
+
+        return wrapper
+    return decorator
@@ -44,6 +44,26 @@ class Settings(BaseSettings):
 
         return f"postgresql+asyncpg://{postgres_user}:{postgres_password}@{postgres_server}:{postgres_port}/{postgres_db}"
 
+    # Statement import: "row" parses cell by cell, "columnar" a block of rows at a time
+    STATEMENT_PARSER_ENGINE: str = "row"
+    IMPORT_BATCH_SIZE: int = 1000
+    # Largest statement upload accepted, in bytes
+    MAX_UPLOAD_SIZE: int = 100 * 1024 * 1024
+    # Transactions recategorized per database transaction when rules are applied to existing ones
+    RECATEGORIZATION_BATCH_SIZE: int = 2000
+
+    # Pool for CPU-bound service calls such as statement parsing: "process" or "thread"
+    CPU_EXECUTOR_KIND: str = "process"
+    CPU_EXECUTOR_WORKERS: int = 2
+    # Scheduling niceness added to process workers so request handling keeps priority
+    CPU_EXECUTOR_NICENESS: int = 10
+
+    # Analytics response cache: entries kept per worker (0 disables it), seconds
+    # an entry lives, and an optional redis:// URL shared by every worker
+    ANALYTICS_CACHE_SIZE: int = 256
+    ANALYTICS_CACHE_TTL: int = 300
+    ANALYTICS_CACHE_URL: str = ""
+
     model_config = SettingsConfigDict(case_sensitive=True, env_file=".env")
 
 settings = Settings()
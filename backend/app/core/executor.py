@@ -0,0 +1,73 @@
+"""
+Executor for CPU-bound work.
+
+Synchronous, CPU-heavy service calls such as statement parsing must not run
+on the event loop, where they would stall every other request on the worker.
+They go through run_cpu_bound(), which hands them to a shared process or
+thread pool configured by CPU_EXECUTOR_KIND and CPU_EXECUTOR_WORKERS.
+
+A process pool sidesteps the GIL and is the default. Its workers run at a
+lower scheduling priority (CPU_EXECUTOR_NICENESS) so request handling wins
+when cores are scarce. Functions sent to it, and their arguments and
+results, must be picklable. A thread pool avoids process start-up and
+pickling but still shares the GIL with the event loop.
+"""
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_executor: Optional[Executor] = None
+
+
+def _lower_priority(niceness: int) -> None:
+    os.nice(niceness)
+
+
+def create_executor(kind: str, workers: int, niceness: int = 0) -> Executor:
+    if kind == "process":
+        # Spawned rather than forked so workers never inherit the event loop or open DB connections
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_lower_priority if niceness else None,
+            initargs=(niceness,),
+        )
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cpu")
+    raise ValueError(f"Unknown executor kind: {kind}")
+
+
+def get_executor() -> Executor:
+    """Shared executor for CPU-bound calls, created on first use."""
+    global _executor
+    if _executor is None:
+        _executor = create_executor(
+            settings.CPU_EXECUTOR_KIND, settings.CPU_EXECUTOR_WORKERS, settings.CPU_EXECUTOR_NICENESS
+        )
+    return _executor
+
+
+def run_cpu_bound(func: Callable[..., T], *args: Any, **kwargs: Any) -> "asyncio.Future[T]":
+    """
+    Run ``func(*args, **kwargs)`` on the CPU executor.
+
+    Returns an asyncio future, so callers can await the result directly or
+    keep the future and check on it while doing other work.
+    """
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executor() -> None:
+    """Stop the executor, cancelling calls that have not started yet."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -2,5 +2,11 @@ from app.crud import crud_account
 from app.crud import crud_transaction
 from app.crud import statement_format as crud_statement_format
 from app.crud import crud_category
+from app.crud import crud_import_file
+from app.crud import crud_rollup
+from app.crud import crud_table_version
+from app.crud import crud_category_rule
+from app.crud import crud_recategorization
+from app.crud import crud_merchant
 
-__all__ = ["crud_account", "crud_transaction", "crud_statement_format", "crud_category"]
+__all__ = ["crud_account", "crud_transaction", "crud_statement_format", "crud_category", "crud_import_file", "crud_rollup", "crud_table_version", "crud_category_rule", "crud_recategorization", "crud_merchant"]
@@ -1,7 +1,10 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.crud import crud_table_version
 from app.models.account import BankAccount
+from app.models.daily_category_rollup import DailyCategoryRollup
+from app.models.transaction import Transaction
 from app.schemas.account import BankAccountCreate, BankAccountUpdate
 
 async def get(db: AsyncSession, id: int) -> Optional[BankAccount]:
@@ -21,6 +24,7 @@ async def create(db: AsyncSession, obj_in: BankAccountCreate) -> BankAccount:
         metadata_=obj_in.metadata_,
     )
     db.add(db_obj)
+    await crud_table_version.bump(db, BankAccount)
     await db.commit()
     await db.refresh(db_obj)
     return db_obj
@@ -30,6 +34,7 @@ async def update(db: AsyncSession, *, db_obj: BankAccount, obj_in: BankAccountUp
     for field in update_data:
         setattr(db_obj, field, update_data[field])
     db.add(db_obj)
+    await crud_table_version.bump(db, BankAccount)
     await db.commit()
     await db.refresh(db_obj)
     return db_obj
@@ -38,5 +43,6 @@ async def remove(db: AsyncSession, *, id: int) -> BankAccount:
     result = await db.execute(select(BankAccount).filter(BankAccount.id == id))
     obj = result.scalars().first()
     await db.delete(obj)
+    await crud_table_version.bump(db, BankAccount, Transaction, DailyCategoryRollup)
     await db.commit()
     return obj
@@ -1,7 +1,11 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.crud import crud_table_version
 from app.models.category import Category
+from app.models.category_rule import CategoryRule
+from app.models.daily_category_rollup import DailyCategoryRollup
+from app.models.transaction import Transaction
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
 
@@ -24,6 +28,7 @@ async def create(db: AsyncSession, obj_in: CategoryCreate) -> Category:
         description=obj_in.description,
     )
     db.add(db_obj)
+    await crud_table_version.bump(db, Category)
     await db.commit()
     await db.refresh(db_obj)
     return db_obj
@@ -35,6 +40,7 @@ async def update(db: AsyncSession, *, db_obj: Category, obj_in: CategoryUpdate)
     for field in update_data:
         setattr(db_obj, field, update_data[field])
     db.add(db_obj)
+    await crud_table_version.bump(db, Category)
     await db.commit()
     await db.refresh(db_obj)
     return db_obj
@@ -42,8 +48,13 @@ async def update(db: AsyncSession, *, db_obj: Category, obj_in: CategoryUpdate)
 
 async def remove(db: AsyncSession, *, id: int) -> Category:
     """Delete a category."""
+    from app.crud import crud_category_rule, crud_rollup
+    
     result = await db.execute(select(Category).filter(Category.id == id))
     obj = result.scalars().first()
+    await crud_rollup.remove_category(db, id)
+    await crud_category_rule.remove_for_category(db, id)
     await db.delete(obj)
+    await crud_table_version.bump(db, Category, CategoryRule, Transaction, DailyCategoryRollup)
     await db.commit()
     return obj
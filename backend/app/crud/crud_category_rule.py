@@ -0,0 +1,93 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.crud import crud_table_version
+from app.models.category_rule import CategoryRule
+from app.schemas.category_rule import CategoryRuleCreate, CategoryRuleUpdate
+from app.services.categorization import Rule, RuleSet
+
+# The rules last read, or None when there were none, with the category_rule version they were read at
+_rule_set: Tuple[Optional[tuple], Optional[RuleSet]] = (None, None)
+
+
+async def get(db: AsyncSession, id: int) -> Optional[CategoryRule]:
+    result = await db.execute(select(CategoryRule).filter(CategoryRule.id == id))
+    return result.scalars().first()
+
+
+async def get_multi(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[CategoryRule]:
+    """Get rules in precedence order: highest priority first, then oldest first."""
+    result = await db.execute(
+        select(CategoryRule)
+        .order_by(CategoryRule.priority.desc(), CategoryRule.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def create(db: AsyncSession, obj_in: CategoryRuleCreate) -> CategoryRule:
+    db_obj = CategoryRule(**obj_in.model_dump())
+    db.add(db_obj)
+    await crud_table_version.bump(db, CategoryRule)
+    await db.commit()
+    await db.refresh(db_obj)
+    return db_obj
+
+
+async def update(db: AsyncSession, *, db_obj: CategoryRule, obj_in: CategoryRuleUpdate) -> CategoryRule:
+    update_data = obj_in.model_dump(exclude_unset=True)
+    for field in update_data:
+        setattr(db_obj, field, update_data[field])
+    db.add(db_obj)
+    await crud_table_version.bump(db, CategoryRule)
+    await db.commit()
+    await db.refresh(db_obj)
+    return db_obj
+
+
+async def remove(db: AsyncSession, *, id: int) -> CategoryRule:
+    result = await db.execute(select(CategoryRule).filter(CategoryRule.id == id))
+    obj = result.scalars().first()
+    await db.delete(obj)
+    await crud_table_version.bump(db, CategoryRule)
+    await db.commit()
+    return obj
+
+
+async def remove_for_category(db: AsyncSession, category_id: int) -> None:
+    """Delete the rules of a category in the session's transaction; the caller bumps and commits."""
+    await db.execute(delete(CategoryRule).where(CategoryRule.category_id == category_id))
+
+
+async def get_rule_set(db: AsyncSession) -> Optional[RuleSet]:
+    """
+    Every rule, as a RuleSet, or None when there are no rules.
+    
+    The rules are read again only when the category_rule table version
+    changes. They are compiled where they are matched, on the CPU executor
+    (see categorization.categorize_all), so neither reading nor compiling
+    thousands of rules holds up the event loop for long.
+    """
+    global _rule_set
+    # Read the version first: rules changed in between only cause a reread next time.
+    # The database is part of the key for processes using several, such as the tests.
+    version = (str(db.get_bind().url), *(await crud_table_version.get_versions(db, [CategoryRule])).values())
+    read_version, rule_set = _rule_set
+    if version == read_version:
+        return rule_set
+    
+    result = await db.execute(select(
+        CategoryRule.id,
+        CategoryRule.category_id,
+        CategoryRule.keyword,
+        CategoryRule.pattern,
+        CategoryRule.min_amount,
+        CategoryRule.max_amount,
+        CategoryRule.priority,
+    ))
+    rules = tuple(Rule(*row) for row in result.all())
+    rule_set = RuleSet(version, rules) if rules else None
+    _rule_set = (version, rule_set)
+    return rule_set
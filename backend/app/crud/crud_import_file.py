@@ -0,0 +1,80 @@
+from typing import Iterable, Optional
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+from app.models.import_file import ImportFile
+from app.models.statement_format import StatementFormat
+from app.schemas.transaction import TransactionImportSummary
+
+
+async def get_current(
+    db: AsyncSession,
+    *,
+    sha256: str,
+    account_id: int,
+    statement_format: StatementFormat
+) -> Optional[ImportFile]:
+    """
+    Get the recorded import of a file into an account with a statement format.
+    
+    Returns None when the statement format was changed after the import, since
+    the same file may then parse differently.
+    """
+    result = await db.execute(
+        select(ImportFile).filter(
+            ImportFile.sha256 == sha256,
+            ImportFile.account_id == account_id,
+            ImportFile.statement_format_id == statement_format.id,
+        )
+    )
+    import_file = result.scalars().first()
+    if import_file and import_file.updated_at < statement_format.updated_at:
+        return None
+    return import_file
+
+
+async def record(
+    db: AsyncSession,
+    *,
+    sha256: str,
+    filename: str,
+    size: int,
+    account_id: int,
+    statement_format_id: int,
+    summary: TransactionImportSummary
+) -> None:
+    """Record an imported file, replacing the summary of an earlier import of it"""
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    
+    values = {
+        "filename": filename,
+        "size": size,
+        "summary": summary.model_dump(mode="json"),
+    }
+    await db.execute(
+        dialect_insert(ImportFile)
+        .values(sha256=sha256, account_id=account_id, statement_format_id=statement_format_id, **values)
+        .on_conflict_do_update(
+            index_elements=[ImportFile.sha256, ImportFile.account_id, ImportFile.statement_format_id],
+            set_={**values, "updated_at": func.now()},
+        )
+    )
+    await db.commit()
+
+
+async def remove_for_accounts(db: AsyncSession, account_ids: Iterable[int]) -> None:
+    """
+    Forget the recorded imports into accounts that transactions were deleted from.
+    
+    Transactions do not record the file they came from, so every import into
+    those accounts is forgotten: uploading one of the files again imports it,
+    adding back the deleted rows and skipping the rest by their
+    fingerprints. Runs in the session's transaction; the caller commits.
+    """
+    account_ids = set(account_ids)
+    if account_ids:
+        await db.execute(delete(ImportFile).where(ImportFile.account_id.in_(account_ids)))
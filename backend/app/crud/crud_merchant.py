@@ -0,0 +1,123 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.crud import crud_table_version
+from app.models.account import BankAccount
+from app.models.daily_category_rollup import DailyCategoryRollup
+from app.models.merchant import Merchant
+from app.models.transaction import Transaction
+from app.services.merchant_extraction import get_extractor
+
+
+async def get_ids(db: AsyncSession, merchants: Dict[str, str]) -> Dict[str, int]:
+    """
+    Ids of the merchants keyed in ``merchants`` ({key: name}), adding those not seen before.
+    
+    On PostgreSQL new merchants are inserted in a short transaction of their
+    own, committed before this returns, rather than in the session's: an
+    import keeps its transaction open for the whole file, and holding the
+    merchants' unique keys that long would make concurrent imports of the
+    same merchants wait on each other, or deadlock when they meet them in a
+    different order. Keys are inserted sorted for the same reason. A merchant
+    left behind by a transaction that then fails is harmless. SQLite has a
+    single writer, so there the session's transaction is used.
+    """
+    if not merchants:
+        return {}
+    ids = await _find(db, merchants)
+    missing = [{"key": key, "name": merchants[key]} for key in sorted(merchants) if key not in ids]
+    if missing:
+        if db.get_bind().dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            
+            await db.execute(dialect_insert(Merchant).on_conflict_do_nothing(index_elements=[Merchant.key]), missing)
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            
+            async with db.bind.connect() as connection:
+                await connection.execute(
+                    dialect_insert(Merchant).on_conflict_do_nothing(index_elements=[Merchant.key]), missing
+                )
+                await connection.commit()
+        ids.update(await _find(db, [row["key"] for row in missing]))
+    return ids
+
+
+async def _find(db: AsyncSession, keys: Iterable[str]) -> Dict[str, int]:
+    result = await db.execute(select(Merchant.key, Merchant.id).filter(Merchant.key.in_(list(keys))))
+    return dict(result.all())
+
+
+async def resolve(
+    db: AsyncSession,
+    merchants: List[Optional[Tuple[str, str]]],
+    known: Optional[Dict[str, int]] = None,
+) -> List[Optional[int]]:
+    """
+    Ids of extracted merchants ((key, name), or None where no merchant was found).
+    
+    ``known`` caches {key: id} across calls, such as the batches of an
+    import, so each merchant is looked up once.
+    """
+    if known is None:
+        known = {}
+    new = {merchant[0]: merchant[1] for merchant in merchants if merchant and merchant[0] not in known}
+    known.update(await get_ids(db, new))
+    return [known[merchant[0]] if merchant else None for merchant in merchants]
+
+
+async def assign_batch(
+    db: AsyncSession,
+    *,
+    after: int,
+    batch_size: int,
+    known: Optional[Dict[str, int]] = None,
+) -> Tuple[Optional[int], int, int]:
+    """
+    Extract the merchants of the next ``batch_size`` transactions without one and commit.
+    
+    For transactions stored before merchants were extracted: transactions
+    with an id above ``after`` are read in id order and their merchant is
+    extracted with the patterns of their account's bank, then set with one
+    executemany UPDATE. Returns the last id read (None when
+    there are no more), the number of transactions read and the number
+    given a merchant. Transactions no pattern matches stay without one, so
+    they are read again by later runs.
+    """
+    result = await db.execute(
+        select(Transaction.id, Transaction.narration, BankAccount.bank_name)
+        .join(BankAccount, BankAccount.id == Transaction.account_id)
+        .filter(Transaction.id > after, Transaction.merchant_id.is_(None))
+        .order_by(Transaction.id)
+        .limit(batch_size)
+    )
+    rows = result.all()
+    if not rows:
+        await db.rollback()
+        return None, 0, 0
+    
+    by_bank: Dict[Optional[str], List[Tuple[int, str]]] = {}
+    for id, narration, bank_name in rows:
+        by_bank.setdefault(bank_name, []).append((id, narration))
+    assignments = []
+    for bank_name, bank_rows in by_bank.items():
+        extractor = get_extractor(bank_name)
+        merchant_ids = await resolve(db, [extractor.extract(narration) for _, narration in bank_rows], known)
+        assignments.extend(
+            (id, merchant_id) for (id, _), merchant_id in zip(bank_rows, merchant_ids) if merchant_id is not None
+        )
+    
+    if assignments:
+        # On the connection: the session would treat a list of parameters as an ORM bulk update
+        connection = await db.connection()
+        await connection.execute(
+            update(Transaction)
+            .where(Transaction.id == bindparam("transaction_id"))
+            .values(merchant_id=bindparam("new_merchant_id")),
+            [{"transaction_id": id, "new_merchant_id": merchant_id} for id, merchant_id in assignments],
+        )
+        # top-merchants shares the analytics ETag, which follows the rollups
+        await crud_table_version.bump(db, Transaction, DailyCategoryRollup)
+    await db.commit()
+    return rows[-1].id, len(rows), len(assignments)
@@ -0,0 +1,168 @@
+from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.executor import run_cpu_bound
+from app.crud import crud_category_rule
+from app.crud import crud_table_version
+from app.crud import crud_transaction
+from app.models.category import Category, transaction_category
+from app.models.daily_category_rollup import DailyCategoryRollup
+from app.models.recategorization import Recategorization
+from app.models.transaction import Transaction
+from app.schemas.recategorization import RecategorizationCreate
+from app.schemas.transaction import TransactionFilter
+from app.services.categorization import categorize_all
+
+
+async def get(db: AsyncSession, id: int) -> Optional[Recategorization]:
+    result = await db.execute(select(Recategorization).filter(Recategorization.id == id))
+    return result.scalars().first()
+
+
+async def get_multi(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Recategorization]:
+    """Get jobs newest first."""
+    result = await db.execute(
+        select(Recategorization).order_by(Recategorization.id.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def get_running_ids(db: AsyncSession) -> List[int]:
+    """Ids of the jobs that are running, or were until the server stopped."""
+    result = await db.execute(
+        select(Recategorization.id).filter(Recategorization.status == "running").order_by(Recategorization.id)
+    )
+    return result.scalars().all()
+
+
+async def create(db: AsyncSession, obj_in: RecategorizationCreate) -> Recategorization:
+    """
+    Create a running job over the transactions that exist now and match its filters.
+
+    Transactions added later are categorised by the rules as they are added,
+    so the job stops at the newest transaction at this point.
+    """
+    filters = obj_in.filters
+    result = await db.execute(crud_transaction.filtered(select(func.max(Transaction.id), func.count()), filters))
+    max_transaction_id, rows_total = result.one()
+    db_obj = Recategorization(
+        status="running",
+        filters=filters.model_dump(mode="json", exclude_none=True) if filters else None,
+        reset_unmatched=obj_in.reset_unmatched,
+        overwrite=obj_in.overwrite,
+        max_transaction_id=max_transaction_id or 0,
+        rows_total=rows_total,
+    )
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    return db_obj
+
+
+async def set_status(db: AsyncSession, *, db_obj: Recategorization, status: str) -> Recategorization:
+    """Pause a job, or mark it running again to resume it after its last batch."""
+    db_obj.status = status
+    if status == "running":
+        db_obj.error = None
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    return db_obj
+
+
+async def fail(db: AsyncSession, *, id: int, error: str) -> None:
+    db_obj = await get(db, id)
+    if db_obj:
+        db_obj.status = "failed"
+        db_obj.error = error
+        db.add(db_obj)
+        await db.commit()
+
+
+async def run_batch(db: AsyncSession, id: int, batch_size: int) -> Optional[Recategorization]:
+    """
+    Recategorize the next ``batch_size`` transactions of a running job and commit.
+
+    Unless the job overwrites categories, only transactions without one or
+    in 'others' alone are considered: the others were categorised by hand,
+    or by rules that may have changed since, and nothing records which.
+    The rules are evaluated in memory on the CPU executor (see
+    app.services.categorization.categorize_all) and only transactions whose
+    categories change are rewritten, with set-based statements
+    (crud_transaction.set_categories). Each batch holds the job's
+    row lock from reading the position to committing it with the changes, so
+    a batch is applied exactly once, even with several workers running the
+    same job. Returns the job, which is no longer running once the last
+    batch is done or it was paused, or None if it does not exist.
+    """
+    result = await db.execute(
+        select(Recategorization)
+        .filter(Recategorization.id == id)
+        .with_for_update()
+        # Read the committed position, not the one from the previous batch in this session
+        .execution_options(populate_existing=True)
+    )
+    job = result.scalars().first()
+    if job is None or job.status != "running":
+        # Ends the transaction, releasing the lock; unlike a rollback it keeps the job loaded
+        await db.commit()
+        return job
+
+    filters = TransactionFilter.model_validate(job.filters) if job.filters else None
+    result = await db.execute(
+        crud_transaction.filtered(
+            select(Transaction.id, Transaction.narration, Transaction.withdrawal_amount, Transaction.deposit_amount),
+            filters,
+        )
+        .filter(Transaction.id > job.last_transaction_id, Transaction.id <= job.max_transaction_id)
+        .order_by(Transaction.id)
+        .limit(batch_size)
+        # Keep concurrent updates of these transactions from moving their rollups in between
+        .with_for_update()
+    )
+    rows = result.mappings().all()
+    if not rows:
+        job.status = "completed"
+        job.finished_at = func.now()
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+    transaction_ids = [row["id"] for row in rows]
+    result = await db.execute(
+        select(transaction_category.c.transaction_id, transaction_category.c.category_id)
+        .filter(transaction_category.c.transaction_id.in_(transaction_ids))
+    )
+    current = {}
+    for transaction_id, category_id in result.all():
+        current.setdefault(transaction_id, set()).add(category_id)
+
+    matched = await run_cpu_bound(
+        categorize_all,
+        await crud_category_rule.get_rule_set(db),
+        [(row["narration"], row["withdrawal_amount"], row["deposit_amount"]) for row in rows],
+    )
+    result = await db.execute(select(Category.id).filter(Category.name == "others"))
+    others_id = result.scalars().first()
+    default_category_id = others_id if job.reset_unmatched else None
+
+    changes = {}
+    for transaction_id, category_id in zip(transaction_ids, matched):
+        if category_id is None:
+            category_id = default_category_id
+        # Without overwrite, categories chosen by hand are left alone
+        if not job.overwrite and current.get(transaction_id, set()) - {others_id}:
+            continue
+        if category_id is not None and current.get(transaction_id) != {category_id}:
+            changes[transaction_id] = category_id
+    await crud_transaction.set_categories(db, changes)
+
+    job.last_transaction_id = transaction_ids[-1]
+    job.rows_scanned += len(rows)
+    job.rows_changed += len(changes)
+    if changes:
+        await crud_table_version.bump(db, Transaction, DailyCategoryRollup)
+    await db.commit()
+    await db.refresh(job)
+    return job
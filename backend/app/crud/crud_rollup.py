@@ -0,0 +1,158 @@
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional, Sequence
+from sqlalchemy import and_, delete, func, literal, or_, true, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql.elements import ColumnElement
+from app.crud import crud_table_version
+from app.models.category import transaction_category
+from app.models.daily_category_rollup import DailyCategoryRollup
+from app.models.transaction import Transaction
+
+# category_id of the rollup rows totalling all transactions of an account and day
+ALL_CATEGORIES = 0
+
+KEY_COLUMNS = ("date", "account_id", "category_id")
+MEASURE_COLUMNS = ("withdrawal_total", "withdrawal_count", "deposit_total", "deposit_count", "transaction_count")
+
+
+@dataclass
+class RollupMismatch:
+    """A rollup row that differs from the totals of the transactions it covers."""
+    date: date
+    account_id: int
+    category_id: int
+    stored_withdrawal_total: Optional[Decimal]
+    expected_withdrawal_total: Optional[Decimal]
+    stored_deposit_total: Optional[Decimal]
+    expected_deposit_total: Optional[Decimal]
+    stored_count: Optional[int]
+    expected_count: Optional[int]
+
+
+def rollup_rows(where: Optional[ColumnElement] = None):
+    """
+    Rollup rows computed from the transactions matching ``where``, or from all of them.
+
+    Each transaction contributes to one row per category it is in plus the
+    ALL_CATEGORIES row of its account and day.
+    """
+    day = func.date(Transaction.date)
+    amounts = (Transaction.account_id, Transaction.withdrawal_amount, Transaction.deposit_amount)
+    every_transaction = select(day.label("date"), literal(ALL_CATEGORIES).label("category_id"), *amounts)
+    by_category = (
+        select(day.label("date"), transaction_category.c.category_id, *amounts)
+        .join(transaction_category, transaction_category.c.transaction_id == Transaction.id)
+    )
+    if where is not None:
+        every_transaction = every_transaction.where(where)
+        by_category = by_category.where(where)
+    rows = union_all(every_transaction, by_category).subquery()
+
+    withdrawn = rows.c.withdrawal_amount > 0
+    deposited = rows.c.deposit_amount > 0
+    return (
+        select(
+            rows.c.date,
+            rows.c.account_id,
+            rows.c.category_id,
+            func.coalesce(func.sum(rows.c.withdrawal_amount).filter(withdrawn), 0).label("withdrawal_total"),
+            func.count().filter(withdrawn).label("withdrawal_count"),
+            func.coalesce(func.sum(rows.c.deposit_amount).filter(deposited), 0).label("deposit_total"),
+            func.count().filter(deposited).label("deposit_count"),
+            func.count().label("transaction_count"),
+        )
+        .group_by(rows.c.date, rows.c.account_id, rows.c.category_id)
+    )
+
+
+async def apply(db: AsyncSession, transaction_ids: Sequence[int], sign: int = 1) -> None:
+    """
+    Add transactions to the rollups, or subtract them with ``sign=-1``.
+
+    Totals are read from the transactions as they are in the session's
+    database transaction, so call this after inserting (or before deleting)
+    them and their category links. Rows whose counts drop to zero are kept;
+    they read as zero and are removed by rebuild().
+    """
+    if not transaction_ids:
+        return
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+    deltas = rollup_rows(Transaction.id.in_(transaction_ids)).subquery()
+    statement = dialect_insert(DailyCategoryRollup).from_select(
+        [*KEY_COLUMNS, *MEASURE_COLUMNS],
+        select(
+            *(deltas.c[column] for column in KEY_COLUMNS),
+            *(deltas.c[column] * sign for column in MEASURE_COLUMNS),
+        )
+        # SQLite cannot tell ON CONFLICT from a join constraint without a WHERE
+        .where(true()),
+    )
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=list(KEY_COLUMNS),
+        set_={
+            column: getattr(DailyCategoryRollup, column) + statement.excluded[column]
+            for column in MEASURE_COLUMNS
+        },
+    ))
+
+
+async def remove_category(db: AsyncSession, category_id: int) -> None:
+    """Drop the rollups of a category; its transactions stay in the ALL_CATEGORIES rows."""
+    await db.execute(delete(DailyCategoryRollup).where(DailyCategoryRollup.category_id == category_id))
+
+
+async def find_mismatches(db: AsyncSession, limit: int = 100) -> List[RollupMismatch]:
+    """
+    Compare the stored rollups with totals recomputed from the transactions.
+
+    Stored rows with no transactions left are treated as absent. Returns up
+    to ``limit`` rows that differ, are missing or should not exist.
+    """
+    expected = rollup_rows().subquery()
+    stored = (
+        select(DailyCategoryRollup)
+        .where(DailyCategoryRollup.transaction_count != 0)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            func.coalesce(stored.c.date, expected.c.date),
+            func.coalesce(stored.c.account_id, expected.c.account_id),
+            func.coalesce(stored.c.category_id, expected.c.category_id),
+            stored.c.withdrawal_total,
+            expected.c.withdrawal_total,
+            stored.c.deposit_total,
+            expected.c.deposit_total,
+            stored.c.transaction_count,
+            expected.c.transaction_count,
+        )
+        .select_from(stored.outerjoin(
+            expected,
+            and_(*(stored.c[column] == expected.c[column] for column in KEY_COLUMNS)),
+            full=True,
+        ))
+        .where(or_(*(
+            stored.c[column].is_distinct_from(expected.c[column])
+            for column in (*KEY_COLUMNS, *MEASURE_COLUMNS)
+        )))
+        .limit(limit)
+    )
+    return [RollupMismatch(*row) for row in result.all()]
+
+
+async def rebuild(db: AsyncSession) -> int:
+    """Recompute every rollup row from the transactions, returning the number of rows written."""
+    await db.execute(delete(DailyCategoryRollup))
+    result = await db.execute(
+        DailyCategoryRollup.__table__.insert().from_select([*KEY_COLUMNS, *MEASURE_COLUMNS], rollup_rows())
+    )
+    await crud_table_version.bump(db, DailyCategoryRollup)
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,52 @@
+import hashlib
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple, Type
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+from app.models.table_version import TableVersion
+
+
+async def bump(db: AsyncSession, *models: Type[Base]) -> None:
+    """
+    Count a change to the tables of ``models`` in the session's transaction.
+    
+    Concurrent writers of the same table queue on its counter row until the
+    first one commits, so call this last, right before committing.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    
+    # Sorted so concurrent bumps of several tables lock their rows in the same order
+    for table_name in sorted({model.__tablename__ for model in models}):
+        statement = dialect_insert(TableVersion).values(table_name=table_name, version=1)
+        await db.execute(statement.on_conflict_do_update(
+            index_elements=[TableVersion.table_name],
+            set_={"version": TableVersion.version + 1, "updated_at": func.now()},
+        ))
+
+
+async def get_versions(db: AsyncSession, models: Sequence[Type[Base]]) -> Dict[str, Tuple[int, Optional[datetime]]]:
+    """(version, time of the last change) of each table of ``models``; (0, None) for tables never counted."""
+    table_names = [model.__tablename__ for model in models]
+    result = await db.execute(
+        select(TableVersion.table_name, TableVersion.version, TableVersion.updated_at)
+        .filter(TableVersion.table_name.in_(table_names))
+    )
+    versions = dict.fromkeys(table_names, (0, None))
+    versions.update((table_name, (version, updated_at)) for table_name, version, updated_at in result.all())
+    return versions
+
+
+async def get_tag(db: AsyncSession, models: Sequence[Type[Base]]) -> str:
+    """
+    Short digest of the versions of the tables of ``models``, which changes with every change to them.
+    
+    The time of each table's last change is hashed in too, so counters
+    starting over in a recreated database do not repeat earlier tags.
+    """
+    versions = await get_versions(db, models)
+    return hashlib.sha1(repr(sorted(versions.items())).encode()).hexdigest()[:20]
@@ -1,9 +1,50 @@
-from typing import List, Optional
+import json
+import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from sqlalchemy import Select, delete, exists, func, insert, text, tuple_, update as sql_update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from app.models.transaction import Transaction
-from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.core.executor import run_cpu_bound
+from app.crud import crud_category_rule
+from app.crud import crud_import_file
+from app.crud import crud_merchant
+from app.crud import crud_rollup
+from app.crud import crud_table_version
+from app.models.daily_category_rollup import DailyCategoryRollup
+from app.models.transaction import NARRATION_SEARCH_CONFIG, Transaction, narration_search_vector
+from app.schemas.transaction import TransactionCreate, TransactionFilter, TransactionImportSummary, TransactionUpdate
+from app.services.categorization import RuleSet, categorize_all
+from app.services.columnar_parser import TransactionColumns
+from app.services.merchant_extraction import MerchantExtractor, get_extractor
+from app.services.transaction_fingerprint import FingerprintAssigner
+
+TransactionBatch = Union[List[TransactionCreate], TransactionColumns]
+# (date, id) of the last transaction on a page
+TransactionCursor = Tuple[datetime, int]
+# (tier, date, id) of the last transaction on a search results page
+SearchCursor = Tuple[int, datetime, int]
+
+# Search result tiers, best first: every query word is a word of the
+# narration, or only the start of one
+SEARCH_WORD, SEARCH_PREFIX = 0, 1
+
+# Transaction table columns written by the COPY import path, in record order
+COPY_COLUMNS = ("account_id", "date", "narration", "withdrawal_amount", "deposit_amount", "metadata", "fingerprint", "merchant_id")
+# Staging table columns: the transaction columns, then the category of the row
+STAGING_COLUMNS = (*COPY_COLUMNS, "category_id")
+
+# Temporary table COPY batches are staged in before moving into transaction
+STAGING_TABLE = "transaction_import"
+
+# Rows fetched per round trip by stream_export()
+EXPORT_BATCH_SIZE = 5000
+
+# daily_category_rollup columns written by the COPY import path
+ROLLUP_COLUMNS = ", ".join((*crud_rollup.KEY_COLUMNS, *crud_rollup.MEASURE_COLUMNS))
 
 async def get(db: AsyncSession, id: int) -> Optional[Transaction]:
     result = await db.execute(
@@ -13,15 +54,196 @@ async def get(db: AsyncSession, id: int) -> Optional[Transaction]:
     )
     return result.scalars().first()
 
-async def get_multi(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Transaction]:
+async def get_multi(
+    db: AsyncSession,
+    *,
+    filters: Optional[TransactionFilter] = None,
+    after: Optional[TransactionCursor] = None,
+    limit: int = 100,
+) -> List[Transaction]:
+    """
+    Get transactions newest first, ordered by (date, id).
+    
+    Pages are read by keyset: ``after`` is the (date, id) of the last
+    transaction of the previous page, and the query seeks past it on the
+    (date, id) or (account_id, date, id) index, so deep pages cost the same
+    as the first one.
+    """
+    query = filtered(select(Transaction).options(selectinload(Transaction.categories)), filters)
+    
+    if after:
+        query = query.filter(tuple_(Transaction.date, Transaction.id) < tuple_(*after))
+    
     result = await db.execute(
-        select(Transaction)
-        .options(selectinload(Transaction.categories))
-        .offset(skip)
+        query
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
         .limit(limit)
     )
     return result.scalars().all()
 
+def filtered(query: Select, filters: Optional[TransactionFilter]) -> Select:
+    """``query`` restricted to the transactions matching ``filters``."""
+    from app.models.category import transaction_category
+    
+    if not filters:
+        return query
+    if filters.account_id is not None:
+        query = query.filter(Transaction.account_id == filters.account_id)
+    if filters.start_date:
+        query = query.filter(Transaction.date >= filters.start_date)
+    if filters.end_date:
+        query = query.filter(Transaction.date <= filters.end_date)
+    if filters.category_id is not None:
+        query = query.filter(
+            exists().where(
+                transaction_category.c.transaction_id == Transaction.id,
+                transaction_category.c.category_id == filters.category_id,
+            )
+        )
+    if filters.min_amount is not None or filters.max_amount is not None:
+        # A transaction's amount is its withdrawal or its deposit, whichever is set
+        amount = func.coalesce(Transaction.withdrawal_amount, 0) + func.coalesce(Transaction.deposit_amount, 0)
+        if filters.min_amount is not None:
+            query = query.filter(amount >= filters.min_amount)
+        if filters.max_amount is not None:
+            query = query.filter(amount <= filters.max_amount)
+    if filters.narration:
+        query = query.filter(Transaction.narration.icontains(filters.narration, autoescape=True))
+    return query
+
+def encode_cursor(transaction: Transaction) -> str:
+    """Opaque page cursor pointing just past ``transaction``."""
+    return urlsafe_b64encode(f"{transaction.date.isoformat()}|{transaction.id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> TransactionCursor:
+    """Decode a cursor from encode_cursor(), raising ValueError if it is malformed."""
+    date, id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return datetime.fromisoformat(date), int(id)
+
+def search_terms(query: str) -> List[str]:
+    """The words of a search query, split and lowercased like the narrations in the search index."""
+    return [word.lower() for word in re.findall(r"[^\W_]+", query)]
+
+def encode_search_cursor(tier: int, transaction: Transaction) -> str:
+    """Opaque search page cursor pointing just past ``transaction`` in ``tier``."""
+    return urlsafe_b64encode(f"{tier}|{transaction.date.isoformat()}|{transaction.id}".encode()).decode()
+
+def decode_search_cursor(cursor: str) -> SearchCursor:
+    """Decode a cursor from encode_search_cursor(), raising ValueError if it is malformed."""
+    tier, date, id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+    if int(tier) not in (SEARCH_WORD, SEARCH_PREFIX):
+        raise ValueError(f"Unknown search tier {tier}")
+    return int(tier), datetime.fromisoformat(date), int(id)
+
+async def search(
+    db: AsyncSession,
+    *,
+    query: str,
+    filters: Optional[TransactionFilter] = None,
+    after: Optional[SearchCursor] = None,
+    limit: int = 100,
+) -> List[Tuple[int, Transaction]]:
+    """
+    Search narrations for the words of ``query``, best matches first.
+    
+    Returns (tier, transaction) pairs: first the transactions where every
+    word of the query is a word of the narration (SEARCH_WORD), then those
+    where each is only the start of one (SEARCH_PREFIX), so "swig" finds
+    "UPI-SWIGGY-1234". Each tier is newest first and read by keyset like
+    get_multi(); ``after`` is the (tier, date, id) of the last result of the
+    previous page. On PostgreSQL both tiers are answered by the
+    ix_transaction_narration_search GIN index. Other databases have no
+    such index and get a single tier of substring matches.
+    """
+    words = search_terms(query)
+    if not words:
+        return []
+    base = filtered(select(Transaction).options(selectinload(Transaction.categories)), filters)
+    
+    if db.get_bind().dialect.name == "postgresql":
+        matches_words = narration_search_vector.op("@@")(func.to_tsquery(NARRATION_SEARCH_CONFIG, " & ".join(words)))
+        matches_prefixes = narration_search_vector.op("@@")(
+            func.to_tsquery(NARRATION_SEARCH_CONFIG, " & ".join(f"{word}:*" for word in words))
+        )
+        tiers = [
+            (SEARCH_WORD, base.filter(matches_words)),
+            (SEARCH_PREFIX, base.filter(matches_prefixes, ~matches_words)),
+        ]
+    else:
+        tiers = [(SEARCH_WORD, base.filter(*(Transaction.narration.icontains(word, autoescape=True) for word in words)))]
+    
+    results: List[Tuple[int, Transaction]] = []
+    for tier, tier_query in tiers:
+        if after:
+            after_tier, *position = after
+            if tier < after_tier:
+                continue
+            if tier == after_tier:
+                tier_query = tier_query.filter(tuple_(Transaction.date, Transaction.id) < tuple_(*position))
+        result = await db.execute(
+            tier_query
+            .order_by(Transaction.date.desc(), Transaction.id.desc())
+            .limit(limit - len(results))
+        )
+        results.extend((tier, transaction) for transaction in result.scalars().all())
+        if len(results) >= limit:
+            break
+    return results
+
+async def stream_export(
+    db: AsyncSession,
+    *,
+    filters: Optional[TransactionFilter] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream the transactions matching ``filters`` newest first, in batches.
+    
+    Rows are read through a server-side cursor ``batch_size`` at a time, so
+    memory stays flat however many transactions match. Each transaction is a
+    dict of its columns with ``categories``, the names of its categories.
+    Category names come from the same query, joined in, so a transaction
+    arrives as consecutive rows that are merged here.
+    """
+    from app.models.category import Category, transaction_category
+    
+    query = filtered(
+        select(
+            Transaction.id,
+            Transaction.date,
+            Transaction.account_id,
+            Transaction.narration,
+            Transaction.withdrawal_amount,
+            Transaction.deposit_amount,
+            Transaction.metadata_.label("metadata"),
+            Category.name.label("category"),
+        )
+        .outerjoin(transaction_category, transaction_category.c.transaction_id == Transaction.id)
+        .outerjoin(Category, Category.id == transaction_category.c.category_id),
+        filters,
+    ).order_by(Transaction.date.desc(), Transaction.id.desc())
+    
+    # Rows are plain columns, so skip the ORM result layer
+    connection = await db.connection()
+    result = await connection.stream(query.execution_options(yield_per=batch_size))
+    columns = list(result.keys())[:-1]
+    # The last transaction of a batch may continue in the next one
+    current: Optional[Dict[str, Any]] = None
+    async for rows in result.partitions():
+        batch = []
+        for *values, category in rows:
+            if current is None or current["id"] != values[0]:
+                if current is not None:
+                    batch.append(current)
+                current = dict(zip(columns, values))
+                current["categories"] = []
+            if category is not None:
+                current["categories"].append(category)
+        if batch:
+            yield batch
+    if current is not None:
+        yield [current]
+
 async def create(db: AsyncSession, obj_in: TransactionCreate) -> Transaction:
     """Create a new transaction with category assignment."""
     from app.models.category import Category
@@ -33,6 +255,7 @@ async def create(db: AsyncSession, obj_in: TransactionCreate) -> Transaction:
         withdrawal_amount=obj_in.withdrawal_amount,
         deposit_amount=obj_in.deposit_amount,
         metadata_=obj_in.metadata_,
+        merchant_id=await _merchant_id(db, obj_in.account_id, obj_in.narration),
     )
     
     # Handle category assignment
@@ -42,64 +265,311 @@ async def create(db: AsyncSession, obj_in: TransactionCreate) -> Transaction:
         categories = result.scalars().all()
         db_obj.categories = list(categories)
     else:
-        # Default to 'others' category
-        result = await db.execute(select(Category).filter(Category.name == "others"))
-        others_category = result.scalars().first()
-        if others_category:
-            db_obj.categories = [others_category]
+        # The category of the first matching rule, else 'others'
+        rule_set = await crud_category_rule.get_rule_set(db)
+        category_id = (await run_cpu_bound(
+            categorize_all, rule_set, [(obj_in.narration, obj_in.withdrawal_amount, obj_in.deposit_amount)]
+        ))[0] if rule_set else None
+        if category_id is not None:
+            result = await db.execute(select(Category).filter(Category.id == category_id))
+        else:
+            result = await db.execute(select(Category).filter(Category.name == "others"))
+        category = result.scalars().first()
+        if category:
+            db_obj.categories = [category]
     
     db.add(db_obj)
+    await db.flush()
+    await crud_rollup.apply(db, [db_obj.id])
+    await crud_table_version.bump(db, Transaction, DailyCategoryRollup)
     await db.commit()
     return await get(db, db_obj.id)
 
-async def create_bulk(db: AsyncSession, objs_in: List[TransactionCreate]) -> List[Transaction]:
-    """Create multiple transactions in bulk with default 'others' category."""
+async def create_bulk(
+    db: AsyncSession,
+    batches: Union[Iterable[TransactionBatch], AsyncIterable[TransactionBatch]],
+    on_batch: Optional[Callable[[TransactionImportSummary], None]] = None,
+    merchant_extractor: Optional[MerchantExtractor] = None,
+) -> TransactionImportSummary:
+    """
+    Create transactions in bulk, each in the category of its first matching rule or in 'others'.
+    
+    Batches are consumed one at a time, so memory stays bounded by the batch
+    size rather than the total row count. Batches may be lists of
+    TransactionCreate or TransactionColumns from the columnar parser. On
+    PostgreSQL (asyncpg) rows are streamed in with COPY; other databases use
+    set-based INSERTs. Nothing is loaded back into the session: only a summary
+    is returned. Everything is committed in a single database transaction at
+    the end.
+    
+    Every row gets a fingerprint (see app.services.transaction_fingerprint),
+    and rows whose fingerprint already exists are skipped with
+    ON CONFLICT DO NOTHING, so re-importing an overlapping statement only adds
+    the new rows. The summary counts and totals cover inserted rows; skipped
+    rows are counted separately. The daily rollups (see crud_rollup) are
+    updated with the inserted rows in the same database transaction.
+    
+    Category rules (see app.services.categorization) are matched in memory
+    and each batch is categorised before it is written, so the rules cost
+    one pass over every narration. Merchants are extracted from the
+    narrations in the same pass, with ``merchant_extractor`` (the patterns
+    of the statement format and its bank; see
+    app.services.merchant_extraction) or the generic patterns, and looked up
+    or added once per import. Both run on the CPU executor (see _classify),
+    so large imports do not stall other requests.
+    
+    ``batches`` may also be an async iterable, and ``on_batch`` is called with
+    the running summary after each batch is written, for progress reporting.
+    """
     from app.models.category import Category
     
     # Get 'others' category
     result = await db.execute(select(Category).filter(Category.name == "others"))
     others_category = result.scalars().first()
+    default_category_id = others_category.id if others_category else None
+    rule_set = await crud_category_rule.get_rule_set(db)
+    merchant_extractor = merchant_extractor or get_extractor()
+    # Merchant ids by key, for the whole import
+    known_merchants: Dict[str, int] = {}
+    
+    if db.get_bind().dialect.driver == "asyncpg":
+        insert_batch = _copy_batch
+        await _create_staging_table(db)
+    else:
+        insert_batch = _insert_batch
     
-    db_objs = [
-        Transaction(
-            account_id=obj_in.account_id,
-            date=obj_in.date,
-            narration=obj_in.narration,
-            withdrawal_amount=obj_in.withdrawal_amount,
-            deposit_amount=obj_in.deposit_amount,
-            metadata_=obj_in.metadata_,
+    if not hasattr(batches, "__aiter__"):
+        batches = _aiter(batches)
+    
+    assign_fingerprint = FingerprintAssigner()
+    summary = TransactionImportSummary()
+    async for batch in batches:
+        if not len(batch):
+            continue
+        rows = _batch_rows(batch)
+        for row in rows:
+            row["fingerprint"] = assign_fingerprint(row)
+        matched, merchants = await run_cpu_bound(
+            _classify,
+            rule_set,
+            merchant_extractor,
+            [(row["narration"], row["withdrawal_amount"], row["deposit_amount"]) for row in rows],
         )
-        for obj_in in objs_in
-    ]
+        for row, merchant_id in zip(rows, await crud_merchant.resolve(db, merchants, known_merchants)):
+            row["merchant_id"] = merchant_id
+        category_ids = [default_category_id if category_id is None else category_id for category_id in matched]
+        count, total_withdrawals, total_deposits = await insert_batch(db, rows, category_ids)
+        summary.count += count
+        summary.skipped += len(rows) - count
+        summary.total_withdrawals += total_withdrawals
+        summary.total_deposits += total_deposits
+        if on_batch:
+            on_batch(summary)
     
-    # Assign 'others' category to all transactions
-    if others_category:
-        for db_obj in db_objs:
-            db_obj.categories = [others_category]
-            
-    db.add_all(db_objs)
+    await crud_table_version.bump(db, Transaction, DailyCategoryRollup)
     await db.commit()
+    return summary
+
+def _classify(
+    rule_set: Optional[RuleSet],
+    merchant_extractor: MerchantExtractor,
+    transactions: List[Tuple[str, Optional[Decimal], Optional[Decimal]]],
+) -> Tuple[List[Optional[int]], List[Optional[Tuple[str, str]]]]:
+    """
+    Rule category and merchant (key, name) of each (narration, withdrawal, deposit).
+    
+    Runs on the CPU executor, where the rules are compiled once per process.
+    """
+    return (
+        categorize_all(rule_set, transactions),
+        [merchant_extractor.extract(narration) for narration, _, _ in transactions],
+    )
+
+async def _aiter(iterable: Iterable[TransactionBatch]) -> AsyncIterator[TransactionBatch]:
+    for item in iterable:
+        yield item
+
+def _batch_rows(batch: TransactionBatch) -> List[Dict[str, Any]]:
+    """
+    Rows of a batch keyed by Transaction attribute name.
+    
+    Empty amounts become 0, the column default, here rather than in the
+    insert paths, so COPY and INSERT store the same rows.
+    """
+    if isinstance(batch, TransactionColumns):
+        return batch.to_rows()
+    return [
+        {
+            "account_id": obj_in.account_id,
+            "date": obj_in.date,
+            "narration": obj_in.narration,
+            "withdrawal_amount": _amount(obj_in.withdrawal_amount),
+            "deposit_amount": _amount(obj_in.deposit_amount),
+            "metadata_": obj_in.metadata_,
+        }
+        for obj_in in batch
+    ]
+
+def _amount(value: Optional[Decimal]) -> Decimal:
+    return Decimal(0) if value is None else value
+
+async def _insert_batch(
+    db: AsyncSession,
+    rows: List[Dict[str, Any]],
+    category_ids: List[Optional[int]]
+) -> Tuple[int, Decimal, Decimal]:
+    """
+    Insert a batch with executemany INSERTs, skipping known fingerprints.
+    
+    ``category_ids`` holds the category of each row, or None to leave it
+    uncategorised. Returns the number of rows added and their withdrawal and
+    deposit totals.
+    """
+    from app.models.category import transaction_category
+    
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
     
-    # Re-fetch all objects with eager loading
     result = await db.execute(
-        select(Transaction)
-        .options(selectinload(Transaction.categories))
-        .filter(Transaction.id.in_([obj.id for obj in db_objs]))
+        dialect_insert(Transaction)
+        .on_conflict_do_nothing(index_elements=[Transaction.fingerprint])
+        .returning(Transaction.id, Transaction.fingerprint, Transaction.withdrawal_amount, Transaction.deposit_amount),
+        rows,
     )
-    return result.scalars().all()
+    inserted = result.all()
+    
+    # Skipped rows return nothing, so match categories to new rows by fingerprint
+    row_categories = {row["fingerprint"]: category_id for row, category_id in zip(rows, category_ids)}
+    links = [
+        {"transaction_id": row.id, "category_id": row_categories[row.fingerprint]}
+        for row in inserted
+        if row_categories[row.fingerprint] is not None
+    ]
+    if links:
+        await db.execute(insert(transaction_category), links)
+    await crud_rollup.apply(db, [row.id for row in inserted])
+    return (
+        len(inserted),
+        sum((row.withdrawal_amount or 0 for row in inserted), Decimal(0)),
+        sum((row.deposit_amount or 0 for row in inserted), Decimal(0)),
+    )
+
+async def _create_staging_table(db: AsyncSession) -> None:
+    """Create the temporary table COPY batches are staged in, dropped at commit."""
+    await db.execute(text(
+        f"CREATE TEMPORARY TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+        f"SELECT {', '.join(COPY_COLUMNS)}, NULL::integer AS category_id FROM transaction WITH NO DATA"
+    ))
+
+async def _copy_batch(
+    db: AsyncSession,
+    rows: List[Dict[str, Any]],
+    category_ids: List[Optional[int]]
+) -> Tuple[int, Decimal, Decimal]:
+    """
+    Stream a batch into PostgreSQL with COPY, skipping known fingerprints.
+    
+    COPY cannot skip conflicting rows, so the batch is copied into a staging
+    table, with the category of each row, and moved into transaction with a
+    single INSERT ... SELECT ... ON CONFLICT DO NOTHING. The same statement
+    files the new rows under their categories, adds them to the daily
+    rollups (the SQL equivalent of crud_rollup.apply) and returns their count
+    and totals. Everything runs on the session's connection inside its open
+    transaction.
+    """
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    
+    records = []
+    metadata, encoded_metadata = None, None
+    for row, category_id in zip(rows, category_ids):
+        # Rows from one statement share their metadata, so only encode it when it changes
+        if row["metadata_"] != metadata:
+            metadata = row["metadata_"]
+            encoded_metadata = json.dumps(metadata)
+        records.append((
+            row["account_id"],
+            row["date"],
+            row["narration"],
+            row["withdrawal_amount"],
+            row["deposit_amount"],
+            encoded_metadata,
+            row["fingerprint"],
+            row["merchant_id"],
+            category_id,
+        ))
+    await driver_connection.copy_records_to_table(STAGING_TABLE, records=records, columns=STAGING_COLUMNS)
+    
+    columns = ", ".join(COPY_COLUMNS)
+    rollup_key = ", ".join(crud_rollup.KEY_COLUMNS)
+    rollup_updates = ", ".join(
+        f"{column} = rollup.{column} + excluded.{column}" for column in crud_rollup.MEASURE_COLUMNS
+    )
+    count, total_withdrawals, total_deposits = await driver_connection.fetchrow(
+        f"""
+        WITH inserted AS (
+            INSERT INTO transaction ({columns})
+            SELECT {columns} FROM {STAGING_TABLE}
+            ON CONFLICT (fingerprint) DO NOTHING
+            RETURNING id, account_id, date, withdrawal_amount, deposit_amount, fingerprint
+        ), new_rows AS (
+            SELECT inserted.*, staged.category_id
+            FROM inserted JOIN {STAGING_TABLE} AS staged USING (fingerprint)
+        ), categorised AS (
+            INSERT INTO transaction_category (transaction_id, category_id)
+            SELECT id, category_id FROM new_rows WHERE category_id IS NOT NULL
+        ), rolled_up AS (
+            INSERT INTO daily_category_rollup AS rollup ({ROLLUP_COLUMNS})
+            SELECT
+                new_rows.date::date,
+                new_rows.account_id,
+                categories.category_id,
+                coalesce(sum(withdrawal_amount) FILTER (WHERE withdrawal_amount > 0), 0),
+                count(*) FILTER (WHERE withdrawal_amount > 0),
+                coalesce(sum(deposit_amount) FILTER (WHERE deposit_amount > 0), 0),
+                count(*) FILTER (WHERE deposit_amount > 0),
+                count(*)
+            FROM new_rows
+            CROSS JOIN LATERAL (
+                VALUES ({crud_rollup.ALL_CATEGORIES}), (new_rows.category_id)
+            ) AS categories (category_id)
+            WHERE categories.category_id IS NOT NULL
+            GROUP BY 1, 2, 3
+            ON CONFLICT ({rollup_key}) DO UPDATE SET {rollup_updates}
+        )
+        SELECT count(*), coalesce(sum(withdrawal_amount), 0), coalesce(sum(deposit_amount), 0)
+        FROM inserted
+        """
+    )
+    await driver_connection.execute(f"TRUNCATE {STAGING_TABLE}")
+    return count, total_withdrawals, total_deposits
 
 async def update(db: AsyncSession, *, db_obj: Transaction, obj_in: TransactionUpdate) -> Transaction:
-    """Update an existing transaction including categories."""
+    """
+    Update an existing transaction including categories.
+    
+    The fingerprint of an imported transaction is kept: it identifies the
+    statement row the transaction came from (see
+    app.services.transaction_fingerprint).
+    """
     from app.models.category import Category
     
     update_data = obj_in.dict(exclude_unset=True)
     
+    # Take the old values out of the rollups; the new ones are added back below
+    await crud_rollup.apply(db, [db_obj.id], sign=-1)
+    
     # Handle category updates separately
     category_ids = update_data.pop('category_ids', None)
     
     # Update regular fields
     for field in update_data:
         setattr(db_obj, field, update_data[field])
+    if "narration" in update_data:
+        db_obj.merchant_id = await _merchant_id(db, db_obj.account_id, db_obj.narration)
     
     # Update categories if provided
     if category_ids is not None:
@@ -112,12 +582,142 @@ async def update(db: AsyncSession, *, db_obj: Transaction, obj_in: TransactionUp
             db_obj.categories = []
     
     db.add(db_obj)
+    await db.flush()
+    await crud_rollup.apply(db, [db_obj.id])
+    await crud_table_version.bump(db, Transaction, DailyCategoryRollup)
     await db.commit()
     return await get(db, db_obj.id)
 
+async def get_ids(db: AsyncSession, *, filters: Optional[TransactionFilter], limit: int) -> List[int]:
+    """Ids of up to ``limit`` transactions matching ``filters``, in id order."""
+    result = await db.execute(filtered(select(Transaction.id), filters).order_by(Transaction.id).limit(limit))
+    return result.scalars().all()
+
+async def _lock(db: AsyncSession, ids: List[int]) -> List[int]:
+    """Lock the transactions of ``ids`` that exist, returning their ids."""
+    result = await db.execute(
+        select(Transaction.id).filter(Transaction.id.in_(ids)).order_by(Transaction.id).with_for_update()
+    )
+    return result.scalars().all()
+
+async def update_many(db: AsyncSession, *, ids: List[int], obj_in: TransactionUpdate) -> List[int]:
+    """
+    Apply the same update to many transactions in one database transaction.
+    
+    Fields are set with one UPDATE, and ``category_ids`` replaces the
+    categories of every transaction with one DELETE and one INSERT ... SELECT,
+    so the number of statements does not grow with the number of
+    transactions. Returns the ids that existed and were updated.
+    """
+    from app.models.category import Category, transaction_category
+    
+    update_data = obj_in.model_dump(exclude_unset=True)
+    category_ids = update_data.pop("category_ids", None)
+    
+    found = await _lock(db, ids)
+    if not found:
+        await db.rollback()
+        return found
+    
+    # Take the old values out of the rollups; the new ones are added back below
+    await crud_rollup.apply(db, found, sign=-1)
+    if update_data:
+        await db.execute(
+            sql_update(Transaction)
+            .where(Transaction.id.in_(found))
+            .values(**update_data)
+            .execution_options(synchronize_session=False)
+        )
+    if "narration" in update_data:
+        await _set_merchants(db, found, update_data["narration"])
+    if category_ids is not None:
+        await db.execute(delete(transaction_category).where(transaction_category.c.transaction_id.in_(found)))
+        if category_ids:
+            await db.execute(insert(transaction_category).from_select(
+                ["transaction_id", "category_id"],
+                select(Transaction.id, Category.id)
+                .join(Category, Category.id.in_(category_ids))
+                .where(Transaction.id.in_(found)),
+            ))
+    await crud_rollup.apply(db, found)
+    await crud_table_version.bump(db, Transaction, DailyCategoryRollup)
+    await db.commit()
+    return found
+
+async def _merchant_id(db: AsyncSession, account_id: int, narration: str) -> Optional[int]:
+    """Merchant of a narration, extracted with the patterns of the account's bank."""
+    from app.models.account import BankAccount
+    
+    result = await db.execute(select(BankAccount.bank_name).filter(BankAccount.id == account_id))
+    return (await crud_merchant.resolve(db, [get_extractor(result.scalar()).extract(narration)]))[0]
+
+async def _set_merchants(db: AsyncSession, ids: List[int], narration: str) -> None:
+    """Set the merchant of transactions that now share ``narration``, per account as banks differ."""
+    result = await db.execute(
+        select(Transaction.account_id).filter(Transaction.id.in_(ids)).distinct()
+    )
+    for account_id in result.scalars().all():
+        await db.execute(
+            sql_update(Transaction)
+            .where(Transaction.id.in_(ids), Transaction.account_id == account_id)
+            .values(merchant_id=await _merchant_id(db, account_id, narration))
+            .execution_options(synchronize_session=False)
+        )
+
+async def set_categories(db: AsyncSession, categories: Dict[int, int]) -> None:
+    """
+    Put each transaction of ``categories`` (transaction id -> category id) in that category alone.
+    
+    The links are replaced with one DELETE and one INSERT and the rollups
+    moved with them, in the session's transaction; the caller bumps and
+    commits.
+    """
+    from app.models.category import transaction_category
+    
+    if not categories:
+        return
+    transaction_ids = list(categories)
+    await crud_rollup.apply(db, transaction_ids, sign=-1)
+    await db.execute(
+        delete(transaction_category).where(transaction_category.c.transaction_id.in_(transaction_ids))
+    )
+    await db.execute(
+        insert(transaction_category),
+        [
+            {"transaction_id": transaction_id, "category_id": category_id}
+            for transaction_id, category_id in categories.items()
+        ],
+    )
+    await crud_rollup.apply(db, transaction_ids)
+
 async def remove(db: AsyncSession, *, id: int) -> Transaction:
     result = await db.execute(select(Transaction).filter(Transaction.id == id))
     obj = result.scalars().first()
+    await crud_rollup.apply(db, [id], sign=-1)
     await db.delete(obj)
+    await crud_import_file.remove_for_accounts(db, [obj.account_id])
+    await crud_table_version.bump(db, Transaction, DailyCategoryRollup)
     await db.commit()
     return obj
+
+async def remove_many(db: AsyncSession, *, ids: List[int]) -> List[int]:
+    """Delete many transactions and their category links in one database transaction, returning the ids deleted."""
+    from app.models.category import transaction_category
+    
+    found = await _lock(db, ids)
+    if not found:
+        await db.rollback()
+        return found
+    
+    await crud_rollup.apply(db, found, sign=-1)
+    await db.execute(delete(transaction_category).where(transaction_category.c.transaction_id.in_(found)))
+    result = await db.execute(
+        delete(Transaction)
+        .where(Transaction.id.in_(found))
+        .returning(Transaction.account_id)
+        .execution_options(synchronize_session=False)
+    )
+    await crud_import_file.remove_for_accounts(db, result.scalars().all())
+    await crud_table_version.bump(db, Transaction, DailyCategoryRollup)
+    await db.commit()
+    return found
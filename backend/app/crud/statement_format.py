@@ -1,6 +1,7 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.crud import crud_table_version
 from app.models.statement_format import StatementFormat
 from app.schemas.statement_format import StatementFormatCreate, StatementFormatUpdate
 
@@ -27,8 +28,11 @@ async def create(db: AsyncSession, obj_in: StatementFormatCreate) -> StatementFo
         narration_column=obj_in.narration_column,
         withdrawal_column=obj_in.withdrawal_column,
         deposit_column=obj_in.deposit_column,
+        date_format=obj_in.date_format,
+        merchant_pattern=obj_in.merchant_pattern,
     )
     db.add(db_obj)
+    await crud_table_version.bump(db, StatementFormat)
     await db.commit()
     await db.refresh(db_obj)
     return db_obj
@@ -40,6 +44,7 @@ async def update(db: AsyncSession, *, db_obj: StatementFormat, obj_in: Statement
     for field in update_data:
         setattr(db_obj, field, update_data[field])
     db.add(db_obj)
+    await crud_table_version.bump(db, StatementFormat)
     await db.commit()
     await db.refresh(db_obj)
     return db_obj
@@ -50,6 +55,7 @@ async def remove(db: AsyncSession, *, id: int) -> StatementFormat:
     result = await db.execute(select(StatementFormat).filter(StatementFormat.id == id))
     obj = result.scalars().first()
     await db.delete(obj)
+    await crud_table_version.bump(db, StatementFormat)
     await db.commit()
     return obj
 
@@ -4,3 +4,9 @@ from app.models.transaction import Transaction
 from app.models.statement_format import StatementFormat
 from app.models.category import Category
 from app.models.user import User
+from app.models.import_file import ImportFile
+from app.models.daily_category_rollup import DailyCategoryRollup
+from app.models.table_version import TableVersion
+from app.models.category_rule import CategoryRule
+from app.models.recategorization import Recategorization
+from app.models.merchant import Merchant
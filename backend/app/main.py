@@ -17,6 +17,8 @@ from app.schemas.user import UserCreate
 from app.models.user import User
 from fastapi_users.db import SQLAlchemyUserDatabase
 from app.db.session import AsyncSessionLocal
+from app.core.executor import shutdown_executor
+from app.services.recategorization import resume_running as resume_recategorizations
 
 @app.on_event("startup")
 async def on_startup():
@@ -46,6 +48,12 @@ async def on_startup():
             await user_manager.create(user_in)
             print(f"User {email} created")
 
+    await resume_recategorizations()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    shutdown_executor()
+
 # Set all CORS enabled origins
 if settings.BACKEND_CORS_ORIGINS:
     print(f"DEBUG: Allowed Origins: {settings.BACKEND_CORS_ORIGINS}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Table, ForeignKey
+from sqlalchemy import Column, Integer, String, Table, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -7,7 +7,9 @@ transaction_category = Table(
     'transaction_category',
     Base.metadata,
     Column('transaction_id', Integer, ForeignKey('transaction.id'), primary_key=True),
-    Column('category_id', Integer, ForeignKey('category.id'), primary_key=True)
+    Column('category_id', Integer, ForeignKey('category.id'), primary_key=True),
+    # The primary key serves lookups by transaction; this one serves lookups by category
+    Index('ix_transaction_category_category_id_transaction_id', 'category_id', 'transaction_id')
 )
 
 
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+
+class CategoryRule(Base):
+    """
+    Rule filing transactions under a category by narration and amount.
+    
+    A rule matches when every condition it sets holds; see
+    app.services.categorization for how rules are compiled and which one
+    wins when several match.
+    """
+    
+    __tablename__ = "category_rule"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    category_id = Column(Integer, ForeignKey("category.id", ondelete="CASCADE"), nullable=False, index=True)
+    keyword = Column(String, nullable=True, comment="Case-insensitive substring of the narration")
+    pattern = Column(String, nullable=True, comment="Regular expression searched in the narration, ignoring case")
+    min_amount = Column(Numeric(10, 2), nullable=True)
+    max_amount = Column(Numeric(10, 2), nullable=True)
+    priority = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
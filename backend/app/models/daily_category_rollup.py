@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, Numeric, Date, ForeignKey, Index
+from app.db.base_class import Base
+
+
+class DailyCategoryRollup(Base):
+    """
+    Withdrawal and deposit totals per day, account and category.
+    
+    Kept up to date by the transaction CRUD functions (see
+    app.crud.crud_rollup). Rows with category_id 0 total every transaction of
+    the account that day, whatever its categories, so transactions in several
+    categories are counted once and uncategorised ones are not missed.
+    """
+    
+    __tablename__ = "daily_category_rollup"
+    __table_args__ = (
+        # The time series reads category 0 and the category totals every other
+        # category; covering the expense columns makes both index-only range scans
+        Index(
+            "ix_daily_category_rollup_category_id_date",
+            "category_id",
+            "date",
+            postgresql_include=["withdrawal_count", "withdrawal_total"],
+        ),
+    )
+    
+    date = Column(Date, primary_key=True)
+    account_id = Column(Integer, ForeignKey("bankaccount.id", ondelete="CASCADE"), primary_key=True)
+    category_id = Column(Integer, primary_key=True, comment="Category, or 0 for all transactions")
+    
+    # Only positive amounts are counted, matching the withdrawal_amount > 0 filters of the analytics
+    withdrawal_total = Column(Numeric(14, 2), nullable=False, default=0)
+    withdrawal_count = Column(Integer, nullable=False, default=0)
+    deposit_total = Column(Numeric(14, 2), nullable=False, default=0)
+    deposit_count = Column(Integer, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
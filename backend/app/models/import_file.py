@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+
+class ImportFile(Base):
+    """Model recording each statement file imported, keyed by its content hash"""
+    
+    __tablename__ = "import_file"
+    __table_args__ = (
+        UniqueConstraint("sha256", "account_id", "statement_format_id", name="uq_import_file_sha256_account_format"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), nullable=False, comment="SHA-256 hex digest of the uploaded file")
+    filename = Column(String, nullable=False)
+    size = Column(Integer, nullable=False, comment="File size in bytes")
+    account_id = Column(Integer, ForeignKey("bankaccount.id", ondelete="CASCADE"), nullable=False)
+    statement_format_id = Column(Integer, ForeignKey("statementformat.id", ondelete="CASCADE"), nullable=False)
+    
+    # TransactionImportSummary of the latest import of this file
+    summary = Column(JSON, nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
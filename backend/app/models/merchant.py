@@ -0,0 +1,16 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+
+class Merchant(Base):
+    """
+    Merchant transactions are grouped by, extracted from their narrations.
+    
+    See app.services.merchant_extraction for how narrations are reduced to a key.
+    """
+    
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String, nullable=False, unique=True, comment="Canonical merchant key, e.g. 'swiggy'")
+    name = Column(String, nullable=False, comment="Merchant as first seen in a narration")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,41 @@
+from sqlalchemy import Boolean, Column, DateTime, Integer, JSON, String
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+
+class Recategorization(Base):
+    """
+    Job applying the category rules to existing transactions.
+
+    Transactions are visited in id order, a batch per database transaction
+    that also advances last_transaction_id, so a job stopped at any point
+    (paused, failed or interrupted by a restart) resumes after the last
+    committed batch. See app.crud.crud_recategorization.
+    """
+
+    __tablename__ = "recategorization"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, nullable=False, default="running", comment="running, paused, completed or failed")
+    # TransactionFilter the transactions are selected by, or null for all of them
+    filters = Column(JSON, nullable=True)
+    reset_unmatched = Column(
+        Boolean, nullable=False, default=False, comment="Move transactions no rule matches to 'others'"
+    )
+    overwrite = Column(
+        Boolean, nullable=False, default=False, comment="Also recategorize transactions in categories other than 'others'"
+    )
+
+    # Transactions up to max_transaction_id, the newest when the job was created,
+    # are visited; later ones were categorised by the rules as they were added
+    max_transaction_id = Column(Integer, nullable=False, default=0)
+    last_transaction_id = Column(Integer, nullable=False, default=0, comment="Last transaction visited")
+    rows_total = Column(Integer, nullable=False, default=0)
+    rows_scanned = Column(Integer, nullable=False, default=0)
+    rows_changed = Column(Integer, nullable=False, default=0)
+    error = Column(String, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -19,6 +19,10 @@ class StatementFormat(Base):
     withdrawal_column = Column(String, nullable=False, comment="Column identifier for withdrawal/debit amount")
     deposit_column = Column(String, nullable=False, comment="Column identifier for deposit/credit amount")
     
+    # Parsing hints
+    date_format = Column(String, nullable=True, comment="strptime format of text dates; inferred per file when empty")
+    merchant_pattern = Column(String, nullable=True, comment="Regular expression whose 'merchant' group captures the merchant of a narration")
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, DateTime, String
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+
+class TableVersion(Base):
+    """
+    Change counter per table, behind the ETags of the list and analytics endpoints.
+    
+    The CRUD functions bump the counters of the tables they write just before
+    committing (see app.crud.crud_table_version), so a new version becomes
+    visible together with the change and the row lock is held only while
+    the commit runs.
+    """
+    
+    __tablename__ = "table_version"
+    
+    table_name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,9 +1,30 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Index, JSON, func, text
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 from datetime import datetime
 
 class Transaction(Base):
+    __table_args__ = (
+        # Keyset pagination seeks on (date, id), optionally within one account
+        Index("ix_transaction_date_id", "date", "id"),
+        Index("ix_transaction_account_id_date_id", "account_id", "date", "id"),
+        # Expense analytics read only withdrawals; covering them lets date ranges be index-only
+        Index(
+            "ix_transaction_expense_date",
+            "date",
+            postgresql_include=["id", "withdrawal_amount"],
+            postgresql_where=text("withdrawal_amount > 0"),
+        ),
+        # Top merchants group expenses by merchant, reading only this index
+        Index(
+            "ix_transaction_merchant_expense",
+            "merchant_id",
+            "date",
+            postgresql_include=["withdrawal_amount"],
+            postgresql_where=text("withdrawal_amount > 0"),
+        ),
+    )
+    
     id = Column(Integer, primary_key=True, index=True)
     account_id = Column(Integer, ForeignKey("bankaccount.id"), nullable=False)
     date = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -11,6 +32,10 @@ class Transaction(Base):
     withdrawal_amount = Column(Numeric(10, 2), default=0.0)
     deposit_amount = Column(Numeric(10, 2), default=0.0)
     metadata_ = Column("metadata", JSON, nullable=True)
+    # Content hash of the statement row a transaction was imported from
+    fingerprint = Column(String(64), nullable=True, unique=True, index=True)
+    # Merchant extracted from the narration (see app.services.merchant_extraction), if any
+    merchant_id = Column(Integer, ForeignKey("merchant.id"), nullable=True)
 
     account = relationship("BankAccount", backref="transactions")
     
@@ -21,3 +46,16 @@ class Transaction(Base):
         secondary="transaction_category",
         back_populates="transactions"
     )
+
+
+# Full-text search document of a narration: its runs of letters and digits as
+# lowercase words, so "UPI/SWIGGY/1234" and "UPI-SWIGGY-1234" both hold
+# "swiggy". Constants are inlined rather than bound so that queries repeat the
+# index expression exactly.
+NARRATION_SEARCH_CONFIG = text("'simple'::regconfig")
+narration_search_vector = func.to_tsvector(
+    NARRATION_SEARCH_CONFIG,
+    func.regexp_replace(Transaction.narration, text("'[^[:alnum:]]+'"), text("' '"), text("'g'")),
+)
+# GIN index answering word and word-prefix searches (crud_transaction.search); PostgreSQL only
+Index("ix_transaction_narration_search", narration_search_vector, postgresql_using="gin").ddl_if(dialect="postgresql")
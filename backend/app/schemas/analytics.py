@@ -1,6 +1,15 @@
 from pydantic import BaseModel
 from datetime import date
 from typing import List
+import enum
+
+class Granularity(str, enum.Enum):
+    auto = "auto"
+    day = "day"
+    week = "week"
+    month = "month"
+    quarter = "quarter"
+    year = "year"
 
 class ExpenseByCategory(BaseModel):
     category_name: str
@@ -8,13 +17,20 @@ class ExpenseByCategory(BaseModel):
     percentage: float | None = None
 
 class ExpenseOverTime(BaseModel):
-    date: date
+    date: date  # First day of the bucket
     amount: float
+    days: int = 1  # Days with expenses in the bucket
 
 class AnalyticsResponse(BaseModel):
     by_category: List[ExpenseByCategory]
     over_time: List[ExpenseOverTime]
 
+class MerchantExpense(BaseModel):
+    merchant_id: int
+    merchant_name: str
+    amount: float
+    count: int  # Expenses at the merchant
+
 class ExpensesByCategoryResponse(BaseModel):
     items: List[ExpenseByCategory]
     total_amount: float
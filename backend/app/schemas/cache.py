@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+
+
+class CacheStats(BaseModel):
+    """Counters of the analytics response cache since the worker started"""
+    hits: int = Field(..., description="Lookups answered from the cache, locally or from the shared store")
+    misses: int = Field(..., description="Lookups that ran the query")
+    hit_ratio: float = Field(..., description="hits / (hits + misses)")
+    shared_hits: int = Field(..., description="Hits found in the shared store but not in this worker's LRU")
+    evictions: int = Field(..., description="Entries dropped to stay within max_entries")
+    shared_errors: int = Field(..., description="Failed calls to the shared store")
+    entries: int
+    max_entries: int
+    shared: bool = Field(..., description="Whether a shared store is configured")
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,57 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.services.categorization import check_pattern
+
+
+class CategoryRuleBase(BaseModel):
+    """Base schema for CategoryRule. A rule matches when every condition it sets holds."""
+    category_id: int
+    keyword: Optional[str] = Field(None, min_length=1, description="Case-insensitive substring of the narration")
+    pattern: Optional[str] = Field(None, min_length=1, description="Regular expression searched in the narration, ignoring case")
+    min_amount: Optional[Decimal] = Field(None, ge=0, description="Smallest withdrawal or deposit amount, inclusive")
+    max_amount: Optional[Decimal] = Field(None, ge=0, description="Largest withdrawal or deposit amount, inclusive")
+    priority: int = Field(0, description="When several rules match, the highest priority wins")
+
+
+def _check_pattern(pattern: Optional[str]) -> Optional[str]:
+    if pattern is not None:
+        check_pattern(pattern)
+    return pattern
+
+
+class CategoryRuleCreate(CategoryRuleBase):
+    """Schema for creating a CategoryRule."""
+
+    _pattern = field_validator("pattern")(_check_pattern)
+
+    @model_validator(mode="after")
+    def check_conditions(self) -> "CategoryRuleCreate":
+        if self.keyword is None and self.pattern is None and self.min_amount is None and self.max_amount is None:
+            raise ValueError("A rule needs a keyword, a pattern or an amount condition")
+        if self.min_amount is not None and self.max_amount is not None and self.min_amount > self.max_amount:
+            raise ValueError("min_amount cannot exceed max_amount")
+        return self
+
+
+class CategoryRuleUpdate(BaseModel):
+    """Schema for updating a CategoryRule. All fields are optional."""
+    category_id: Optional[int] = None
+    keyword: Optional[str] = Field(None, min_length=1)
+    pattern: Optional[str] = Field(None, min_length=1)
+    min_amount: Optional[Decimal] = Field(None, ge=0)
+    max_amount: Optional[Decimal] = Field(None, ge=0)
+    priority: Optional[int] = None
+
+    _pattern = field_validator("pattern")(_check_pattern)
+
+
+class CategoryRule(CategoryRuleBase):
+    """Schema for CategoryRule response."""
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
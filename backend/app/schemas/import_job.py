@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class ImportJob(BaseModel):
+    """Progress of a background statement import"""
+    id: str
+    status: str = Field(..., description="pending, running, completed or failed")
+    filename: str
+    account_id: int
+    statement_format_id: int
+    sha256: Optional[str] = Field(None, description="SHA-256 hex digest of the uploaded file")
+    rows_parsed: int = Field(..., description="Transactions read from the file so far")
+    rows_inserted: int = Field(..., description="Transactions written so far; committed when the job completes")
+    rows_skipped: int = Field(0, description="Transactions already imported from an earlier statement")
+    rows_per_second: float = Field(..., description="Import throughput since the job started")
+    total_withdrawals: float
+    total_deposits: float
+    duplicate_of: Optional[int] = Field(
+        None, description="Earlier import of the same file whose summary was returned; nothing was imported"
+    )
+    errors: List[str] = []
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+from app.schemas.transaction import TransactionFilter
+
+
+class RecategorizationCreate(BaseModel):
+    """Schema for starting a Recategorization."""
+    filters: Optional[TransactionFilter] = Field(
+        None, description="Only recategorize the transactions matching these filters"
+    )
+    reset_unmatched: bool = Field(
+        False, description="Move transactions no rule matches to 'others' instead of leaving their categories"
+    )
+    overwrite: bool = Field(
+        False,
+        description="Also recategorize transactions in categories other than 'others', which may have been chosen by hand",
+    )
+
+
+class Recategorization(BaseModel):
+    """Progress of a job applying the category rules to existing transactions"""
+    id: int
+    status: str = Field(..., description="running, paused, completed or failed")
+    filters: Optional[TransactionFilter] = None
+    reset_unmatched: bool
+    overwrite: bool
+    rows_total: int = Field(..., description="Transactions the job visits")
+    rows_scanned: int = Field(..., description="Transactions visited so far")
+    rows_changed: int = Field(..., description="Transactions whose categories were changed so far")
+    last_transaction_id: int = Field(..., description="The job resumes after this transaction")
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import Optional
 
+from app.services.merchant_extraction import check_merchant_pattern
+
 
 class StatementFormatBase(BaseModel):
     """Base schema for StatementFormat"""
@@ -12,11 +14,20 @@ class StatementFormatBase(BaseModel):
     narration_column: str = Field(..., description="Column identifier for narration/description")
     withdrawal_column: str = Field(..., description="Column identifier for withdrawal/debit amount")
     deposit_column: str = Field(..., description="Column identifier for deposit/credit amount")
+    date_format: Optional[str] = Field(None, description="strptime format of text dates (e.g., '%d/%m/%y'); inferred from the file when omitted")
+    merchant_pattern: Optional[str] = Field(None, min_length=1, description="Regular expression matched at the start of narrations, whose 'merchant' group captures the merchant; tried before the bank's built-in patterns")
+
+
+def _check_merchant_pattern(pattern: Optional[str]) -> Optional[str]:
+    if pattern is not None:
+        check_merchant_pattern(pattern)
+    return pattern
 
 
 class StatementFormatCreate(StatementFormatBase):
     """Schema for creating a new StatementFormat"""
-    pass
+
+    _merchant_pattern = field_validator("merchant_pattern")(_check_merchant_pattern)
 
 
 class StatementFormatUpdate(BaseModel):
@@ -28,6 +39,10 @@ class StatementFormatUpdate(BaseModel):
     narration_column: Optional[str] = None
     withdrawal_column: Optional[str] = None
     deposit_column: Optional[str] = None
+    date_format: Optional[str] = None
+    merchant_pattern: Optional[str] = Field(None, min_length=1)
+
+    _merchant_pattern = field_validator("merchant_pattern")(_check_merchant_pattern)
 
 
 class StatementFormat(StatementFormatBase):
@@ -1,6 +1,7 @@
+from enum import Enum
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator, model_validator
 from decimal import Decimal
 from app.schemas.category import Category
 
@@ -25,9 +26,73 @@ class TransactionUpdate(TransactionBase):
 
 class TransactionInDBBase(TransactionBase):
     id: int
+    merchant_id: Optional[int] = None
 
     class Config:
         from_attributes = True
 
 class Transaction(TransactionInDBBase):
     categories: List["Category"] = []
+
+class TransactionPage(BaseModel):
+    items: List[Transaction]
+    next_cursor: Optional[str] = None  # Pass as ``cursor`` to get the next page; None on the last page
+
+class TransactionFilter(BaseModel):
+    account_id: Optional[int] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    category_id: Optional[int] = None
+    min_amount: Optional[Decimal] = None
+    max_amount: Optional[Decimal] = None
+    narration: Optional[str] = None  # Case-insensitive substring
+
+class TransactionBatchSelection(BaseModel):
+    # Exactly one of: the ids of the transactions, or filters matching them
+    ids: Optional[List[int]] = None
+    filters: Optional[TransactionFilter] = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "TransactionBatchSelection":
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("Select transactions with either ids or filters")
+        # Empty filters would select every transaction
+        if self.filters is not None and not any(
+            value not in (None, "") for value in self.filters.model_dump().values()
+        ):
+            raise ValueError("Filters need at least one criterion")
+        return self
+
+class TransactionBatchUpdate(TransactionBatchSelection):
+    changes: TransactionUpdate  # Applied to every selected transaction; category_ids replaces their categories
+
+    @field_validator("changes")
+    @classmethod
+    def check_changes(cls, changes: TransactionUpdate) -> TransactionUpdate:
+        # These columns are not nullable, so they can be left out but not cleared
+        cleared = [name for name in ("account_id", "date", "narration")
+                   if name in changes.model_fields_set and getattr(changes, name) is None]
+        if cleared:
+            raise ValueError(f"{', '.join(cleared)} cannot be null")
+        return changes
+
+class TransactionBatchItem(BaseModel):
+    id: int
+    status: str  # "updated", "deleted" or "not_found"
+
+class TransactionBatchResult(BaseModel):
+    items: List[TransactionBatchItem]
+    updated: int = 0
+    deleted: int = 0
+    not_found: int = 0
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+    parquet = "parquet"
+
+class TransactionImportSummary(BaseModel):
+    count: int = 0
+    skipped: int = 0
+    total_withdrawals: Decimal = Decimal('0.00')
+    total_deposits: Decimal = Decimal('0.00')
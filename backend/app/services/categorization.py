@@ -0,0 +1,263 @@
+"""
+Transaction Categorization Rules
+
+Category rules file transactions under a category from their narration and
+amount. A rule sets any of a keyword (a case-insensitive substring of the
+narration), a regular expression (searched case-insensitively) and a minimum
+and maximum amount, and matches when every condition it sets holds. When
+several rules match, the one with the highest priority wins, and the oldest
+rule among equal priorities.
+
+The rules are compiled once into a Categorizer, so the work per narration
+barely grows with the number of rules:
+
+- Keywords go into one Aho-Corasick automaton, which finds all the keywords
+  contained in a narration in a single pass over its characters. Keywords
+  and narrations are folded like fingerprints are (see
+  app.services.transaction_fingerprint), so case and runs of whitespace do
+  not matter.
+- Running every regular expression on every narration would cost time in
+  proportion to their number, combined into one pattern or not. Instead the
+  longest literal text each expression requires is put into the same
+  automaton, and an expression is only run on the narrations containing its
+  literal. Expressions without one (say, a top-level alternation) run on
+  every narration, so prefer keywords where they can say the same thing.
+- Only the rules found this way, plus those with nothing but amount
+  conditions, are checked further, in precedence order, stopping at the
+  first that matches.
+"""
+import re
+from collections import deque
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from app.services.transaction_fingerprint import normalize_narration
+
+# Non-ASCII characters re.IGNORECASE matches to ASCII letters. Folding them
+# too means a literal taken from a pattern is in the folded narration
+# whenever the pattern matches the original.
+EXTRA_FOLDS = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+
+
+def fold(text: str) -> str:
+    """Narration or keyword as the automaton matches it."""
+    return normalize_narration(text).translate(EXTRA_FOLDS)
+
+
+def required_literal(pattern: str) -> Optional[str]:
+    """
+    Longest folded text every match of ``pattern`` contains, if any.
+
+    Only the literals of the pattern's top-level sequence (and of plain
+    groups in it) are considered; anything repeated, optional or alternated
+    ends a run. Patterns the parser does not understand have no literal, so
+    they are simply always run.
+    """
+    try:
+        from re import _parser
+        items = _parser.parse(pattern, re.IGNORECASE).data
+    except Exception:
+        return None
+
+    runs, run = [], []
+    def walk(items):
+        for op, value in items:
+            name = str(op)
+            if name == "LITERAL" and 32 < value < 127:
+                run.append(chr(value))
+            elif name == "SUBPATTERN":
+                walk(value[-1].data)
+            elif name == "AT":
+                # Anchors and word boundaries match no characters
+                continue
+            else:
+                runs.append("".join(run))
+                run.clear()
+    walk(items)
+    runs.append("".join(run))
+    longest = max(runs, key=len)
+    return fold(longest) or None
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: int
+    category_id: int
+    keyword: Optional[str] = None
+    pattern: Optional[str] = None
+    min_amount: Optional[Decimal] = None
+    max_amount: Optional[Decimal] = None
+    priority: int = 0
+
+    def amount_matches(self, amount: Decimal) -> bool:
+        return (
+            (self.min_amount is None or amount >= self.min_amount)
+            and (self.max_amount is None or amount <= self.max_amount)
+        )
+
+
+def check_pattern(pattern: str) -> None:
+    """Raise ValueError unless ``pattern`` can be used in a rule."""
+    try:
+        re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regular expression: {e}") from e
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton finding which of a fixed set of keywords a text contains."""
+
+    def __init__(self, keywords: Sequence[str]):
+        # Trie of the keywords: goto[state][character] -> state, with the
+        # keyword indices ending at each state in output[state]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[tuple] = [()]
+        for index, keyword in enumerate(keywords):
+            state = 0
+            for character in keyword:
+                following = self._goto[state].get(character)
+                if following is None:
+                    following = len(self._goto)
+                    self._goto.append({})
+                    self._output.append(())
+                    self._goto[state][character] = following
+                state = following
+            self._output[state] += (index,)
+
+        # Failure links, breadth first: the state of the longest proper suffix
+        # of a state's text that is also in the trie. Outputs gather those of
+        # the suffixes, so keywords inside other keywords are reported too.
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and character not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(character, 0)
+                self._fail[following] = target if target != following else 0
+                self._output[following] += self._output[self._fail[following]]
+
+    def find(self, text: str) -> Set[int]:
+        """Indices of the keywords occurring in ``text``."""
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Set[int] = set()
+        state = 0
+        for character in text:
+            while state and character not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(character, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class Categorizer:
+    """A set of rules compiled for matching many transactions."""
+
+    def __init__(self, rules: Iterable[Rule]):
+        # Index order is precedence order
+        self.rules = sorted(rules, key=lambda rule: (-rule.priority, rule.id))
+
+        # Texts for the automaton: keywords and the literals patterns require.
+        # Per text, the rules whose keyword it is and the patterns needing it.
+        needles: Dict[str, int] = {}
+        self._keyword_rules: List[List[int]] = []
+        self._literal_rules: List[List[int]] = []
+        self._patterns: Dict[int, re.Pattern] = {}
+        # Rules checked for every narration: patterns without a literal, and
+        # rules with only amount conditions
+        self._always: List[int] = []
+
+        def needle(text: str) -> int:
+            if text not in needles:
+                needles[text] = len(needles)
+                self._keyword_rules.append([])
+                self._literal_rules.append([])
+            return needles[text]
+
+        for index, rule in enumerate(self.rules):
+            if rule.keyword:
+                self._keyword_rules[needle(fold(rule.keyword))].append(index)
+            if rule.pattern:
+                self._patterns[index] = re.compile(rule.pattern, re.IGNORECASE)
+                literal = required_literal(rule.pattern)
+                if literal:
+                    self._literal_rules[needle(literal)].append(index)
+                elif not rule.keyword:
+                    self._always.append(index)
+            if not rule.keyword and not rule.pattern:
+                self._always.append(index)
+
+        self._matcher = KeywordMatcher(list(needles)) if needles else None
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def categorize(self, narration: str, amount: Decimal) -> Optional[int]:
+        """Category of the winning rule for a transaction, or None if no rule matches."""
+        keyword_hits: Set[int] = set()
+        candidates: Set[int] = set(self._always)
+        if self._matcher is not None:
+            for found in self._matcher.find(fold(narration)):
+                keyword_hits.update(self._keyword_rules[found])
+                candidates.update(self._literal_rules[found])
+            candidates |= keyword_hits
+
+        for index in sorted(candidates):
+            rule = self.rules[index]
+            if rule.keyword and index not in keyword_hits:
+                continue
+            if not rule.amount_matches(amount):
+                continue
+            if rule.pattern and not self._patterns[index].search(narration):
+                continue
+            return rule.category_id
+        return None
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """Every rule at one version of the category_rule table, as sent to the CPU executor."""
+    version: tuple
+    rules: Tuple[Rule, ...]
+
+
+# The rule set last compiled in this process, by version
+_compiled: Tuple[Optional[tuple], Optional[Categorizer]] = (None, None)
+
+
+def compile_rules(rule_set: RuleSet) -> Categorizer:
+    """
+    The Categorizer of a rule set, compiled on first use in each process.
+
+    Compiling thousands of rules takes a while, so the last rule set
+    compiled is kept and reused while its version stays the same.
+    """
+    global _compiled
+    version, categorizer = _compiled
+    if version != rule_set.version or categorizer is None:
+        categorizer = Categorizer(rule_set.rules)
+        _compiled = (rule_set.version, categorizer)
+    return categorizer
+
+
+def categorize_all(
+    rule_set: Optional[RuleSet], transactions: Sequence[Tuple[str, Optional[Decimal], Optional[Decimal]]]
+) -> List[Optional[int]]:
+    """
+    Category of the winning rule for each (narration, withdrawal, deposit), or None where no rule matches.
+
+    CPU-bound for large batches and rule sets, so callers on the event loop
+    run it with app.core.executor.run_cpu_bound.
+    """
+    if rule_set is None:
+        return [None] * len(transactions)
+    categorizer = compile_rules(rule_set)
+    return [
+        categorizer.categorize(narration, (withdrawal or Decimal(0)) + (deposit or Decimal(0)))
+        for narration, withdrawal, deposit in transactions
+    ]
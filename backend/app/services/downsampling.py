@@ -0,0 +1,60 @@
+"""
+Time Series Downsampling
+
+Largest-Triangle-Three-Buckets (LTTB, Steinarsson 2013) reduces a series to a
+fixed number of points while keeping its visual shape: the first and last
+points are always kept, the rest are split into equal buckets and from each
+bucket the point forming the largest triangle with the previously kept point
+and the average of the next bucket is chosen. Peaks and troughs survive,
+which plain averaging or striding would flatten.
+"""
+from typing import List, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[int]:
+    """
+    Indices of the points LTTB keeps from ``points``, in order.
+
+    ``points`` are (x, y) pairs sorted by x. Every index is returned when
+    there are no more than ``threshold`` points; otherwise ``threshold``
+    indices are, which must be at least 3.
+    """
+    if threshold < 3:
+        raise ValueError("LTTB needs a threshold of at least 3 points")
+    if len(points) <= threshold:
+        return list(range(len(points)))
+
+    # Buckets for everything but the first and last point
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    kept = [0]
+    selected = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Average of the next bucket, or the last point for the final bucket
+        next_start, next_end = end, min(int((bucket + 2) * bucket_size) + 1, len(points))
+        if bucket == threshold - 3:
+            next_start, next_end = len(points) - 1, len(points)
+        count = next_end - next_start
+        average_x = sum(x for x, _ in points[next_start:next_end]) / count
+        average_y = sum(y for _, y in points[next_start:next_end]) / count
+
+        selected_x, selected_y = points[selected]
+        largest_area = -1.0
+        for i in range(start, end):
+            x, y = points[i]
+            # Twice the triangle area; the factor does not change the maximum
+            area = abs(
+                (selected_x - average_x) * (y - selected_y)
+                - (selected_x - x) * (average_y - selected_y)
+            )
+            if area > largest_area:
+                largest_area, candidate = area, i
+        kept.append(candidate)
+        selected = candidate
+
+    kept.append(len(points) - 1)
+    return kept
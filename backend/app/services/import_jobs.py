@@ -0,0 +1,294 @@
+"""
+Statement Import Jobs
+
+Background imports of uploaded statements. The upload endpoint registers a
+job and returns straight away. The statement is parsed on the CPU executor,
+which spools pickled batches to a file next to the upload, while the event
+loop streams those batches into the database as they arrive. Jobs live in an
+in-process registry, so no outside broker is needed; progress is reported by
+the /imports endpoints of the server that accepted the upload.
+"""
+import asyncio
+import logging
+import os
+import pickle
+import struct
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Coroutine, Dict, List, Optional
+
+from app.core.executor import run_cpu_bound
+from app.models.import_file import ImportFile
+from app.models.statement_format import StatementFormat
+from app.schemas.transaction import TransactionImportSummary
+from app.services.merchant_extraction import get_extractor
+from app.services.statement_parser import iter_transaction_batches
+
+logger = logging.getLogger(__name__)
+
+# Length prefix written before each pickled batch in a spool file
+SPOOL_FRAME_HEADER = struct.Struct('>I')
+# Seconds to wait for the parser when the spool has no complete batch
+SPOOL_POLL_INTERVAL = 0.05
+# Finished jobs kept for polling; older ones are dropped first
+MAX_FINISHED_JOBS = 100
+
+
+@dataclass
+class ImportJob:
+    """Progress and outcome of one statement import."""
+    id: str
+    filename: str
+    account_id: int
+    statement_format_id: int
+    sha256: Optional[str] = None
+    size: int = 0
+    status: str = "pending"
+    rows_parsed: int = 0
+    rows_inserted: int = 0
+    rows_skipped: int = 0
+    total_withdrawals: Decimal = Decimal('0.00')
+    total_deposits: Decimal = Decimal('0.00')
+    duplicate_of: Optional[int] = None
+    errors: List[str] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return (self.rows_inserted + self.rows_skipped) / elapsed if elapsed else 0.0
+
+    def record_progress(self, summary: TransactionImportSummary) -> None:
+        self.rows_inserted = summary.count
+        self.rows_skipped = summary.skipped
+        self.total_withdrawals = summary.total_withdrawals
+        self.total_deposits = summary.total_deposits
+
+    def complete_from(self, import_file: ImportFile) -> None:
+        """Finish the job with the recorded summary of an earlier import of the same file."""
+        summary = TransactionImportSummary.model_validate(import_file.summary)
+        self.record_progress(summary)
+        self.rows_parsed = summary.count + summary.skipped
+        self.duplicate_of = import_file.id
+        self.status = "completed"
+        self.started_at = self.finished_at = datetime.utcnow()
+
+    def fail(self, error: str) -> None:
+        self.status = "failed"
+        self.errors.append(error)
+
+
+class ImportJobRegistry:
+    """
+    In-process registry of import jobs and the tasks running them.
+
+    Running jobs are always kept; only the most recent MAX_FINISHED_JOBS
+    finished jobs are retained for polling.
+    """
+
+    def __init__(self, max_finished: int = MAX_FINISHED_JOBS):
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def create(
+        self,
+        filename: str,
+        account_id: int,
+        statement_format_id: int,
+        sha256: Optional[str] = None,
+        size: int = 0
+    ) -> ImportJob:
+        job = ImportJob(
+            id=uuid.uuid4().hex,
+            filename=filename,
+            account_id=account_id,
+            statement_format_id=statement_format_id,
+            sha256=sha256,
+            size=size,
+        )
+        self._jobs[job.id] = job
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[ImportJob]:
+        """Jobs newest first."""
+        return list(reversed(self._jobs.values()))
+
+    def start(self, job: ImportJob, coro: Coroutine[Any, Any, None]) -> asyncio.Task:
+        """Run a job's coroutine as a task, holding a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return task
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+
+import_jobs = ImportJobRegistry()
+
+def snapshot_statement_format(statement_format: StatementFormat) -> SimpleNamespace:
+    """Copy a StatementFormat's column values into a plain picklable object."""
+    return SimpleNamespace(**{
+        column.key: getattr(statement_format, column.key)
+        for column in StatementFormat.__table__.columns
+    })
+
+
+def parse_to_spool(
+    file_path: str,
+    statement_format: SimpleNamespace,
+    account_id: int,
+    batch_size: int,
+    engine: str,
+    spool_path: str
+) -> int:
+    """
+    Parse a statement and append each batch to a spool file.
+
+    Runs on the CPU executor. Every batch is written as a length-prefixed
+    pickle and flushed straight away so the reader can pick it up while
+    parsing continues.
+
+    Returns:
+        Number of transactions parsed
+    """
+    count = 0
+    with open(spool_path, 'ab') as spool:
+        for batch in iter_transaction_batches(file_path, statement_format, account_id, batch_size, engine):
+            payload = pickle.dumps(batch, protocol=pickle.HIGHEST_PROTOCOL)
+            spool.write(SPOOL_FRAME_HEADER.pack(len(payload)))
+            spool.write(payload)
+            spool.flush()
+            count += len(batch)
+    return count
+
+
+async def iter_spooled_batches(
+    spool_path: str,
+    parsing: "asyncio.Future[int]",
+    job: Optional[ImportJob] = None
+) -> AsyncIterator[Any]:
+    """
+    Yield batches from a spool file while the parser is still writing it.
+
+    Stops once ``parsing`` has finished and every complete batch has been
+    read, re-raising any error from the parser.
+    """
+    position = 0
+    with open(spool_path, 'rb') as spool:
+        while True:
+            # Checked before reading so a batch written just after the read is not missed
+            parser_done = parsing.done()
+            spool.seek(position)
+            header = spool.read(SPOOL_FRAME_HEADER.size)
+            if len(header) == SPOOL_FRAME_HEADER.size:
+                (size,) = SPOOL_FRAME_HEADER.unpack(header)
+                payload = spool.read(size)
+                if len(payload) == size:
+                    position += SPOOL_FRAME_HEADER.size + size
+                    batch = pickle.loads(payload)
+                    if job is not None:
+                        job.rows_parsed += len(batch)
+                    yield batch
+                    continue
+            if parser_done:
+                parsing.result()
+                return
+            await asyncio.sleep(SPOOL_POLL_INTERVAL)
+
+
+async def run_import_job(
+    job: ImportJob,
+    file_path: str,
+    statement_format: StatementFormat,
+    batch_size: int,
+    engine: str
+) -> None:
+    """
+    Import a saved statement file for ``job``, then delete the file.
+
+    Parsing runs on the CPU executor while batches are inserted as they
+    arrive. All rows are committed together once the whole file has been
+    read, so a failed job leaves no transactions behind. When the job has the
+    file's hash, a completed import is recorded in import_file so an
+    identical upload can be answered without importing it again.
+    """
+    from app.crud import crud_import_file, crud_transaction
+    from app.db.session import AsyncSessionLocal
+
+    job.status = "running"
+    job.started_at = datetime.utcnow()
+    spool_path = f"{file_path}.spool"
+    open(spool_path, 'wb').close()
+
+    parsing = run_cpu_bound(
+        parse_to_spool,
+        file_path,
+        snapshot_statement_format(statement_format),
+        job.account_id,
+        batch_size,
+        engine,
+        spool_path,
+    )
+    try:
+        async with AsyncSessionLocal() as db:
+            summary = await crud_transaction.create_bulk(
+                db=db,
+                batches=iter_spooled_batches(spool_path, parsing, job),
+                on_batch=job.record_progress,
+                merchant_extractor=get_extractor(statement_format.bank_name, statement_format.merchant_pattern),
+            )
+            if (summary.count or summary.skipped) and job.sha256:
+                try:
+                    await crud_import_file.record(
+                        db,
+                        sha256=job.sha256,
+                        filename=job.filename,
+                        size=job.size,
+                        account_id=job.account_id,
+                        statement_format_id=job.statement_format_id,
+                        summary=summary,
+                    )
+                except Exception as e:
+                    # The transactions are committed; only the shortcut for re-uploads is lost
+                    logger.warning("Could not record imported file %s: %s", job.filename, e)
+        if summary.count or summary.skipped:
+            job.status = "completed"
+        else:
+            job.fail("No transactions found in the file")
+    except Exception as e:
+        # The database transaction was rolled back, so nothing was inserted
+        job.record_progress(TransactionImportSummary())
+        job.fail(f"Error processing file: {str(e)}")
+    finally:
+        job.finished_at = datetime.utcnow()
+        # The worker cannot be interrupted; let it finish before removing its files
+        await asyncio.wait([parsing])
+        if not parsing.cancelled():
+            parsing.exception()
+        for path in (spool_path, file_path):
+            if os.path.exists(path):
+                os.unlink(path)
@@ -0,0 +1,117 @@
+"""
+Merchant Extraction
+
+Pulls the merchant out of a narration, so transactions can be grouped by
+merchant without string processing at query time. Banks write narrations in
+a few fixed layouts per payment channel, for instance HDFC's
+
+    UPI-SWIGGY-swiggy@icici-ICIC0DC0099-412345678901-Payment
+    POS 416021XXXXXX1234 AMAZON PAY INDIA PVT POS DEBIT
+    NEFT DR-SBIN0001234-ACME TRADERS-NETBANK, MUM-N123456789
+
+and the merchant is one field of that layout. Each layout is a regular
+expression whose ``merchant`` group captures the field. A statement format
+may set its own pattern, which is tried first, then the patterns of its bank
+(BANK_PATTERNS, picked by bank name), then those shared by most Indian banks
+(GENERIC_PATTERNS). The first pattern that matches wins; narrations no
+pattern matches have no merchant.
+
+The captured text is reduced to a canonical key (see merchant_key): folded
+to lowercase words, without reference numbers, masked card numbers and
+company suffixes, so "SWIGGY", "Swiggy Pvt Ltd" and "SWIGGY 4821" are all
+the merchant "swiggy". The text as first seen is kept as the display name.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+# Patterns for narrations of specific banks, keyed by a word of the bank's name
+BANK_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "hdfc": (
+        # UPI-<payee>-<vpa>-<ifsc>-<reference>-<note>
+        r"UPI-(?P<merchant>[^-@]+)-",
+        # ME DC SI <card> <merchant>: standing instructions on a debit card
+        r"ME DC SI\s+[0-9X*]+\s+(?P<merchant>.+)",
+        # ACH D- TP ACH <merchant>-<reference>
+        r"ACH [DC]-\s*(?:TP ACH\s+)?(?P<merchant>[^-]+)",
+    ),
+}
+
+# Channel layouts shared by most banks
+GENERIC_PATTERNS: Tuple[str, ...] = (
+    # UPI with - or / separators, after any of direction, type and reference fields
+    r"(?:.*?[-/ ])?UPI[-/](?:(?:DR|CR|P2M|P2A|\d+)[-/])*(?P<merchant>[^-/@]*[A-Z][^-/@]*)",
+    # POS <card> <merchant> [POS DEBIT]
+    r"POS\s+(?:[0-9X*]{6,}\s+)?(?P<merchant>.+?)(?:\s+POS DEBIT)?\s*$",
+    # NEFT/RTGS [DR|CR]-<ifsc>-<name>-...
+    r"(?:NEFT|RTGS)\s*(?:DR|CR)?[-/][A-Z]{4}0[A-Z0-9]{6}[-/](?P<merchant>[^-/]+)",
+    # IMPS-<reference>-<name>-...
+    r"IMPS[-/]\d+[-/](?P<merchant>[^-/]+)",
+)
+
+# Words dropped from the end of merchant keys
+COMPANY_SUFFIXES = frozenset({"pvt", "private", "ltd", "limited", "llp", "inc", "corp", "corporation", "co"})
+# Runs of anything but letters and digits, which separate the words of a key
+NON_ALNUM_RUN = re.compile(r"[\W_]+")
+# Reference numbers and masked card numbers, which are not part of a merchant
+NUMBER_WORD = re.compile(r"[0-9x*]*[0-9][0-9x*]*")
+# Merchant names kept by merchant_key()'s cache
+KEY_CACHE_SIZE = 65536
+# Extractors kept by get_extractor()'s cache; merchant patterns are user-edited, so it is bounded
+EXTRACTOR_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def merchant_key(name: str) -> Optional[str]:
+    """Canonical key of a merchant name, or None if nothing identifying is left."""
+    words = [word for word in NON_ALNUM_RUN.split(name.lower()) if word and not NUMBER_WORD.fullmatch(word)]
+    while words and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words) or None
+
+
+def check_merchant_pattern(pattern: str) -> None:
+    """Raise ValueError unless ``pattern`` can be a statement format's merchant pattern."""
+    try:
+        compiled = re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regular expression: {e}") from e
+    if "merchant" not in compiled.groupindex:
+        raise ValueError("The merchant pattern needs a (?P<merchant>...) group")
+
+
+class MerchantExtractor:
+    """An ordered list of narration patterns compiled for extracting merchants from many narrations."""
+
+    def __init__(self, patterns: Sequence[str]):
+        # Matched from the start of the narration. Most patterns begin with a literal and fail on
+        # the first characters; the generic UPI one scans ahead for "UPI" and so costs more
+        self._patterns = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+
+    def extract(self, narration: str) -> Optional[Tuple[str, str]]:
+        """(key, name) of the merchant of a narration, or None."""
+        for pattern in self._patterns:
+            match = pattern.match(narration)
+            if match:
+                name = " ".join(match.group("merchant").split())
+                key = merchant_key(name)
+                if key:
+                    return key, name
+        return None
+
+
+@lru_cache(maxsize=EXTRACTOR_CACHE_SIZE)
+def get_extractor(bank_name: Optional[str] = None, merchant_pattern: Optional[str] = None) -> MerchantExtractor:
+    """
+    The extractor for narrations of a bank, compiled on first use.
+
+    ``merchant_pattern`` is a statement format's own pattern, tried before
+    the bank's.
+    """
+    bank_words = set(NON_ALNUM_RUN.split(bank_name.lower())) if bank_name else set()
+    patterns = [merchant_pattern] if merchant_pattern else []
+    for bank, bank_patterns in BANK_PATTERNS.items():
+        if bank in bank_words:
+            patterns.extend(bank_patterns)
+    patterns.extend(GENERIC_PATTERNS)
+    return MerchantExtractor(patterns)
@@ -0,0 +1,58 @@
+"""
+Recategorization Jobs
+
+Background jobs applying the category rules to existing transactions, for
+when rules are added or changed after the transactions were imported. The
+job and its position are stored in the recategorization table and each
+batch commits its changes together with the new position (see
+crud_recategorization.run_batch), so progress is visible from every worker
+and a job picks up where it stopped: after a pause, a failure, or a restart,
+when the server resumes the jobs that were running.
+"""
+import asyncio
+from typing import Optional, Set
+
+from app.core.config import settings
+
+# Running tasks, referenced until they finish so they are not garbage collected
+_tasks: Set[asyncio.Task] = set()
+
+
+def start(job_id: int, batch_size: Optional[int] = None) -> asyncio.Task:
+    """
+    Run a job in the background until it completes, is paused or fails.
+
+    Starting a job that already has a runner is harmless: batches take the
+    job's row lock, so the runners take turns.
+    """
+    task = asyncio.create_task(run_recategorization(job_id, batch_size or settings.RECATEGORIZATION_BATCH_SIZE))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+async def run_recategorization(job_id: int, batch_size: int) -> None:
+    """Run batches of a job until it is no longer running, recording any error on the job."""
+    from app.crud import crud_recategorization
+    from app.db.session import AsyncSessionLocal
+
+    try:
+        async with AsyncSessionLocal() as db:
+            while True:
+                job = await crud_recategorization.run_batch(db, job_id, batch_size)
+                if job is None or job.status != "running":
+                    return
+    except Exception as e:
+        # The failed batch was rolled back, so resuming starts over from it
+        async with AsyncSessionLocal() as db:
+            await crud_recategorization.fail(db, id=job_id, error=f"Error recategorizing transactions: {str(e)}")
+
+
+async def resume_running() -> None:
+    """Restart the jobs that were running when the server last stopped."""
+    from app.crud import crud_recategorization
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        for job_id in await crud_recategorization.get_running_ids(db):
+            start(job_id)
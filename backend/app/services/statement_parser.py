@@ -1,18 +1,46 @@
 """
 Bank Statement Parser Service
 
-This service extracts transaction data from XLSX/XLS bank statement files
-using StatementFormat configuration.
+This service extracts transaction data from XLSX/XLS/CSV bank statement files
+using StatementFormat configuration. Files are read through the engines in
+statement_readers, selected by content rather than extension.
 """
-import xlrd
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
-from dateutil import parser as date_parser
+from itertools import chain, islice
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Iterator, List, Optional, Tuple, Union
 
 from app.models.statement_format import StatementFormat
 from app.schemas.transaction import TransactionCreate
+from app.services.date_parsing import DateParser
+from app.services.statement_readers import StatementReader, open_statement
 
+if TYPE_CHECKING:
+    from app.services.columnar_parser import TransactionColumns
+
+# Number of transactions handed to the database per batch during imports
+DEFAULT_BATCH_SIZE = 1000
+
+# Narration keywords that mark summary or non-transaction rows
+SKIP_KEYWORDS = ('statement', 'summary', 'opening', 'closing', 'balance', 'generated')
+SKIP_PATTERN = re.compile('|'.join(map(re.escape, SKIP_KEYWORDS)), re.IGNORECASE)
+
+# Rows searched for header names when resolving column references
+HEADER_SEARCH_ROWS = 10
+
+# Data rows sampled to infer the date format when the StatementFormat has none
+DATE_SAMPLE_ROWS = 50
+
+# Excel's last column is XFD, so longer alphabetic references are header names
+MAX_COLUMN_LETTERS = 3
+
+# Number of compiled parse plans kept in memory
+PLAN_CACHE_SIZE = 128
+
+SEPARATOR_CHARS = frozenset('*-=')
 
 def column_letter_to_index(letter: str) -> int:
     """
@@ -30,7 +58,28 @@ def column_letter_to_index(letter: str) -> int:
     return result - 1
 
 
-def get_column_index(sheet: xlrd.sheet.Sheet, column_ref: str, workbook) -> int:
+def build_header_index(rows: List[List[Any]]) -> Dict[str, int]:
+    """
+    Map normalised header cell text to its 0-based column index.
+    
+    The first occurrence (scanning rows top to bottom) wins, so the lookup
+    matches a row-by-row search of the header area.
+    """
+    header_index = {}
+    for row in rows:
+        for col_idx, value in enumerate(row):
+            if value is None:
+                continue
+            header_index.setdefault(str(value).strip().lower(), col_idx)
+    return header_index
+
+
+def is_column_letter(column_ref: str) -> bool:
+    """Check whether a column reference is an Excel column letter such as "A" or "AB"."""
+    return column_ref.isalpha() and len(column_ref) <= MAX_COLUMN_LETTERS
+
+
+def get_column_index(column_ref: str, header_index: Optional[Dict[str, int]] = None) -> int:
     """
     Resolve column reference to 0-based index.
     
@@ -40,62 +89,42 @@ def get_column_index(sheet: xlrd.sheet.Sheet, column_ref: str, workbook) -> int:
     - Numeric strings: "0", "1" (direct index)
     
     Args:
-        sheet: The worksheet
         column_ref: Column reference (letter, name, or index)
-        workbook: The workbook (for date handling)
+        header_index: Header lookup from build_header_index(), needed for names
         
     Returns:
         0-based column index
     """
     # Check if it's a column letter (A, B, C, etc.)
-    if column_ref.upper().isalpha():
+    if is_column_letter(column_ref):
         return column_letter_to_index(column_ref)
     
     # Check if it's a numeric index
     if column_ref.isdigit():
         return int(column_ref)
     
-    # Otherwise, search for column name in header rows (first 10 rows)
-    for row_idx in range(min(10, sheet.nrows)):
-        for col_idx in range(sheet.ncols):
-            cell_value = str(sheet.cell(row_idx, col_idx).value).strip()
-            if cell_value.lower() == column_ref.lower():
-                return col_idx
-    
-    raise ValueError(f"Could not resolve column reference: {column_ref}")
+    # Otherwise, look the column name up in the header rows
+    col_idx = (header_index or {}).get(column_ref.strip().lower())
+    if col_idx is None:
+        raise ValueError(f"Could not resolve column reference: {column_ref}")
+    return col_idx
 
 
-def parse_date(value, workbook) -> Optional[datetime]:
+def parse_date(value, reader: StatementReader) -> Optional[datetime]:
     """
     Parse date value from Excel cell.
     
+    One-off helper; import loops use a DateParser so the format is learned
+    once per file and repeated values are memoised.
+    
     Args:
-        value: Cell value (can be Excel date number or string)
-        workbook: Workbook for date mode
+        value: Cell value (datetime, Excel date number or string)
+        reader: Reader the value came from, for Excel date conversion
         
     Returns:
-        datetime object or None if empty
+        datetime object or None if empty or unparseable
     """
-    if not value:
-        return None
-    
-    # If it's an Excel date number
-    if isinstance(value, float):
-        try:
-            date_tuple = xlrd.xldate_as_tuple(value, workbook.datemode)
-            return datetime(*date_tuple)
-        except:
-            pass
-    
-    # If it's a string, try to parse it
-    if isinstance(value, str):
-        try:
-            # Try common date formats
-            return date_parser.parse(value, dayfirst=True)  # DD/MM/YYYY format common in India
-        except:
-            pass
-    
-    return None
+    return DateParser()(value, reader)
 
 
 def parse_amount(value) -> Decimal:
@@ -106,130 +135,328 @@ def parse_amount(value) -> Decimal:
         value: Cell value (number or string)
         
     Returns:
-        Decimal amount (0.00 if empty or invalid)
+        Decimal amount (0.00 if empty, invalid, NaN or infinite)
     """
     if not value:
         return Decimal('0.00')
     
     try:
         if isinstance(value, (int, float)):
-            return Decimal(str(value))
-        
-        # Remove common formatting characters
-        cleaned = str(value).replace(',', '').replace(' ', '').strip()
-        if cleaned:
-            return Decimal(cleaned)
+            amount = Decimal(str(value))
+        else:
+            # Remove common formatting characters
+            cleaned = str(value).replace(',', '').replace(' ', '').strip()
+            amount = Decimal(cleaned) if cleaned else None
+        if amount is not None and amount.is_finite():
+            return amount
     except:
         pass
     
     return Decimal('0.00')
 
 
-def is_separator_row(sheet: xlrd.sheet.Sheet, row_idx: int) -> bool:
+def is_separator_value(value: Any) -> bool:
+    """Check if a single cell holds separator characters (asterisks, dashes or equals)."""
+    return isinstance(value, str) and bool(value) and SEPARATOR_CHARS.issuperset(value.strip())
+
+
+@dataclass(frozen=True)
+class ParsePlan:
     """
-    Check if a row is a separator row (contains only asterisks or dashes).
+    Compiled parsing instructions for one StatementFormat version.
     
-    Args:
-        sheet: The worksheet
-        row_idx: Row index
+    Holds everything that does not depend on individual rows so the row loop
+    only indexes cells and converts values.
+    """
+    start_row: int
+    date_col: int
+    narration_col: int
+    withdrawal_col: int
+    deposit_col: int
+    date_format: Optional[str]
+    skip_pattern: "re.Pattern[str]"
+    
+    @property
+    def width(self) -> int:
+        """Number of cells a row needs for every configured column to exist."""
+        return max(self.date_col, self.narration_col, self.withdrawal_col, self.deposit_col) + 1
+    
+    def is_skipped(self, narration: str) -> bool:
+        """Check if a narration marks a summary or other non-transaction row."""
+        return self.skip_pattern.search(narration) is not None
+    
+    def is_separator(self, row: List[Any]) -> bool:
+        """
+        Check if a row is a separator row, by its date cell.
         
-    Returns:
-        True if row is a separator
+        A row of separators has no date, so it would be dropped by the date
+        check anyway; this just avoids parsing separator dates. A dated row
+        is kept whatever its other cells hold, so a narration of dashes does
+        not drop a transaction.
+        """
+        return is_separator_value(row[self.date_col])
+
+
+_plan_cache: "OrderedDict[Hashable, ParsePlan]" = OrderedDict()
+
+
+def column_refs(statement_format: StatementFormat) -> Tuple[str, str, str, str]:
+    """The date, narration, withdrawal and deposit column references of a StatementFormat."""
+    return (
+        statement_format.date_column,
+        statement_format.narration_column,
+        statement_format.withdrawal_column,
+        statement_format.deposit_column,
+    )
+
+
+def read_header_index(statement_format: StatementFormat, reader: StatementReader) -> Optional[Dict[str, int]]:
+    """
+    Header lookup of a statement file, or None when no column is referenced by name.
+    
+    Header rows are only read when a column is referenced by name.
     """
-    for col_idx in range(sheet.ncols):
-        value = str(sheet.cell(row_idx, col_idx).value).strip()
-        if value and not all(c in '*-=' for c in value):
-            return False
-    return True
+    if all(is_column_letter(ref) or ref.isdigit() for ref in column_refs(statement_format)):
+        return None
+    return build_header_index(reader.header_rows(HEADER_SEARCH_ROWS))
 
 
-def extract_transactions(
-    file_path: str, 
+def compile_parse_plan(statement_format: StatementFormat, header_index: Optional[Dict[str, int]] = None) -> ParsePlan:
+    """Resolve a StatementFormat against the header lookup of a statement file into a ParsePlan."""
+    date_col, narration_col, withdrawal_col, deposit_col = (
+        get_column_index(ref, header_index) for ref in column_refs(statement_format)
+    )
+    return ParsePlan(
+        # Configured row is 1-indexed, rows are 0-indexed in code
+        start_row=statement_format.data_start_row - 1,
+        date_col=date_col,
+        narration_col=narration_col,
+        withdrawal_col=withdrawal_col,
+        deposit_col=deposit_col,
+        date_format=getattr(statement_format, 'date_format', None) or None,
+        skip_pattern=SKIP_PATTERN,
+    )
+
+
+def plan_cache_key(
+    statement_format: StatementFormat, header_index: Optional[Dict[str, int]] = None
+) -> Optional[Tuple[Hashable, ...]]:
+    """
+    Cache key identifying a StatementFormat version, or None if it has no identity.
+    
+    updated_at changes on every edit, so an edited format never reuses a stale
+    plan. Columns referenced by name are found in each file's header rows,
+    which may differ between files, so the header lookup is part of the key.
+    """
+    format_id = getattr(statement_format, 'id', None)
+    if format_id is None:
+        return None
+    headers = tuple(sorted(header_index.items())) if header_index is not None else None
+    return (format_id, getattr(statement_format, 'updated_at', None), headers)
+
+
+def get_parse_plan(statement_format: StatementFormat, reader: StatementReader) -> ParsePlan:
+    """
+    Return the ParsePlan for a StatementFormat and a statement file, compiling it on first use.
+    
+    Plans are kept in an LRU cache keyed by format id, updated_at and, for
+    formats naming columns, the file's header rows, so repeat imports with
+    the same format skip column resolution.
+    """
+    header_index = read_header_index(statement_format, reader)
+    key = plan_cache_key(statement_format, header_index)
+    if key is None:
+        return compile_parse_plan(statement_format, header_index)
+    
+    plan = _plan_cache.get(key)
+    if plan is not None:
+        _plan_cache.move_to_end(key)
+        return plan
+    
+    plan = compile_parse_plan(statement_format, header_index)
+    _plan_cache[key] = plan
+    if len(_plan_cache) > PLAN_CACHE_SIZE:
+        _plan_cache.popitem(last=False)
+    return plan
+
+
+def open_statement_file(file_path: str) -> StatementReader:
+    """
+    Open a statement file for extraction.
+    
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        Exception: If the file cannot be opened as a statement
+    """
+    try:
+        return open_statement(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {file_path}")
+    except Exception as e:
+        raise Exception(f"Error extracting transactions: {str(e)}")
+
+
+def import_metadata(file_path: str) -> Dict[str, Any]:
+    """Metadata recorded on every transaction imported from ``file_path``."""
+    return {
+        'source': 'imported',
+        'file': file_path.split('/')[-1]
+    }
+
+
+def make_date_parser(plan: ParsePlan, sample_rows: List[List[Any]]) -> DateParser:
+    """
+    Create the DateParser for one file, learning its date format from the
+    sample rows unless the StatementFormat pins one.
+    """
+    parser = DateParser(plan.date_format)
+    parser.learn([
+        row[plan.date_col] for row in sample_rows
+        if len(row) > plan.date_col and not is_separator_value(row[plan.date_col])
+    ])
+    return parser
+
+
+def log_plan(plan: ParsePlan, reader: StatementReader, date_parser: DateParser) -> None:
+    print(f"Extracting from row {plan.start_row + 1} (0-based: {plan.start_row}) "
+          f"using {reader.engine}")
+    print(f"Column indices - Date: {plan.date_col}, Narration: {plan.narration_col}, "
+          f"Withdrawal: {plan.withdrawal_col}, Deposit: {plan.deposit_col}")
+    print(f"Date format: {date_parser.date_format or 'unknown, using dateutil'}")
+
+
+def iter_transactions(
+    file_path: str,
     statement_format: StatementFormat,
     account_id: int
-) -> List[TransactionCreate]:
+) -> Iterator[TransactionCreate]:
     """
-    Extract transactions from XLS/XLSX file using StatementFormat configuration.
+    Lazily extract transactions from a statement file using StatementFormat configuration.
+    
+    Transactions are yielded one at a time as rows are read, so callers can
+    consume arbitrarily large statements without materialising the full list.
     
     Args:
-        file_path: Path to the XLS/XLSX file
+        file_path: Path to the XLS/XLSX/CSV file
         statement_format: StatementFormat object with parsing configuration
         account_id: Account ID to associate transactions with
         
-    Returns:
-        List of TransactionCreate objects
+    Yields:
+        TransactionCreate objects
         
     Raises:
         FileNotFoundError: If file doesn't exist
         ValueError: If column references are invalid
     """
-    transactions = []
-    
-    try:
-        # Open workbook
-        workbook = xlrd.open_workbook(file_path)
-        sheet = workbook.sheet_by_index(0)
-        
-        # Resolve column indices
-        date_col = get_column_index(sheet, statement_format.date_column, workbook)
-        narration_col = get_column_index(sheet, statement_format.narration_column, workbook)
-        withdrawal_col = get_column_index(sheet, statement_format.withdrawal_column, workbook)
-        deposit_col = get_column_index(sheet, statement_format.deposit_column, workbook)
+    reader = open_statement_file(file_path)
+    with reader:
+        plan = get_parse_plan(statement_format, reader)
+        metadata = import_metadata(file_path)
         
-        # Start from configured row (1-indexed in config, 0-indexed in code)
-        start_row = statement_format.data_start_row - 1
+        # Learn the date format from the first rows unless the format pins it
+        rows = reader.iter_rows(plan.start_row)
+        sample = list(islice(rows, DATE_SAMPLE_ROWS))
+        parse_date_value = make_date_parser(plan, sample)
+        log_plan(plan, reader, parse_date_value)
         
-        print(f"Extracting from row {statement_format.data_start_row} (0-based: {start_row})")
-        print(f"Column indices - Date: {date_col}, Narration: {narration_col}, "
-              f"Withdrawal: {withdrawal_col}, Deposit: {deposit_col}")
+        # Bind plan attributes locally to keep the row loop tight
+        date_col, narration_col = plan.date_col, plan.narration_col
+        withdrawal_col, deposit_col = plan.withdrawal_col, plan.deposit_col
+        width = plan.width
+        is_separator = plan.is_separator
+        is_skipped = plan.is_skipped
+        padding = [None] * width
         
-        # Process each row
-        for row_idx in range(start_row, sheet.nrows):
+        for row in chain(sample, rows):
+            # Pad short rows so every configured column can be indexed
+            if len(row) < width:
+                row = row + padding[len(row):]
+            
             # Skip separator rows
-            if is_separator_row(sheet, row_idx):
+            if is_separator(row):
                 continue
             
-            # Get cell values
-            date_value = sheet.cell(row_idx, date_col).value
-            narration_value = sheet.cell(row_idx, narration_col).value
-            withdrawal_value = sheet.cell(row_idx, withdrawal_col).value
-            deposit_value = sheet.cell(row_idx, deposit_col).value
-            
             # Parse values
-            transaction_date = parse_date(date_value, workbook)
+            transaction_date = parse_date_value(row[date_col], reader)
+            narration_value = row[narration_col]
             narration = str(narration_value).strip() if narration_value else ""
-            withdrawal_amount = parse_amount(withdrawal_value)
-            deposit_amount = parse_amount(deposit_value)
             
             # Skip if no valid date or narration (likely end of data)
             if not transaction_date or not narration:
                 continue
             
             # Skip summary rows or non-transaction rows
-            if any(keyword in narration.lower() for keyword in ['statement', 'summary', 'opening', 'closing', 'balance', 'generated']):
+            if is_skipped(narration):
                 continue
             
-            # Create transaction object
-            transaction = TransactionCreate(
+            yield TransactionCreate(
                 account_id=account_id,
                 date=transaction_date,
                 narration=narration,
-                withdrawal_amount=withdrawal_amount,
-                deposit_amount=deposit_amount,
-                metadata_={
-                    'source': 'imported',
-                    'file': file_path.split('/')[-1]
-                }
+                withdrawal_amount=parse_amount(row[withdrawal_col]),
+                deposit_amount=parse_amount(row[deposit_col]),
+                metadata_=dict(metadata)
             )
-            
-            transactions.append(transaction)
-            print(f"Row {row_idx + 1}: {transaction_date:%Y-%m-%d} | {narration[:50]} | "
-                  f"W: {withdrawal_amount} | D: {deposit_amount}")
+
+
+def iter_transaction_batches(
+    file_path: str,
+    statement_format: StatementFormat,
+    account_id: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    engine: str = "row"
+) -> Iterator[Union[List[TransactionCreate], "TransactionColumns"]]:
+    """
+    Extract transactions in fixed-size batches.
+    
+    Args:
+        file_path: Path to the XLS/XLSX/CSV file
+        statement_format: StatementFormat object with parsing configuration
+        account_id: Account ID to associate transactions with
+        batch_size: Maximum number of transactions per batch
+        engine: "row" for lists of TransactionCreate, or "columnar" for
+            TransactionColumns batches from the columnar engine
+        
+    Yields:
+        Batches of at most ``batch_size`` transactions
+    """
+    if engine == "columnar":
+        from app.services.columnar_parser import iter_transaction_columns
+        yield from iter_transaction_columns(file_path, statement_format, account_id, batch_size)
+        return
+    if engine != "row":
+        raise ValueError(f"Unknown parser engine: {engine}")
+    
+    transactions = iter_transactions(file_path, statement_format, account_id)
+    while True:
+        batch = list(islice(transactions, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def extract_transactions(
+    file_path: str, 
+    statement_format: StatementFormat,
+    account_id: int
+) -> List[TransactionCreate]:
+    """
+    Extract transactions from a statement file using StatementFormat configuration.
+    
+    Eager counterpart of iter_transactions(), kept for small files and scripts.
+    
+    Args:
+        file_path: Path to the XLS/XLSX/CSV file
+        statement_format: StatementFormat object with parsing configuration
+        account_id: Account ID to associate transactions with
         
-        print(f"\nExtracted {len(transactions)} transactions")
-        return transactions
+    Returns:
+        List of TransactionCreate objects
         
-    except FileNotFoundError:
-        raise FileNotFoundError(f"File not found: {file_path}")
-    except Exception as e:
-        raise Exception(f"Error extracting transactions: {str(e)}")
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If column references are invalid
+    """
+    transactions = list(iter_transactions(file_path, statement_format, account_id))
+    print(f"\nExtracted {len(transactions)} transactions")
+    return transactions
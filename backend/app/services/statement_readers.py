@@ -0,0 +1,218 @@
+"""
+Statement Reader Engines
+
+Row-oriented readers for the spreadsheet and delimited text formats banks
+export. The engine is chosen from the file's magic bytes rather than its
+extension, so a mislabelled .xls that is really an .xlsx (or vice versa) still
+opens correctly.
+"""
+import codecs
+import csv
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+import openpyxl
+import xlrd
+from openpyxl.utils.datetime import from_excel
+
+# OLE2 compound document header used by legacy .xls workbooks
+XLS_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+# ZIP local file header used by OOXML .xlsx workbooks
+XLSX_MAGIC = b'PK\x03\x04'
+
+# Bytes read from the start of text files to sniff encoding and delimiter
+SNIFF_SIZE = 64 * 1024
+# Read buffer for streaming delimited text files
+CSV_BUFFER_SIZE = 1024 * 1024
+CSV_DELIMITERS = ',;\t|'
+# Byte order marks, longest first so UTF-32 is not mistaken for UTF-16
+TEXT_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+class StatementReader:
+    """
+    Base class for statement readers.
+
+    Readers expose the first worksheet as plain lists of cell values and are
+    used as context managers so the underlying workbook is always released.
+    """
+    engine: str = ""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def header_rows(self, count: int) -> List[List[Any]]:
+        """Return the first ``count`` rows, used to resolve column names."""
+        return list(islice(self.iter_rows(0), count))
+
+    def iter_rows(self, start_row: int) -> Iterator[List[Any]]:
+        """Yield rows from ``start_row`` (0-based) to the end of the sheet."""
+        raise NotImplementedError
+
+    def excel_date(self, value: float) -> datetime:
+        """Convert an Excel serial date number to a datetime."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "StatementReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class XlrdReader(StatementReader):
+    """Reader for legacy .xls workbooks backed by xlrd."""
+    engine = "xlrd"
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        # on_demand defers loading every sheet but the one we ask for, and the
+        # file is memory-mapped rather than read into a second in-memory copy
+        self.workbook = xlrd.open_workbook(file_path, on_demand=True, use_mmap=True)
+        self.sheet = self.workbook.sheet_by_index(0)
+
+    def header_rows(self, count: int) -> List[List[Any]]:
+        return [self.sheet.row_values(row_idx) for row_idx in range(min(count, self.sheet.nrows))]
+
+    def iter_rows(self, start_row: int) -> Iterator[List[Any]]:
+        for row_idx in range(start_row, self.sheet.nrows):
+            yield self.sheet.row_values(row_idx)
+
+    def excel_date(self, value: float) -> datetime:
+        return datetime(*xlrd.xldate_as_tuple(value, self.workbook.datemode))
+
+    def close(self) -> None:
+        self.workbook.release_resources()
+
+
+class OpenpyxlReader(StatementReader):
+    """Reader for .xlsx workbooks using openpyxl's streaming read-only mode."""
+    engine = "openpyxl"
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        # Opened as a file object: openpyxl rejects paths without an .xlsx suffix
+        self.file = open(file_path, 'rb')
+        self.workbook = openpyxl.load_workbook(self.file, read_only=True, data_only=True)
+        self.sheet = self.workbook.worksheets[0]
+
+    def iter_rows(self, start_row: int) -> Iterator[List[Any]]:
+        for row in self.sheet.iter_rows(min_row=start_row + 1, values_only=True):
+            yield list(row)
+
+    def excel_date(self, value: float) -> datetime:
+        return from_excel(value, self.workbook.epoch)
+
+    def close(self) -> None:
+        self.workbook.close()
+        self.file.close()
+
+
+class CsvReader(StatementReader):
+    """
+    Reader for CSV/TSV exports backed by the csv module.
+
+    The encoding and delimiter are sniffed from the first SNIFF_SIZE bytes and
+    the file is then streamed row by row, so memory use does not depend on
+    the file size.
+    """
+    engine = "csv"
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        with open(file_path, 'rb') as f:
+            sample = f.read(SNIFF_SIZE)
+        self.encoding = sniff_encoding(sample)
+        self.delimiter = sniff_delimiter(sample.decode(self.encoding, errors='ignore'))
+
+    def iter_rows(self, start_row: int) -> Iterator[List[Any]]:
+        with open(self.file_path, newline='', encoding=self.encoding, buffering=CSV_BUFFER_SIZE) as f:
+            yield from islice(csv.reader(f, delimiter=self.delimiter), start_row, None)
+
+    def excel_date(self, value: float) -> datetime:
+        raise ValueError("Delimited text files have no serial dates")
+
+
+def sniff_encoding(sample: bytes) -> str:
+    """
+    Guess the text encoding of a file from its leading bytes.
+
+    A byte order mark wins; otherwise UTF-8 is assumed if the sample decodes
+    cleanly, falling back to cp1252 which most banking exports use.
+    """
+    for bom, encoding in TEXT_BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        # Incremental decoding tolerates a multi-byte character cut off at the end
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+
+def sniff_delimiter(sample: str) -> str:
+    """Guess the field delimiter of a delimited text sample."""
+    # Only sniff complete lines; the last one may be cut off mid-row
+    lines = sample.splitlines()[:-1] or sample.splitlines()
+    try:
+        return csv.Sniffer().sniff('\n'.join(lines), delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        return max(CSV_DELIMITERS, key=sample.count)
+
+
+def is_text(sample: bytes) -> bool:
+    """Check whether leading file bytes look like text rather than a binary format."""
+    if any(sample.startswith(bom) for bom, _ in TEXT_BOMS):
+        return True
+    return b'\x00' not in sample
+
+
+# Reader engines keyed by the file kind detected from magic bytes
+READERS: Dict[str, Type[StatementReader]] = {
+    "xls": XlrdReader,
+    "xlsx": OpenpyxlReader,
+    "csv": CsvReader,
+}
+
+
+def detect_file_kind(file_path: str) -> Optional[str]:
+    """
+    Detect the statement file kind from its leading bytes.
+
+    Returns:
+        "xls", "xlsx", "csv" or None if the content is not recognised
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(SNIFF_SIZE)
+    if head.startswith(XLS_MAGIC):
+        return "xls"
+    if head.startswith(XLSX_MAGIC):
+        return "xlsx"
+    if head and is_text(head):
+        return "csv"
+    return None
+
+
+def open_statement(file_path: str) -> StatementReader:
+    """
+    Open a statement file with the reader engine matching its content.
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If the file format is not supported
+    """
+    kind = detect_file_kind(file_path)
+    if kind not in READERS:
+        raise ValueError("Unsupported statement file format")
+    return READERS[kind](file_path)
@@ -0,0 +1,163 @@
+"""
+Transaction Export
+
+Encoders turning the batches of crud_transaction.stream_export() into the
+bytes of an export file, one chunk per batch, so a response can stream an
+export of any size while holding a single batch in memory.
+
+NDJSON holds one JSON object per transaction with amounts as strings, like
+the API's Transaction responses. CSV flattens categories into one
+"; "-separated column and metadata into JSON text. Parquet writes one row
+group per batch and needs the optional pyarrow package, imported only when a
+Parquet export is requested.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List
+
+from app.schemas.transaction import ExportFormat
+
+ExportBatch = List[Dict[str, Any]]
+
+FIELDS = ("id", "date", "account_id", "narration", "withdrawal_amount", "deposit_amount", "categories", "metadata")
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    ExportFormat.parquet: "application/vnd.apache.parquet",
+}
+
+CATEGORY_SEPARATOR = "; "
+
+
+def encode(batches: AsyncIterable[ExportBatch], format: ExportFormat) -> AsyncIterator[bytes]:
+    """Chunks of an export of ``batches`` in ``format``."""
+    if format == ExportFormat.csv:
+        return _csv(batches)
+    if format == ExportFormat.parquet:
+        return _parquet(batches)
+    return _ndjson(batches)
+
+
+def require_pyarrow() -> None:
+    """Raise RuntimeError when Parquet exports are unavailable, before a response starts."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("Parquet exports need the pyarrow package (pip install pyarrow)") from e
+
+
+def _text(value: Any) -> Any:
+    """Decimals and datetimes as the API writes them in JSON; None stays None."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def _ndjson(batches: AsyncIterable[ExportBatch]) -> AsyncIterator[bytes]:
+    # Values are converted up front so json.dumps never has to call back into Python
+    dumps = json.JSONEncoder(check_circular=False).encode
+    async for batch in batches:
+        yield "".join([
+            dumps({
+                "id": row["id"],
+                "date": row["date"].isoformat(),
+                "account_id": row["account_id"],
+                "narration": row["narration"],
+                "withdrawal_amount": _text(row["withdrawal_amount"]),
+                "deposit_amount": _text(row["deposit_amount"]),
+                "categories": row["categories"],
+                "metadata": row["metadata"],
+            }) + "\n"
+            for row in batch
+        ]).encode()
+
+
+async def _csv(batches: AsyncIterable[ExportBatch]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    # The header goes out before the first rows are fetched
+    yield buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    async for batch in batches:
+        for row in batch:
+            writer.writerow((
+                row["id"],
+                row["date"].isoformat(),
+                row["account_id"],
+                row["narration"],
+                row["withdrawal_amount"],
+                row["deposit_amount"],
+                CATEGORY_SEPARATOR.join(row["categories"]),
+                "" if row["metadata"] is None else json.dumps(row["metadata"]),
+            ))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file keeping what was written until taken, while counting the offset for Parquet."""
+
+    def __init__(self):
+        self.position = 0
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self.position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _parquet(batches: AsyncIterable[ExportBatch]) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    amount = pa.decimal128(10, 2)
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("date", pa.timestamp("us")),
+        ("account_id", pa.int64()),
+        ("narration", pa.string()),
+        ("withdrawal_amount", amount),
+        ("deposit_amount", amount),
+        ("categories", pa.list_(pa.string())),
+        ("metadata", pa.string()),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        async for batch in batches:
+            writer.write_table(pa.Table.from_pylist(
+                [
+                    {
+                        **row,
+                        "metadata": None if row["metadata"] is None else json.dumps(row["metadata"]),
+                    }
+                    for row in batch
+                ],
+                schema=schema,
+            ))
+            yield sink.take()
+    finally:
+        writer.close()
+    # Closing writes the footer
+    yield sink.take()
@@ -0,0 +1,63 @@
+"""
+Extract the merchants of transactions stored before merchants were.
+
+New transactions get their merchant when they are stored; this fills in
+transaction.merchant_id for older ones, a batch at a time, each committed on
+its own (see crud_merchant.assign_batch). Interrupting it is safe: running
+it again skips the transactions that already have a merchant.
+
+Usage:
+    python scripts/backfill_merchants.py [--batch-size 10000]
+
+Uses the database configured in app.core.config.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.db.base  # noqa: F401 - registers every model
+from app.core.config import settings
+from app.crud import crud_merchant
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=10_000, help="transactions read per batch")
+    args = parser.parse_args()
+
+    engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    started = time.perf_counter()
+    after, scanned, assigned = 0, 0, 0
+    # Merchant ids by key, shared by every batch
+    known = {}
+    try:
+        async with session_factory() as db:
+            while True:
+                last_id, batch_scanned, batch_assigned = await crud_merchant.assign_batch(
+                    db, after=after, batch_size=args.batch_size, known=known
+                )
+                if last_id is None:
+                    break
+                after = last_id
+                scanned += batch_scanned
+                assigned += batch_assigned
+                elapsed = time.perf_counter() - started
+                print(f"Read {scanned} transactions, {assigned} with a merchant, up to id {after} ({scanned / elapsed:.0f}/s)")
+    finally:
+        await engine.dispose()
+
+    print(f"Done in {time.perf_counter() - started:.1f}s: {assigned} of {scanned} transactions given one of {len(known)} merchants")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,166 @@
+"""
+Benchmark bulk transaction imports against a live database.
+
+Compares the original ORM import (add_all with the 'others' relationship on
+every object, commit, then a selectinload re-select of every id) with the
+executemany INSERT path and the PostgreSQL COPY path of
+crud_transaction.create_bulk, reporting rows/sec for each.
+
+Usage:
+    python scripts/bench_bulk_import.py [--rows 30000] [--batch-size 1000]
+
+Uses the database configured in app.core.config (run migrations first). A
+scratch account is created for the run and removed, with its transactions,
+afterwards.
+
+The original path re-selects every row with one bind parameter per id, so it
+fails outright above asyncpg's 32767 parameter limit; it is skipped for
+larger --rows.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from app.core.config import settings
+from app.crud import crud_transaction
+from app.models.account import AccountType, BankAccount
+from app.models.category import Category, transaction_category
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionCreate
+
+# asyncpg's limit on bind parameters in a single query
+MAX_QUERY_ARGUMENTS = 32767
+
+
+def generate_batches(account_id: int, rows: int, batch_size: int):
+    start = datetime(2020, 1, 1)
+    batch = []
+    for i in range(rows):
+        batch.append(TransactionCreate(
+            account_id=account_id,
+            date=start + timedelta(days=i // 50),
+            narration=f"UPI-MERCHANT{i % 500}-{i}-PAYMENT",
+            withdrawal_amount=Decimal(i % 997).scaleb(-2) if i % 3 else Decimal(0),
+            deposit_amount=Decimal(0) if i % 3 else Decimal(i % 9973),
+            metadata_={"source": "imported", "file": "bench.xls"},
+        ))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def legacy_create_bulk(db: AsyncSession, objs_in):
+    """The ORM import create_bulk used before the set-based paths."""
+    result = await db.execute(select(Category).filter(Category.name == "others"))
+    others_category = result.scalars().first()
+
+    db_objs = [
+        Transaction(
+            account_id=obj_in.account_id,
+            date=obj_in.date,
+            narration=obj_in.narration,
+            withdrawal_amount=obj_in.withdrawal_amount,
+            deposit_amount=obj_in.deposit_amount,
+            metadata_=obj_in.metadata_,
+        )
+        for obj_in in objs_in
+    ]
+    if others_category:
+        for db_obj in db_objs:
+            db_obj.categories = [others_category]
+
+    db.add_all(db_objs)
+    await db.commit()
+
+    result = await db.execute(
+        select(Transaction)
+        .options(selectinload(Transaction.categories))
+        .filter(Transaction.id.in_([obj.id for obj in db_objs]))
+    )
+    return result.scalars().all()
+
+
+async def measure(label: str, session_factory, account_id: int, rows: int, run):
+    try:
+        async with session_factory() as db:
+            started = time.perf_counter()
+            count = await run(db)
+            elapsed = time.perf_counter() - started
+    finally:
+        async with session_factory() as db:
+            ids = select(Transaction.id).filter(Transaction.account_id == account_id)
+            await db.execute(delete(transaction_category).where(transaction_category.c.transaction_id.in_(ids)))
+            await db.execute(delete(Transaction).filter(Transaction.account_id == account_id))
+            await db.commit()
+
+    assert count == rows, f"{label}: imported {count} of {rows} rows"
+    print(f"{label:<28} {count:>9} rows  {elapsed:8.2f}s  {count / elapsed:>10,.0f} rows/s")
+    return count / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=30_000, help="transactions per run")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as db:
+        result = await db.execute(select(Category).filter(Category.name == "others"))
+        if result.scalars().first() is None:
+            db.add(Category(name="others", description="Default category"))
+        account = BankAccount(account_name="bench_bulk_import", bank_name="Bench", account_type=AccountType.debit)
+        db.add(account)
+        await db.commit()
+        account_id = account.id
+
+    # Parsed up front so only the database write is timed
+    batches = list(generate_batches(account_id, args.rows, args.batch_size))
+
+    async def legacy(db):
+        return len(await legacy_create_bulk(db, [obj for batch in batches for obj in batch]))
+
+    async def bulk(db):
+        summary = await crud_transaction.create_bulk(db, batches)
+        return summary.count
+
+    async def bulk_insert(db):
+        # Force the executemany INSERT path used for non-PostgreSQL databases
+        copy_batch = crud_transaction._copy_batch
+        crud_transaction._copy_batch = crud_transaction._insert_batch
+        try:
+            return await bulk(db)
+        finally:
+            crud_transaction._copy_batch = copy_batch
+
+    try:
+        baseline = None
+        if args.rows <= MAX_QUERY_ARGUMENTS:
+            baseline = await measure("ORM add_all (original)", session_factory, account_id, args.rows, legacy)
+        await measure("create_bulk (INSERT)", session_factory, account_id, args.rows, bulk_insert)
+        copy_rate = await measure("create_bulk (COPY)", session_factory, account_id, args.rows, bulk)
+        if baseline:
+            print(f"COPY speedup over the original path: {copy_rate / baseline:.1f}x")
+    finally:
+        async with session_factory() as db:
+            await db.execute(delete(BankAccount).filter(BankAccount.id == account_id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
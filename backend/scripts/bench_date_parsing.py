@@ -0,0 +1,63 @@
+"""
+Micro-benchmark for statement date parsing.
+
+Parses the date column of a synthetic 100k-row statement with plain
+dateutil (the previous per-row behaviour) and with DateParser, both with the
+format inferred from a sample and with caching defeated by unique dates.
+
+Usage:
+    python scripts/bench_date_parsing.py [--rows 100000]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dateutil import parser as date_parser
+
+from app.services.date_parsing import DateParser
+
+
+def generate_dates(rows: int, rows_per_day: int):
+    start = date(2015, 1, 1)
+    return [(start + timedelta(days=i // rows_per_day)).strftime("%d/%m/%y") for i in range(rows)]
+
+
+def bench(label: str, parse, values, baseline=None):
+    started = time.perf_counter()
+    for value in values:
+        parse(value)
+    elapsed = time.perf_counter() - started
+    speedup = f"  {baseline / elapsed:6.1f}x" if baseline else ""
+    print(f"{label:<40} {elapsed:8.3f}s  {len(values) / elapsed:>12,.0f} dates/s{speedup}")
+    return elapsed
+
+
+def dateutil_parse(value):
+    return date_parser.parse(value, dayfirst=True)
+
+
+def learned_parser(values):
+    parser = DateParser()
+    parser.learn(values[:50])
+    return parser
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for label, rows_per_day in (("typical statement, 20 rows/day", 20), ("unique dates", 1)):
+        values = generate_dates(args.rows, rows_per_day)
+        print(f"\n{args.rows} rows, {label}:")
+        baseline = bench("dateutil.parser.parse(dayfirst=True)", dateutil_parse, values)
+        date_parser_ = learned_parser(values)
+        bench(f"DateParser ({date_parser_.date_format})", date_parser_, values, baseline)
+
+
+if __name__ == "__main__":
+    main()
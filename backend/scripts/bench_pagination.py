@@ -0,0 +1,90 @@
+"""
+Benchmark deep pages of GET /transactions/ against a live database.
+
+Walks the transaction list page by page with crud_transaction.get_multi,
+following cursors as the endpoint does, and reports the latency of
+selected pages. The same pages fetched with the OFFSET query get_multi used
+before are timed alongside for comparison.
+
+Usage:
+    python scripts/bench_pagination.py [--pages 1,10,100,1000] [--limit 100] [--account-id 1]
+
+Uses the database configured in app.core.config and only reads from it.
+Each reported latency is the best of --repeat runs.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from app.core.config import settings
+from app.crud import crud_transaction
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionFilter
+
+
+async def best_of(repeat: int, run):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+async def offset_page(db: AsyncSession, filters: TransactionFilter, skip: int, limit: int):
+    """The OFFSET query get_multi ran before keyset pagination, plus the same ordering."""
+    query = select(Transaction).options(selectinload(Transaction.categories))
+    if filters.account_id is not None:
+        query = query.filter(Transaction.account_id == filters.account_id)
+    result = await db.execute(
+        query.order_by(Transaction.date.desc(), Transaction.id.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default="1,10,100,1000", help="comma-separated page numbers to report")
+    parser.add_argument("--limit", type=int, default=100, help="transactions per page")
+    parser.add_argument("--account-id", type=int, help="only page through one account")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    report_pages = sorted({int(page) for page in args.pages.split(",")})
+
+    engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    filters = TransactionFilter(account_id=args.account_id)
+
+    try:
+        async with session_factory() as db:
+            after = None
+            for page in range(1, report_pages[-1] + 1):
+                if page in report_pages:
+                    keyset_ms = await best_of(args.repeat, lambda: crud_transaction.get_multi(
+                        db, filters=filters, after=after, limit=args.limit
+                    ))
+                    offset_ms = await best_of(args.repeat, lambda: offset_page(
+                        db, filters, (page - 1) * args.limit, args.limit
+                    ))
+                    print(f"page {page:>6}  keyset {keyset_ms:8.2f} ms  offset {offset_ms:9.2f} ms")
+                transactions = await crud_transaction.get_multi(db, filters=filters, after=after, limit=args.limit)
+                if len(transactions) < args.limit:
+                    print(f"Only {page} pages of transactions")
+                    break
+                after = (transactions[-1].date, transactions[-1].id)
+                # Keep the identity map from growing while walking the pages
+                db.expunge_all()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
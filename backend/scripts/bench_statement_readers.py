@@ -0,0 +1,120 @@
+"""
+Benchmark the statement reader engines on large workbooks.
+
+Compares openpyxl's streaming read-only mode with a full in-memory load for
+.xlsx files, xlrd with and without on_demand for .xls files, and the CSV
+engine on the same rows, reporting rows/sec and peak Python memory for each.
+
+Usage:
+    python scripts/bench_statement_readers.py [--rows 100000] [--xls path/to/large.xls]
+
+The .xlsx workbook and .csv export are generated on the fly. Generating .xls requires xlwt,
+which is not a project dependency, so pass an existing file with --xls.
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import openpyxl
+import xlrd
+
+from app.services.statement_readers import CsvReader, OpenpyxlReader, XlrdReader
+
+HEADER = ["Date", "Narration", "Chq./Ref.No.", "Value Dt", "Withdrawal Amt.", "Deposit Amt.", "Closing Balance"]
+
+
+def generate_rows(rows: int):
+    start = date(2020, 1, 1)
+    for i in range(rows):
+        day = (start + timedelta(days=i // 50)).strftime("%d/%m/%y")
+        yield [day, f"UPI-MERCHANT{i % 500}-{i}-PAYMENT", f"{i:016d}", day, float(i % 997), None, 100000.0]
+
+
+def generate_xlsx(path: str, rows: int):
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADER)
+    for row in generate_rows(rows):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def generate_csv(path: str, rows: int):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(generate_rows(rows))
+
+
+def measure(label: str, open_rows):
+    # Time and memory are measured in separate passes since tracing skews timings
+    started = time.perf_counter()
+    count = sum(1 for _ in open_rows())
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    for _ in open_rows():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32} {count:>9} rows  {elapsed:8.2f}s  {count / elapsed:>10,.0f} rows/s  peak {peak / 2**20:8.1f} MiB")
+
+
+def openpyxl_full_rows(path: str):
+    workbook = openpyxl.load_workbook(path, data_only=True)
+    yield from workbook.worksheets[0].iter_rows(values_only=True)
+
+
+def openpyxl_read_only_rows(path: str):
+    with OpenpyxlReader(path) as reader:
+        yield from reader.iter_rows(0)
+
+
+def xlrd_full_rows(path: str):
+    workbook = xlrd.open_workbook(path)
+    sheet = workbook.sheet_by_index(0)
+    for row_idx in range(sheet.nrows):
+        yield sheet.row_values(row_idx)
+
+
+def xlrd_on_demand_rows(path: str):
+    with XlrdReader(path) as reader:
+        yield from reader.iter_rows(0)
+
+
+def csv_rows(path: str):
+    with CsvReader(path) as reader:
+        yield from reader.iter_rows(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="rows in the generated .xlsx")
+    parser.add_argument("--xls", help="existing .xls workbook to benchmark with xlrd")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx_path = os.path.join(tmp, "statement.xlsx")
+        csv_path = os.path.join(tmp, "statement.csv")
+        print(f"Generating {args.rows} row workbook and CSV export...")
+        generate_xlsx(xlsx_path, args.rows)
+        generate_csv(csv_path, args.rows)
+
+        measure("openpyxl (full load)", lambda: openpyxl_full_rows(xlsx_path))
+        measure("openpyxl (read_only, default)", lambda: openpyxl_read_only_rows(xlsx_path))
+        measure("csv", lambda: csv_rows(csv_path))
+
+    if args.xls:
+        measure("xlrd (full load)", lambda: xlrd_full_rows(args.xls))
+        measure("xlrd (on_demand, default)", lambda: xlrd_on_demand_rows(args.xls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Check the daily_category_rollup table against the transactions.
+
+Recomputes every rollup row from the transaction and transaction_category
+tables and prints the rows whose stored totals differ, are missing or have
+no transactions behind them. With --rebuild the rollups are recomputed
+first, which also drops rows left at zero by deletes.
+
+Usage:
+    python scripts/check_rollups.py [--rebuild] [--limit 100]
+
+Uses the database configured in app.core.config. Exits with status 1 when
+mismatches remain.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.db.base  # noqa: F401 - registers every model
+from app.core.config import settings
+from app.crud import crud_rollup
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="recompute every rollup row before checking")
+    parser.add_argument("--limit", type=int, default=100, help="maximum number of mismatches to print")
+    args = parser.parse_args()
+
+    engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with session_factory() as db:
+            if args.rebuild:
+                started = time.perf_counter()
+                rows = await crud_rollup.rebuild(db)
+                print(f"Rebuilt {rows} rollup rows in {time.perf_counter() - started:.1f}s")
+
+            started = time.perf_counter()
+            mismatches = await crud_rollup.find_mismatches(db, limit=args.limit)
+            print(f"Checked rollups in {time.perf_counter() - started:.1f}s")
+    finally:
+        await engine.dispose()
+
+    for m in mismatches:
+        print(
+            f"{m.date} account {m.account_id} category {m.category_id}: "
+            f"withdrawals {m.stored_withdrawal_total} != {m.expected_withdrawal_total}, "
+            f"deposits {m.stored_deposit_total} != {m.expected_deposit_total}, "
+            f"transactions {m.stored_count} != {m.expected_count}"
+        )
+    if mismatches:
+        print(f"{len(mismatches)} mismatched rollup rows" + (" (limit reached)" if len(mismatches) == args.limit else ""))
+        return 1
+    print("Rollups match the transactions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,131 @@
+"""
+Load test: read latency while large statements are imported.
+
+Samples GET /transactions/ latency on its own, then again while several
+large uploads are imported at once, and reports p50/p95/p99 for both
+phases. With statement parsing on the CPU executor, p99 of the reads should
+stay close to the idle baseline.
+
+Usage:
+    python scripts/load_test_uploads.py [--uploads 4] [--rows 50000] [--samples 200]
+
+Requires a running backend (http://localhost:8000 by default). The .xlsx
+statement is generated on the fly; pass --file to upload an existing one
+instead. A scratch account and statement format are created for the run;
+imported transactions are left in place.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+import httpx
+import openpyxl
+
+HEADER = ["Date", "Narration", "Chq./Ref.No.", "Value Dt", "Withdrawal Amt.", "Deposit Amt.", "Closing Balance"]
+
+
+def generate_xlsx(path: str, rows: int):
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADER)
+    start = date(2020, 1, 1)
+    for i in range(rows):
+        day = (start + timedelta(days=i // 50)).strftime("%d/%m/%y")
+        sheet.append([day, f"UPI-MERCHANT{i % 500}-{i}-PAYMENT", f"{i:016d}", day, float(i % 997), None, 100000.0])
+    workbook.save(path)
+
+
+def percentiles(latencies):
+    ordered = sorted(latencies)
+    pick = lambda share: ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+    return pick(0.50), pick(0.95), pick(0.99)
+
+
+async def sample_reads(client: httpx.AsyncClient, base_url: str, samples: int, interval: float, until=None):
+    latencies = []
+    while len(latencies) < samples or (until is not None and not until.done()):
+        started = time.perf_counter()
+        response = await client.get(f"{base_url}/transactions/", params={"limit": 50})
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def import_statement(client: httpx.AsyncClient, base_url: str, path: str, format_id: int, account_id: int):
+    with open(path, "rb") as f:
+        response = await client.post(
+            f"{base_url}/transactions/upload",
+            files={"file": (os.path.basename(path), f)},
+            data={"statement_format_id": format_id, "account_id": account_id},
+        )
+    response.raise_for_status()
+    job = response.json()
+    while job["status"] in ("pending", "running"):
+        await asyncio.sleep(0.5)
+        job = (await client.get(f"{base_url}/imports/{job['id']}")).json()
+    if job["status"] != "completed":
+        raise RuntimeError(f"Import failed: {job['errors']}")
+    return job["rows_inserted"]
+
+
+def report(label: str, latencies):
+    p50, p95, p99 = percentiles(latencies)
+    print(f"{label:<24} {len(latencies):>6} reads  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  "
+          f"p99 {p99:7.1f} ms  max {max(latencies):7.1f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--uploads", type=int, default=4, help="concurrent uploads")
+    parser.add_argument("--rows", type=int, default=50_000, help="rows in the generated statement")
+    parser.add_argument("--samples", type=int, default=200, help="reads in the idle baseline")
+    parser.add_argument("--interval", type=float, default=0.02, help="pause between reads (seconds)")
+    parser.add_argument("--file", help="existing statement to upload instead of a generated one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if not path:
+            path = os.path.join(tmp, "statement.xlsx")
+            print(f"Generating {args.rows} row statement...")
+            generate_xlsx(path, args.rows)
+
+        async with httpx.AsyncClient(timeout=300.0) as client:
+            account = (await client.post(f"{args.base_url}/accounts/", json={
+                "account_name": "Load test",
+                "bank_name": "Load test",
+                "account_type": "debit",
+            })).json()
+            statement_format = (await client.post(f"{args.base_url}/statement-formats/", json={
+                "format_name": "Load test",
+                "data_start_row": 2,
+                "date_column": "A",
+                "narration_column": "B",
+                "withdrawal_column": "E",
+                "deposit_column": "F",
+            })).json()
+
+            report("idle", await sample_reads(client, args.base_url, args.samples, args.interval))
+
+            started = time.perf_counter()
+            uploads = asyncio.gather(*[
+                import_statement(client, args.base_url, path, statement_format["id"], account["id"])
+                for _ in range(args.uploads)
+            ])
+            latencies = await sample_reads(client, args.base_url, args.samples, args.interval, until=uploads)
+            imported = sum(await uploads)
+            elapsed = time.perf_counter() - started
+
+            report(f"{args.uploads} uploads running", latencies)
+            print(f"Imported {imported} rows in {elapsed:.1f}s ({imported / elapsed:,.0f} rows/s)")
+
+            await client.delete(f"{args.base_url}/statement-formats/{statement_format['id']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+Tests for the analytics endpoints.
+
+    pytest tests/test_analytics.py
+
+The endpoints are called against a temporary SQLite database and the tests
+are skipped when aiosqlite is not installed. Granularities other than day
+use date_trunc and are covered by tests/test_query_plans.py on PostgreSQL.
+"""
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from app.schemas.transaction import TransactionCreate
+
+
+async def query_analytics(database_url):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.api.v1.endpoints import analytics
+    from app.crud import crud_transaction
+    from app.db.base import Base
+    from app.models.account import AccountType, BankAccount
+    from app.models.category import Category
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with session_factory() as db:
+            food, travel = Category(name="food"), Category(name="travel")
+            db.add_all([
+                Category(name="others"),
+                food,
+                travel,
+                BankAccount(account_name="Savings", bank_name="HDFC", account_type=AccountType.debit),
+            ])
+            await db.commit()
+
+            for day, amount, category_ids in [
+                (1, "10.00", [food.id]),
+                (1, "30.00", [food.id, travel.id]),
+                (2, "60.00", [travel.id]),
+                (3, "0.00", [food.id]),  # A deposit, not an expense
+                (4, "100.00", None),  # Falls back to 'others'
+            ]:
+                await crud_transaction.create(db, TransactionCreate(
+                    account_id=1,
+                    date=datetime(2024, 4, day, 12),
+                    narration=f"UPI-{day}-{amount}",
+                    withdrawal_amount=Decimal(amount),
+                    deposit_amount=Decimal(0) if Decimal(amount) else Decimal(5),
+                    category_ids=category_ids,
+                ))
+
+            bounds = dict(start_date=datetime(2024, 4, 1, 18), end_date=datetime(2024, 4, 2))
+            return {
+                "by_category": await analytics.get_expenses_by_category(db=db),
+                "over_time": await analytics.get_expenses_over_time(db=db),
+                "dashboard": await analytics.get_dashboard(db=db),
+                "bounded_dashboard": await analytics.get_dashboard(db=db, **bounds),
+                "bounded_over_time": await analytics.get_expenses_over_time(db=db, **bounds),
+            }
+    finally:
+        await engine.dispose()
+
+
+def test_dashboard_matches_the_separate_endpoints(tmp_path):
+    pytest.importorskip("aiosqlite")
+
+    results = asyncio.run(query_analytics(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"))
+
+    by_category = {item.category_name: (item.amount, item.percentage) for item in results["by_category"].items}
+    # A transaction in two categories counts in both, but once over time
+    assert by_category == {"food": (40.0, 17.39), "travel": (90.0, 39.13), "others": (100.0, 43.48)}
+    assert results["by_category"].total_amount == 230.0
+    assert [(point.date, point.amount) for point in results["over_time"]] == [
+        (date(2024, 4, 1), 40.0), (date(2024, 4, 2), 60.0), (date(2024, 4, 4), 100.0)
+    ]
+
+    dashboard = results["dashboard"]
+    assert sorted(dashboard.by_category, key=lambda item: item.category_name) == sorted(
+        results["by_category"].items, key=lambda item: item.category_name
+    )
+    assert dashboard.over_time == results["over_time"]
+
+    # Bounds select whole days
+    assert [point.date for point in results["bounded_dashboard"].over_time] == [date(2024, 4, 1), date(2024, 4, 2)]
+    assert results["bounded_dashboard"].over_time == results["bounded_over_time"]
@@ -0,0 +1,175 @@
+"""
+Tests for the analytics response cache.
+
+    pytest tests/test_analytics_cache.py
+
+The shared store is replaced by an in-memory stand-in, so no redis server
+is needed. The tests of cached endpoints run against a temporary SQLite
+database and are skipped when aiosqlite is not installed.
+"""
+import asyncio
+import inspect
+from datetime import date, datetime
+from typing import List
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import AnalyticsCache, LRUCache, cached
+from app.schemas.analytics import ExpenseOverTime, Granularity
+
+
+class LocalStore:
+    """Stand-in for redis.asyncio.Redis keeping values in a dict."""
+
+    def __init__(self):
+        self.values = {}
+        self.fail = False
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("store down")
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError("store down")
+        self.values[key] = value
+
+
+def counting(result):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return result
+    return compute, calls
+
+
+def test_lru_evicts_least_recently_used_and_expires(monkeypatch):
+    lru = LRUCache(max_entries=2, ttl=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == (True, 1)
+    lru.set("c", 3)
+
+    assert lru.get("b") == (False, None)
+    assert lru.get("a") == (True, 1)
+    assert lru.evictions == 1
+
+    now = cache_module.time.monotonic()
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now + 61)
+    assert lru.get("a") == (False, None)
+
+
+def test_new_data_version_makes_results_stale():
+    async def run():
+        cache = AnalyticsCache(max_entries=10, ttl=60)
+        compute, calls = counting([1, 2])
+        first = await cache.get_or_compute("totals", {"month": 4}, "v1", List[int], compute)
+        again = await cache.get_or_compute("totals", {"month": 4}, "v1", List[int], compute)
+        other = await cache.get_or_compute("totals", {"month": 5}, "v1", List[int], compute)
+        await cache.get_or_compute("totals", {"month": 4}, "v2", List[int], compute)
+        return first, again, other, len(calls), cache.stats()
+
+    first, again, other, computed, stats = asyncio.run(run())
+
+    assert first == again == other == [1, 2]
+    assert computed == 3
+    assert (stats.hits, stats.misses) == (1, 3)
+    assert stats.hit_ratio == 0.25
+
+
+def test_shared_store_spans_workers():
+    async def run():
+        store = LocalStore()
+        worker_a, worker_b = AnalyticsCache(10, 60, store), AnalyticsCache(10, 60, store)
+        point = [ExpenseOverTime(date=date(2024, 4, 1), amount=12.5, days=1)]
+        compute, calls = counting(point)
+
+        computed = await worker_a.get_or_compute("over-time", {}, "v1", List[ExpenseOverTime], compute)
+        shared = await worker_b.get_or_compute("over-time", {}, "v1", List[ExpenseOverTime], compute)
+
+        store.fail = True
+        unavailable = await worker_a.get_or_compute("over-time", {"x": 1}, "v1", List[ExpenseOverTime], compute)
+        return computed, shared, len(calls), worker_b.stats(), worker_a.stats(), unavailable
+
+    computed, shared, computed_count, stats_b, stats_a, unavailable = asyncio.run(run())
+
+    assert shared == computed
+    assert isinstance(shared[0], ExpenseOverTime)
+    assert computed_count == 2
+    assert stats_b.shared_hits == 1
+    assert stats_a.shared_errors == 2  # entry read and entry write
+    assert unavailable == computed
+
+
+async def call_cached_endpoints(database_url, monkeypatch):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.crud import crud_table_version
+    from app.db.base import Base
+    from app.models.category import Category
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    calls = []
+
+    @cached("over-time", List[int], [Category])
+    async def endpoint(db=None, start_date: datetime | None = None, granularity: Granularity = Granularity.day):
+        calls.append((start_date, granularity))
+        return [len(calls)]
+
+    # Two workers without a shared store, each with its own cache
+    workers = [AnalyticsCache(10, 60), AnalyticsCache(10, 60)]
+
+    async def call(worker, **kwargs):
+        monkeypatch.setattr(cache_module, "analytics_cache", workers[worker])
+        async with session_factory() as db:
+            return await endpoint(db=db, **kwargs)
+
+    try:
+        results = [
+            await call(0),
+            await call(0, granularity=Granularity.day),
+            await call(0, start_date=datetime(2024, 4, 1)),
+            await call(0, granularity=Granularity.month),
+            await call(1),
+        ]
+        # A write handled by either worker changes the version both of them read
+        async with session_factory() as db:
+            await crud_table_version.bump(db, Category)
+            await db.commit()
+        results += [await call(0), await call(1)]
+    finally:
+        await engine.dispose()
+    return results, endpoint
+
+
+def test_cached_endpoint_keys_on_arguments_and_table_versions(tmp_path, monkeypatch):
+    pytest.importorskip("aiosqlite")
+
+    results, endpoint = asyncio.run(
+        call_cached_endpoints(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", monkeypatch)
+    )
+
+    assert results == [[1], [1], [2], [3], [4], [5], [6]]
+    assert list(inspect.signature(endpoint).parameters) == ["db", "start_date", "granularity"]
+
+
+def test_disabled_cache_always_computes():
+    async def run():
+        cache = AnalyticsCache(max_entries=0, ttl=60)
+        compute, calls = counting(1)
+        for _ in range(3):
+            await cache.get_or_compute("totals", {}, "v1", int, compute)
+        return len(calls), cache.stats()
+
+    computed, stats = asyncio.run(run())
+
+    assert computed == 3
+    assert stats.hits == stats.misses == 0
@@ -0,0 +1,115 @@
+"""
+Tests that both bulk insert paths of crud_transaction store the same rows.
+
+    POSTGRES_PORT=5432 pytest tests/test_bulk_insert.py
+
+COPY only runs on PostgreSQL, so the tests use a "_bulk_insert" database
+next to the configured one, created if missing, and are skipped when the
+server cannot be reached.
+"""
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.transaction import TransactionCreate
+
+
+def database_url() -> str:
+    return str(settings.SQLALCHEMY_DATABASE_URI).rsplit("/", 1)[0] + f"/{settings.POSTGRES_DB}_bulk_insert"
+
+
+async def create_database(url: str) -> None:
+    import asyncpg
+    from sqlalchemy.engine import make_url
+
+    target = make_url(url)
+    connection = await asyncpg.connect(
+        host=target.host, port=target.port, user=target.username, password=target.password, database="postgres"
+    )
+    try:
+        if not await connection.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", target.database):
+            await connection.execute(f'CREATE DATABASE "{target.database}"')
+    finally:
+        await connection.close()
+
+
+async def insert_both_ways() -> dict:
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.crud import crud_rollup, crud_transaction
+    from app.db.base import Base
+    from app.models.account import AccountType, BankAccount
+    from app.models.category import Category
+    from app.models.transaction import Transaction
+
+    url = database_url()
+    await create_database(url)
+    engine = create_async_engine(url, poolclass=NullPool)
+
+    def rows(account_id, prefix):
+        amounts = [(None, Decimal("5.00")), (Decimal("7.50"), None), (None, None), (Decimal(0), Decimal("1.25"))]
+        batch = crud_transaction._batch_rows([
+            TransactionCreate(
+                account_id=account_id,
+                date=datetime(2024, 4, 1, 9 + i),
+                narration=f"ROW {i}",
+                withdrawal_amount=withdrawal,
+                deposit_amount=deposit,
+                metadata_={"source": "imported"},
+            )
+            for i, (withdrawal, deposit) in enumerate(amounts)
+        ])
+        for i, row in enumerate(batch):
+            row.update(fingerprint=f"{prefix}{i}", merchant_id=None)
+        return batch
+
+    steps = {}
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            others = Category(name="others")
+            copied = BankAccount(account_name="Copied", bank_name="HDFC", account_type=AccountType.debit)
+            inserted = BankAccount(account_name="Inserted", bank_name="HDFC", account_type=AccountType.debit)
+            db.add_all([others, copied, inserted])
+            await db.commit()
+
+        async with AsyncSession(engine) as db:
+            await crud_transaction._create_staging_table(db)
+            steps["copy"] = await crud_transaction._copy_batch(db, rows(copied.id, "copy"), [others.id] * 4)
+            steps["insert"] = await crud_transaction._insert_batch(db, rows(inserted.id, "insert"), [others.id] * 4)
+            await db.commit()
+
+        async with AsyncSession(engine) as db:
+            result = await db.execute(
+                select(Transaction.account_id, Transaction.narration, Transaction.withdrawal_amount,
+                       Transaction.deposit_amount)
+                .order_by(Transaction.narration)
+            )
+            stored = result.all()
+            steps["copied"] = [row[1:] for row in stored if row.account_id == copied.id]
+            steps["inserted"] = [row[1:] for row in stored if row.account_id == inserted.id]
+            steps["mismatches"] = await crud_rollup.find_mismatches(db)
+    finally:
+        await engine.dispose()
+    return steps
+
+
+def test_copy_and_insert_store_the_same_rows():
+    pytest.importorskip("asyncpg")
+    try:
+        steps = asyncio.run(insert_both_ways())
+    except (OSError, ConnectionError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    assert steps["copied"] == steps["inserted"]
+    # Empty amounts are stored as 0 by both
+    assert steps["copied"][2] == ("ROW 2", Decimal("0.00"), Decimal("0.00"))
+    assert steps["copy"] == steps["insert"] == (4, Decimal("7.50"), Decimal("6.25"))
+    assert steps["mismatches"] == []
@@ -0,0 +1,220 @@
+"""
+Tests for category rules.
+
+    pytest tests/test_categorization.py
+
+The import tests run crud_transaction against a temporary SQLite database
+and are skipped when aiosqlite is not installed.
+"""
+import asyncio
+import random
+import re
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.schemas.category_rule import CategoryRuleCreate
+from app.schemas.transaction import TransactionCreate
+from app.services import categorization
+from app.services.categorization import Categorizer, KeywordMatcher, Rule, RuleSet, categorize_all, fold, required_literal
+
+
+def test_keyword_matcher_finds_overlapping_keywords():
+    matcher = KeywordMatcher(["he", "she", "his", "hers", "xyz"])
+
+    assert matcher.find("ushers") == {0, 1, 3}
+    assert matcher.find("this") == {2}
+    assert matcher.find("") == set()
+
+
+@pytest.mark.parametrize("pattern, expected", [
+    (r"\bREF000\d{2}\b", "ref000"),
+    (r"sal(ary)? credit", "credit"),
+    (r"(amazon|amzn)pay", "pay"),
+    (r"neft.*salary", "salary"),
+    (r"swiggy|zomato", None),
+    (r"\d+", None),
+    (r"[", None),
+])
+def test_required_literal(pattern, expected):
+    assert required_literal(pattern) == expected
+
+
+def test_highest_priority_then_oldest_rule_wins():
+    categorizer = Categorizer([
+        Rule(id=1, category_id=10, keyword="swiggy"),
+        Rule(id=2, category_id=20, keyword="SWIGGY"),
+        Rule(id=3, category_id=30, keyword="instamart", priority=1),
+    ])
+
+    assert categorizer.categorize("UPI-SWIGGY-123", Decimal(10)) == 10
+    assert categorizer.categorize("UPI-Swiggy  Instamart", Decimal(10)) == 30
+    assert categorizer.categorize("UPI-ZOMATO", Decimal(10)) is None
+
+
+def test_every_condition_of_a_rule_must_hold():
+    categorizer = Categorizer([
+        Rule(id=1, category_id=10, keyword="amazon", pattern=r"prime\s+video"),
+        Rule(id=2, category_id=20, keyword="amazon", min_amount=Decimal(1000)),
+        Rule(id=3, category_id=30, pattern=r"^ATM\b", max_amount=Decimal(500)),
+        Rule(id=4, category_id=40, min_amount=Decimal(50_000)),
+        Rule(id=5, category_id=50, pattern=r"rent|lease"),
+    ])
+
+    assert categorizer.categorize("AMAZON PRIME  VIDEO", Decimal(199)) == 10
+    assert categorizer.categorize("Amazon Pay", Decimal(199)) is None
+    assert categorizer.categorize("Amazon Pay", Decimal(1500)) == 20
+    assert categorizer.categorize("ATM WDL", Decimal(500)) == 30
+    assert categorizer.categorize("ATM WDL", Decimal(2000)) is None
+    assert categorizer.categorize("BRANCH ATM", Decimal(100)) is None
+    assert categorizer.categorize("NEFT-EMPLOYER", Decimal(60_000)) == 40
+    assert categorizer.categorize("Flat Lease", Decimal(9000)) == 50
+
+
+def test_patterns_match_characters_their_literals_fold_from():
+    # re.IGNORECASE matches the Kelvin sign to "k" and the long s to "s"
+    categorizer = Categorizer([Rule(id=1, category_id=10, pattern="kiosk")])
+
+    assert fold("KIOſK") == "kiosk"
+    assert categorizer.categorize("KIOſK", Decimal(1)) == 10
+
+
+def test_compiled_rules_agree_with_trying_every_rule():
+    rng = random.Random(0)
+    words = ["swiggy", "uber", "ola", "amazon", "prime", "netflix", "rent", "salary", "atm", "fuel"]
+    rules = []
+    for i in range(200):
+        keyword = rng.choice(words + [None])
+        pattern = rng.choice([None, None, rf"{rng.choice(words)}\W+\d", rf"^{rng.choice(words)}", r"\d{4}$"])
+        low = Decimal(rng.randint(0, 500)) if rng.random() < 0.3 else None
+        if keyword is None and pattern is None and low is None:
+            keyword = rng.choice(words)
+        rules.append(Rule(
+            id=i + 1, category_id=rng.randint(1, 10), keyword=keyword, pattern=pattern,
+            min_amount=low, max_amount=None if low is None else low + 300, priority=rng.randint(0, 3),
+        ))
+    categorizer = Categorizer(rules)
+
+    ordered = sorted(rules, key=lambda rule: (-rule.priority, rule.id))
+    for _ in range(2000):
+        narration = " ".join(rng.choice(words + ["UPI", "NEFT", "-", str(rng.randint(1, 99999))]).upper()
+                             for _ in range(rng.randint(1, 6)))
+        amount = Decimal(rng.randint(0, 1000))
+        expected = next((
+            rule.category_id for rule in ordered
+            if (not rule.keyword or fold(rule.keyword) in fold(narration))
+            and (not rule.pattern or re.search(rule.pattern, narration, re.IGNORECASE))
+            and rule.amount_matches(amount)
+        ), None)
+        assert categorizer.categorize(narration, amount) == expected, narration
+
+
+def test_rule_needs_a_condition_and_a_valid_pattern():
+    with pytest.raises(ValueError):
+        CategoryRuleCreate(category_id=1)
+    with pytest.raises(ValueError):
+        CategoryRuleCreate(category_id=1, pattern="(")
+    with pytest.raises(ValueError):
+        CategoryRuleCreate(category_id=1, min_amount=Decimal(10), max_amount=Decimal(5))
+    assert CategoryRuleCreate(category_id=1, max_amount=Decimal(5)).max_amount == Decimal(5)
+
+
+
+def test_rule_sets_compile_once_per_version():
+    rules = (Rule(id=1, category_id=10, keyword="swiggy"), Rule(id=2, category_id=20, min_amount=Decimal(1000)))
+    transactions = [("UPI-SWIGGY-1", Decimal(10), None), ("NEFT RENT", Decimal(1500), Decimal(0)), ("ATM WDL", None, None)]
+
+    assert categorize_all(RuleSet(("v1",), rules), transactions) == [10, 20, None]
+    compiled = categorization.compile_rules(RuleSet(("v1",), rules))
+    assert categorization.compile_rules(RuleSet(("v1",), rules)) is compiled
+    assert categorization.compile_rules(RuleSet(("v2",), rules[:1])) is not compiled
+    assert categorize_all(RuleSet(("v2",), rules[:1]), transactions) == [10, None, None]
+    assert categorize_all(None, transactions) == [None, None, None]
+
+async def import_with_rules(database_url):
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.crud import crud_category, crud_category_rule, crud_rollup, crud_transaction
+    from app.db.base import Base
+    from app.models.account import AccountType, BankAccount
+    from app.models.category import Category, transaction_category
+    from app.models.transaction import Transaction
+    from app.schemas.category_rule import CategoryRuleUpdate
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def categories():
+        async with session_factory() as db:
+            result = await db.execute(
+                select(Transaction.narration, Category.name)
+                .join(transaction_category, transaction_category.c.transaction_id == Transaction.id)
+                .join(Category, Category.id == transaction_category.c.category_id)
+                .order_by(Transaction.id)
+            )
+            return result.all()
+
+    def statement(account_id, *narrations):
+        return [
+            TransactionCreate(
+                account_id=account_id,
+                date=datetime(2024, 4, 1, 9 + i),
+                narration=narration,
+                withdrawal_amount=Decimal("100.00"),
+                deposit_amount=Decimal("0.00"),
+            )
+            for i, narration in enumerate(narrations)
+        ]
+
+    steps = {}
+    try:
+        async with session_factory() as db:
+            others, food, travel = Category(name="others"), Category(name="food"), Category(name="travel")
+            account = BankAccount(account_name="Savings", bank_name="HDFC", account_type=AccountType.debit)
+            db.add_all([others, food, travel, account])
+            await db.commit()
+
+        async with session_factory() as db:
+            await crud_category_rule.create(db, CategoryRuleCreate(category_id=food.id, keyword="swiggy"))
+            uber = await crud_category_rule.create(db, CategoryRuleCreate(category_id=travel.id, pattern=r"\buber\b"))
+
+        async with session_factory() as db:
+            await crud_transaction.create_bulk(db, [statement(account.id, "UPI-SWIGGY-1", "UPI-UBER-2", "ATM WDL")])
+        async with session_factory() as db:
+            await crud_transaction.create(db, statement(account.id, "Uber trip")[0])
+        steps["import"] = await categories()
+
+        # Changed rules apply to the next import, and rows imported before are skipped
+        async with session_factory() as db:
+            await crud_category_rule.update(db, db_obj=await crud_category_rule.get(db, uber.id),
+                                            obj_in=CategoryRuleUpdate(category_id=food.id))
+        async with session_factory() as db:
+            await crud_transaction.create_bulk(db, [statement(account.id, "UPI-SWIGGY-1", "UPI-UBER-2", "ATM WDL", "UBER EATS")])
+        steps["reimport"] = await categories()
+
+        async with session_factory() as db:
+            await crud_category.remove(db, id=food.id)
+        async with session_factory() as db:
+            steps["rules"] = len(await crud_category_rule.get_multi(db))
+            steps["mismatches"] = await crud_rollup.find_mismatches(db)
+    finally:
+        await engine.dispose()
+    return steps
+
+
+def test_imports_follow_the_rules(tmp_path):
+    pytest.importorskip("aiosqlite")
+
+    steps = asyncio.run(import_with_rules(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"))
+
+    first = [("UPI-SWIGGY-1", "food"), ("UPI-UBER-2", "travel"), ("ATM WDL", "others"), ("Uber trip", "travel")]
+    assert steps["import"] == first
+    assert steps["reimport"] == [*first, ("UBER EATS", "food")]
+    # Deleting a category deletes its rules
+    assert steps["rules"] == 0
+    assert steps["mismatches"] == []
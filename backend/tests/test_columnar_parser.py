@@ -0,0 +1,152 @@
+"""
+Differential tests: the columnar engine must agree with the row engine.
+
+    pytest tests/test_columnar_parser.py
+"""
+import csv
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import openpyxl
+import pytest
+
+from app.services.columnar_parser import amounts_to_cents, iter_transaction_columns
+from app.services.statement_parser import extract_transactions, parse_amount
+
+CENT = Decimal("0.01")
+
+
+def make_format():
+    return SimpleNamespace(
+        id=None,
+        updated_at=None,
+        date_format=None,
+        data_start_row=3,
+        date_column="A",
+        narration_column="B",
+        withdrawal_column="E",
+        deposit_column="F",
+    )
+
+
+def random_amount(rng):
+    choice = rng.random()
+    if choice < 0.3:
+        return None
+    if choice < 0.5:
+        return round(rng.uniform(0, 100000), 2)
+    if choice < 0.6:
+        return rng.randint(1, 5000)
+    if choice < 0.7:
+        return f"{rng.uniform(0, 100000):,.2f}"
+    if choice < 0.75:
+        return "n/a"
+    return round(rng.uniform(0, 500), 1)
+
+
+def random_rows(count, seed=7):
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1)
+    rows = []
+    for i in range(count):
+        day = start + timedelta(days=i // 7)
+        kind = rng.random()
+        if kind < 0.03:
+            rows.append(["*" * 8] * 7)
+        elif kind < 0.05:
+            rows.append(["Closing Balance", "Closing Balance", None, None, None, None, 1.0])
+        elif kind < 0.07:
+            # Short row without amount columns
+            rows.append([day.strftime("%d/%m/%y"), f"SHORT ROW {i}"])
+        elif kind < 0.09:
+            rows.append([None, f"CONTINUATION {i}", None, None, 10.0, None, None])
+        else:
+            date = day if kind < 0.3 else day.strftime("%d/%m/%y")
+            rows.append([date, f"UPI-PAYEE{rng.randint(1, 50)}-{i} ", str(i), None,
+                         random_amount(rng), random_amount(rng), 0.0])
+    return rows
+
+
+def write_xlsx(path, rows):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Date", "Narration", "Ref", "Value Dt", "Withdrawal", "Deposit", "Balance"])
+    sheet.append(["-" * 8] * 7)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Date", "Narration", "Ref", "Value Dt", "Withdrawal", "Deposit", "Balance"])
+        writer.writerow(["-" * 8] * 7)
+        for row in rows:
+            writer.writerow([
+                value.strftime("%d/%m/%y") if isinstance(value, datetime)
+                else "" if value is None else value
+                for value in row
+            ])
+    return str(path)
+
+
+def stored(transaction):
+    """A transaction as the database stores it, amounts at two decimal places."""
+    return (
+        transaction.date,
+        transaction.narration,
+        transaction.withdrawal_amount.quantize(CENT),
+        transaction.deposit_amount.quantize(CENT),
+        transaction.metadata_,
+    )
+
+
+@pytest.mark.parametrize("writer", [write_xlsx, write_csv])
+@pytest.mark.parametrize("batch_size", [1, 64, 1000])
+def test_columnar_matches_row_engine(tmp_path, writer, batch_size):
+    path = writer(tmp_path / ("statement.xlsx" if writer is write_xlsx else "statement.csv"), random_rows(600))
+
+    expected = [stored(t) for t in extract_transactions(path, make_format(), account_id=3)]
+    actual = [
+        stored(t)
+        for batch in iter_transaction_columns(path, make_format(), account_id=3, batch_size=batch_size)
+        for t in batch.to_transactions()
+    ]
+
+    assert len(expected) > 400
+    assert actual == expected
+
+
+def test_engines_learn_dates_from_the_same_rows(tmp_path):
+    # Only the later rows show the dates are month first
+    rows = [[f"{1 + i % 12:02d}/{1 + i // 12:02d}/2024", f"UPI-PAYEE-{i}", None, None, 10.0, None, None]
+            for i in range(36)]
+    rows += [[f"03/{day}/2024", f"NEFT-{day}", None, None, None, 20.0, None] for day in range(13, 29)]
+    path = write_csv(tmp_path / "statement.csv", rows)
+
+    expected = [stored(t) for t in extract_transactions(path, make_format(), account_id=3)]
+    actual = [
+        stored(t)
+        for batch in iter_transaction_columns(path, make_format(), account_id=3, batch_size=8)
+        for t in batch.to_transactions()
+    ]
+
+    assert expected[1][0] == datetime(2024, 2, 1)
+    assert actual == expected
+
+
+def test_amounts_to_cents():
+    assert amounts_to_cents([None, "", 0, 12, 0.29, 250.5, "1,234.56", " 7 ", "abc", 1.005, "-2.345"]) == [
+        0, 0, 0, 1200, 29, 25050, 123456, 700, 0, 101, -235,
+    ]
+
+
+def test_non_finite_amounts_are_invalid():
+    cells = ["NaN", "-Infinity", "inf", "sNaN", float("nan"), float("inf")]
+
+    assert amounts_to_cents(cells) == [0] * len(cells)
+    assert [parse_amount(cell) for cell in cells] == [Decimal("0.00")] * len(cells)
@@ -0,0 +1,115 @@
+"""
+Tests for ETags and conditional GET.
+
+    pytest tests/test_conditional_get.py
+
+The database tests run against a temporary SQLite database and are skipped
+when aiosqlite is not installed.
+"""
+import asyncio
+
+import pytest
+
+from app.api.v1.conditional import matches
+
+
+def test_matches_compares_weakly():
+    assert matches('W/"abc"', 'W/"abc"')
+    assert matches('"abc"', 'W/"abc"')
+    assert matches('"x", W/"abc"', 'W/"abc"')
+    assert matches("*", 'W/"abc"')
+    assert not matches('W/"abd"', 'W/"abc"')
+    assert not matches('"x", "y"', 'W/"abc"')
+
+
+async def count_changes(database_url):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.crud import crud_category, crud_table_version
+    from app.db.base import Base
+    from app.models.category import Category
+    from app.models.transaction import Transaction
+    from app.schemas.category import CategoryCreate
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def versions():
+        async with session_factory() as db:
+            found = await crud_table_version.get_versions(db, [Category, Transaction])
+            return {table: version for table, (version, _) in found.items()}
+
+    steps = {}
+    try:
+        steps["empty"] = await versions()
+        async with session_factory() as db:
+            await crud_category.create(db, CategoryCreate(name="food"))
+        steps["create"] = await versions()
+        async with session_factory() as db:
+            category = (await crud_category.get_multi(db))[0]
+            await crud_category.remove(db, id=category.id)
+        steps["remove"] = await versions()
+    finally:
+        await engine.dispose()
+    return steps
+
+
+def test_writes_bump_table_versions(tmp_path):
+    pytest.importorskip("aiosqlite")
+
+    steps = asyncio.run(count_changes(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"))
+
+    assert steps["empty"] == {"category": 0, "transaction": 0}
+    assert steps["create"] == {"category": 1, "transaction": 0}
+    # Removing a category also unlinks its transactions
+    assert steps["remove"] == {"category": 2, "transaction": 1}
+
+
+def test_list_endpoint_answers_not_modified_until_a_write(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.api.v1.endpoints import categories
+    from app.db.base import Base
+    from app.db.session import get_db
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    async def create_tables():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    asyncio.run(create_tables())
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    # Only the categories router, so the app's startup does not need PostgreSQL
+    app = FastAPI()
+    app.include_router(categories.router, prefix="/categories")
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with TestClient(app) as client:
+            first = client.get("/categories/")
+            etag = first.headers["ETag"]
+            unchanged = client.get("/categories/", headers={"If-None-Match": etag})
+            client.post("/categories/", json={"name": "food"})
+            changed = client.get("/categories/", headers={"If-None-Match": etag})
+    finally:
+        asyncio.run(engine.dispose())
+
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert unchanged.status_code == 304
+    assert unchanged.headers["ETag"] == etag
+    assert unchanged.content == b""
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert [category["name"] for category in changed.json()] == ["food"]
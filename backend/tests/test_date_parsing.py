@@ -0,0 +1,47 @@
+"""
+Tests for statement date parsing.
+
+    pytest tests/test_date_parsing.py
+"""
+from datetime import datetime
+
+import pytest
+
+from app.services.date_parsing import DateParser, compile_date_format, infer_date_format
+
+
+@pytest.mark.parametrize("date_format,value,expected", [
+    ("%d/%m/%y", "05/04/24", datetime(2024, 4, 5)),
+    ("%d/%m/%y", "05/04/75", datetime(1975, 4, 5)),
+    ("%d-%m-%Y %H:%M:%S", "05-04-2024 13:45:10", datetime(2024, 4, 5, 13, 45, 10)),
+    ("%d-%b-%Y", "05-Apr-2024", datetime(2024, 4, 5)),
+])
+def test_compiled_formats_match_strptime(date_format, value, expected):
+    assert compile_date_format(date_format)(value) == expected == datetime.strptime(value, date_format)
+
+
+def test_compiled_format_rejects_invalid_dates():
+    with pytest.raises(ValueError):
+        compile_date_format("%d/%m/%y")("31/02/24")
+
+
+def test_infers_day_first_format():
+    samples = ["01/02/24", "13/02/24", "14/02/24", "28/02/24", "Opening Balance"]
+
+    assert infer_date_format(samples) == "%d/%m/%y"
+    assert infer_date_format(["2024-02-01", "2024-02-13"]) == "%Y-%m-%d"
+    assert infer_date_format(["not a date", "nor this"]) is None
+
+
+def test_falls_back_to_dateutil_on_misses():
+    parser = DateParser("%d/%m/%y")
+
+    assert parser("05/04/24") == datetime(2024, 4, 5)
+    assert parser("5 April 2024") == datetime(2024, 4, 5)
+    assert parser("********") is None
+    assert (parser.fast_hits, parser.fallbacks) == (1, 2)
+
+    # Repeated values are memoised and never re-parsed
+    parser("05/04/24")
+    parser("********")
+    assert (parser.fast_hits, parser.fallbacks) == (1, 2)
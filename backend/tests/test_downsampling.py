@@ -0,0 +1,51 @@
+"""
+Tests for LTTB downsampling and automatic time bucketing.
+
+    pytest tests/test_downsampling.py
+"""
+import math
+from datetime import date
+
+import pytest
+
+from app.api.v1.endpoints.analytics import auto_granularity
+from app.schemas.analytics import Granularity
+from app.services.downsampling import lttb
+
+
+def test_short_series_is_kept():
+    points = [(x, x * x) for x in range(10)]
+
+    assert lttb(points, 10) == list(range(10))
+    assert lttb([], 5) == []
+
+
+def test_threshold_must_leave_room_for_a_bucket():
+    with pytest.raises(ValueError):
+        lttb([(0, 0), (1, 1), (2, 2), (3, 3)], 2)
+
+
+def test_keeps_endpoints_and_spikes():
+    # A flat series with one spike per 100 points
+    points = [(x, 100.0 if x % 100 == 50 else math.sin(x / 10)) for x in range(1000)]
+
+    kept = lttb(points, 50)
+
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert kept == sorted(set(kept))
+    assert {x for x in range(1000) if x % 100 == 50} <= set(kept)
+
+
+@pytest.mark.parametrize("first, last, expected", [
+    (date(2024, 3, 1), date(2024, 3, 1), Granularity.day),
+    # 120 days, exactly AUTO_BUCKETS
+    (date(2024, 1, 1), date(2024, 4, 29), Granularity.day),
+    (date(2024, 1, 1), date(2024, 4, 30), Granularity.week),
+    (date(2024, 1, 1), date(2024, 12, 31), Granularity.week),
+    (date(2020, 1, 1), date(2024, 12, 31), Granularity.month),
+    (date(2000, 1, 1), date(2024, 12, 31), Granularity.quarter),
+    (date(1900, 1, 1), date(2024, 12, 31), Granularity.year),
+])
+def test_auto_granularity(first, last, expected):
+    assert auto_granularity(first, last) == expected
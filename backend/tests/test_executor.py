@@ -0,0 +1,36 @@
+"""
+Tests for the CPU-bound executor.
+
+    pytest tests/test_executor.py
+"""
+import asyncio
+import os
+
+import pytest
+
+from app.core import executor
+
+
+def worker_pid(offset):
+    return os.getpid() + offset
+
+
+@pytest.mark.parametrize("kind,in_process", [("thread", True), ("process", False)])
+def test_run_cpu_bound(monkeypatch, kind, in_process):
+    monkeypatch.setattr(executor.settings, "CPU_EXECUTOR_KIND", kind)
+    monkeypatch.setattr(executor.settings, "CPU_EXECUTOR_WORKERS", 1)
+    # Other tests may have started the shared executor with the default settings
+    executor.shutdown_executor()
+
+    async def run():
+        try:
+            return await executor.run_cpu_bound(worker_pid, offset=0)
+        finally:
+            executor.shutdown_executor()
+
+    assert (asyncio.run(run()) == os.getpid()) == in_process
+
+
+def test_rejects_unknown_kind():
+    with pytest.raises(ValueError, match="Unknown executor kind"):
+        executor.create_executor("fiber", 1)
@@ -0,0 +1,181 @@
+"""
+Tests for recognising repeated uploads by their content hash.
+
+    pytest tests/test_import_file.py
+
+The import_file tests run against a temporary SQLite database and are
+skipped when aiosqlite is not installed.
+"""
+import asyncio
+import hashlib
+import io
+import os
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import UploadFile
+
+from app.api.v1.endpoints.transactions import save_upload
+from app.schemas.transaction import TransactionImportSummary
+from app.services.import_jobs import ImportJobRegistry
+
+
+def test_save_upload_hashes_in_chunks(monkeypatch):
+    monkeypatch.setattr("app.api.v1.endpoints.transactions.UPLOAD_CHUNK_SIZE", 1000)
+    content = os.urandom(4500)
+
+    upload = asyncio.run(save_upload(UploadFile(io.BytesIO(content), filename="statement.xls"), 10_000))
+    try:
+        assert upload.sha256 == hashlib.sha256(content).hexdigest()
+        assert upload.size == len(content)
+        with open(upload.path, "rb") as f:
+            assert f.read() == content
+    finally:
+        os.unlink(upload.path)
+
+
+async def record_and_lookup(database_url):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.crud import crud_import_file
+    from app.db.base import Base
+    from app.models.account import AccountType, BankAccount
+    from app.models.statement_format import StatementFormat
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with session_factory() as db:
+            account = BankAccount(account_name="Savings", bank_name="HDFC", account_type=AccountType.debit)
+            statement_format = StatementFormat(
+                format_name="HDFC",
+                data_start_row=2,
+                date_column="A",
+                narration_column="B",
+                withdrawal_column="C",
+                deposit_column="D",
+                updated_at=datetime(2024, 1, 1),
+            )
+            db.add_all([account, statement_format])
+            await db.commit()
+
+            lookup = dict(sha256="ab" * 32, account_id=account.id, statement_format=statement_format)
+            missing = await crud_import_file.get_current(db, **lookup)
+            for count in (3, 5):
+                await crud_import_file.record(
+                    db,
+                    sha256="ab" * 32,
+                    filename="statement.xls",
+                    size=1024,
+                    account_id=account.id,
+                    statement_format_id=statement_format.id,
+                    summary=TransactionImportSummary(count=count, skipped=1, total_withdrawals=Decimal("12.50")),
+                )
+            recorded = await crud_import_file.get_current(db, **lookup)
+
+            # Changing the format afterwards invalidates the record
+            statement_format.updated_at = datetime.utcnow() + timedelta(days=1)
+            stale = await crud_import_file.get_current(db, **lookup)
+    finally:
+        await engine.dispose()
+    return missing, recorded, stale
+
+
+def test_recorded_import_is_found_until_format_changes(tmp_path):
+    pytest.importorskip("aiosqlite")
+
+    missing, recorded, stale = asyncio.run(record_and_lookup(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"))
+
+    assert missing is None
+    assert recorded.summary["count"] == 5
+    assert stale is None
+
+    job = ImportJobRegistry().create("statement.xls", account_id=1, statement_format_id=1)
+    job.complete_from(recorded)
+    assert job.status == "completed"
+    assert job.duplicate_of == recorded.id
+    assert (job.rows_parsed, job.rows_inserted, job.rows_skipped) == (6, 5, 1)
+    assert job.total_withdrawals == Decimal("12.50")
+
+
+async def delete_after_import(database_url):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.crud import crud_import_file, crud_transaction
+    from app.db.base import Base
+    from app.models.account import AccountType, BankAccount
+    from app.models.category import Category
+    from app.models.statement_format import StatementFormat
+    from app.schemas.transaction import TransactionCreate
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    def transaction(account_id, narration):
+        return TransactionCreate(
+            account_id=account_id,
+            date=datetime(2024, 4, 1, 9),
+            narration=narration,
+            withdrawal_amount=Decimal("10.00"),
+            deposit_amount=Decimal("0.00"),
+        )
+
+    steps = {}
+    try:
+        async with session_factory() as db:
+            savings = BankAccount(account_name="Savings", bank_name="HDFC", account_type=AccountType.debit)
+            card = BankAccount(account_name="Card", bank_name="HDFC", account_type=AccountType.credit)
+            statement_format = StatementFormat(
+                format_name="HDFC", data_start_row=2, date_column="A", narration_column="B",
+                withdrawal_column="C", deposit_column="D", updated_at=datetime(2024, 1, 1),
+            )
+            db.add_all([Category(name="others"), savings, card, statement_format])
+            await db.commit()
+
+        async def imported(account, sha256):
+            async with session_factory() as db:
+                await crud_transaction.create_bulk(db, [[transaction(account.id, f"{sha256} {n}") for n in range(2)]])
+                await crud_import_file.record(
+                    db, sha256=sha256, filename="statement.xls", size=1, account_id=account.id,
+                    statement_format_id=statement_format.id, summary=TransactionImportSummary(count=2),
+                )
+
+        async def recorded():
+            async with session_factory() as db:
+                return [
+                    await crud_import_file.get_current(
+                        db, sha256=sha256, account_id=account.id, statement_format=statement_format
+                    ) is not None
+                    for account, sha256 in ((savings, "a" * 64), (card, "b" * 64))
+                ]
+
+        await imported(savings, "a" * 64)
+        await imported(card, "b" * 64)
+        steps["imported"] = await recorded()
+        async with session_factory() as db:
+            await crud_transaction.remove(db, id=1)
+        steps["removed"] = await recorded()
+        async with session_factory() as db:
+            await crud_transaction.remove_many(db, ids=[3, 99])
+        steps["removed_many"] = await recorded()
+    finally:
+        await engine.dispose()
+    return steps
+
+
+def test_deleting_transactions_forgets_imports_into_their_account(tmp_path):
+    pytest.importorskip("aiosqlite")
+
+    steps = asyncio.run(delete_after_import(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"))
+
+    assert steps["imported"] == [True, True]
+    assert steps["removed"] == [False, True]
+    assert steps["removed_many"] == [False, False]
@@ -0,0 +1,77 @@
+"""
+Tests for background import jobs that do not need a server or database.
+
+    pytest tests/test_import_jobs.py
+"""
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import openpyxl
+import pytest
+
+from app.services.import_jobs import ImportJobRegistry, iter_spooled_batches, parse_to_spool
+from app.services.statement_parser import iter_transaction_batches
+
+
+def make_format():
+    return SimpleNamespace(
+        id=None,
+        updated_at=None,
+        date_format=None,
+        data_start_row=2,
+        date_column="A",
+        narration_column="B",
+        withdrawal_column="C",
+        deposit_column="D",
+    )
+
+
+def write_statement(path, count):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Date", "Narration", "Withdrawal", "Deposit"])
+    for i in range(count):
+        sheet.append([datetime(2024, 4, 1 + i % 28), f"UPI-PAYEE{i}", float(i), None])
+    workbook.save(path)
+    return str(path)
+
+
+async def read_spool(path, spool_path, engine):
+    loop = asyncio.get_running_loop()
+    # A thread stands in for the worker process; the spool protocol is the same
+    parsing = loop.run_in_executor(None, parse_to_spool, path, make_format(), 1, 10, engine, spool_path)
+    return [batch async for batch in iter_spooled_batches(spool_path, parsing)], await parsing
+
+
+@pytest.mark.parametrize("engine", ["row", "columnar"])
+def test_spooled_batches_match_parser(tmp_path, engine):
+    path = write_statement(tmp_path / "statement.xlsx", 25)
+    spool_path = str(tmp_path / "statement.spool")
+    open(spool_path, "wb").close()
+
+    batches, parsed = asyncio.run(read_spool(path, spool_path, engine))
+
+    assert parsed == 25
+    assert batches == list(iter_transaction_batches(path, make_format(), 1, 10, engine))
+
+
+def test_parser_errors_reach_the_reader(tmp_path):
+    path = tmp_path / "statement.xls"
+    path.write_bytes(b"\x00\x01not a workbook")
+    spool_path = str(tmp_path / "statement.spool")
+    open(spool_path, "wb").close()
+
+    with pytest.raises(Exception, match="Unsupported statement file format"):
+        asyncio.run(read_spool(str(path), spool_path, "row"))
+
+
+def test_registry_keeps_running_jobs():
+    registry = ImportJobRegistry(max_finished=2)
+    running = registry.create("running.xls", account_id=1, statement_format_id=1)
+    running.status = "running"
+    for i in range(4):
+        registry.create(f"done{i}.xls", account_id=1, statement_format_id=1).status = "completed"
+    registry.create("latest.xls", account_id=1, statement_format_id=1)
+
+    assert [job.filename for job in registry.list()] == ["latest.xls", "done3.xls", "done2.xls", "running.xls"]
@@ -0,0 +1,178 @@
+"""
+Tests for merchant extraction and the top-merchants analytics.
+
+    pytest tests/test_merchant_extraction.py
+
+The storage tests run crud_transaction, crud_merchant and the analytics
+endpoint against a temporary SQLite database and are skipped when aiosqlite
+is not installed.
+"""
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.schemas.statement_format import StatementFormatCreate, StatementFormatUpdate
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services.merchant_extraction import get_extractor, merchant_key
+
+
+@pytest.mark.parametrize("narration, expected", [
+    ("UPI-SWIGGY-swiggy@icici-ICIC0DC0099-412345678901-Payment", ("swiggy", "SWIGGY")),
+    ("POS 416021XXXXXX1234 AMAZON PAY INDIA PVT POS DEBIT", ("amazon pay india", "AMAZON PAY INDIA PVT")),
+    ("NEFT DR-SBIN0001234-ACME TRADERS-NETBANK, MUM-N123456789", ("acme traders", "ACME TRADERS")),
+    ("IMPS-412345678901-John  Doe-SBIN-XXXXXXX1234-rent", ("john doe", "John Doe")),
+    ("ME DC SI 416021XXXXXX1234 NETFLIX", ("netflix", "NETFLIX")),
+    ("ACH D- TP ACH ICICIPRULIFE-1234567", ("iciciprulife", "ICICIPRULIFE")),
+    ("TO TRANSFER-UPI/DR/412345678901/Swiggy Ltd/YESB/swiggy@yes/Pay", ("swiggy", "Swiggy Ltd")),
+    ("ATW-416021XXXXXX1234-S1ANMU12-MUMBAI", None),
+    ("UPI-412345678901-10.00", None),
+    ("Grocery Store", None),
+])
+def test_hdfc_narrations(narration, expected):
+    assert get_extractor("HDFC Bank").extract(narration) == expected
+
+
+def test_bank_and_format_patterns():
+    # Layouts only HDFC uses are not tried for other banks
+    assert get_extractor("State Bank of India").extract("ME DC SI 416021XXXXXX1234 NETFLIX") is None
+    assert get_extractor().extract("UPI/P2M/412345678901/Zomato Pvt Ltd/HDFC") == ("zomato", "Zomato Pvt Ltd")
+    # A format's own pattern comes first
+    extractor = get_extractor("HDFC Bank", r"BIL/ONL/\d+/(?P<merchant>[^/]+)")
+    assert extractor.extract("BIL/ONL/000123/AIRTEL PAYMENTS/Bill") == ("airtel payments", "AIRTEL PAYMENTS")
+    assert extractor.extract("UPI-SWIGGY-swiggy@icici-1") == ("swiggy", "SWIGGY")
+
+
+def test_merchant_key():
+    assert merchant_key("Swiggy Pvt. Ltd.") == "swiggy"
+    assert merchant_key("SWIGGY 4821") == "swiggy"
+    assert merchant_key("416021XXXXXX1234") is None
+    assert merchant_key("AMAZON.IN") == "amazon in"
+
+
+def test_format_merchant_pattern_needs_a_merchant_group():
+    fields = dict(
+        format_name="HDFC", data_start_row=2, date_column="A",
+        narration_column="B", withdrawal_column="C", deposit_column="D",
+    )
+    with pytest.raises(ValueError):
+        StatementFormatCreate(**fields, merchant_pattern="BIL/(.+)")
+    with pytest.raises(ValueError):
+        StatementFormatUpdate(merchant_pattern="(?P<merchant>")
+    assert StatementFormatCreate(**fields, merchant_pattern="BIL/(?P<merchant>.+)").merchant_pattern
+
+
+async def store_merchants(database_url):
+    from sqlalchemy import select, update
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.api.v1.endpoints import analytics
+    from app.crud import crud_merchant, crud_transaction
+    from app.db.base import Base
+    from app.models.account import AccountType, BankAccount
+    from app.models.category import Category
+    from app.models.merchant import Merchant
+    from app.models.transaction import Transaction
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def merchants():
+        async with session_factory() as db:
+            result = await db.execute(
+                select(Transaction.narration, Merchant.key)
+                .outerjoin(Merchant, Merchant.id == Transaction.merchant_id)
+                .order_by(Transaction.id)
+            )
+            return result.all()
+
+    def transaction(account_id, day, narration, amount="100.00"):
+        return TransactionCreate(
+            account_id=account_id,
+            date=datetime(2024, 4, day, 9),
+            narration=narration,
+            withdrawal_amount=Decimal(amount),
+            deposit_amount=Decimal("0.00"),
+        )
+
+    steps = {}
+    try:
+        async with session_factory() as db:
+            hdfc = BankAccount(account_name="Savings", bank_name="HDFC Bank", account_type=AccountType.debit)
+            other = BankAccount(account_name="Card", bank_name="Other Bank", account_type=AccountType.credit)
+            db.add_all([Category(name="others"), hdfc, other])
+            await db.commit()
+
+        # Two batches of one import share the merchants they find
+        async with session_factory() as db:
+            await crud_transaction.create_bulk(db, [
+                [transaction(hdfc.id, 1, "UPI-SWIGGY-swiggy@icici-1"), transaction(hdfc.id, 1, "ME DC SI 4160XX1234 NETFLIX")],
+                [transaction(hdfc.id, 2, "UPI-Swiggy Pvt Ltd-swiggy@icici-2", "50.00"), transaction(hdfc.id, 2, "ATM WDL")],
+            ], merchant_extractor=get_extractor(hdfc.bank_name))
+        # Created one by one, with the patterns of the account's bank
+        async with session_factory() as db:
+            await crud_transaction.create(db, transaction(hdfc.id, 3, "ME DC SI 4160XX1234 NETFLIX", "500.00"))
+            await crud_transaction.create(db, transaction(other.id, 3, "ME DC SI 4160XX1234 NETFLIX"))
+            card = await crud_transaction.create(db, transaction(other.id, 4, "POS 4160XX1234 UBER POS DEBIT", "20.00"))
+            await crud_transaction.update(db, db_obj=card, obj_in=TransactionUpdate(narration="POS 4160XX1234 OLA"))
+            await crud_transaction.update_many(db, ids=[1], obj_in=TransactionUpdate(narration="UPI-ZOMATO-zomato@hdfc-1"))
+        steps["stored"] = await merchants()
+
+        # Transactions stored before merchants were extracted
+        async with session_factory() as db:
+            await db.execute(update(Transaction).values(merchant_id=None))
+            await db.commit()
+        async with session_factory() as db:
+            batches = []
+            after = 0
+            while after is not None:
+                after, scanned, assigned = await crud_merchant.assign_batch(db, after=after, batch_size=4)
+                batches.append((scanned, assigned))
+            steps["batches"] = batches
+        steps["backfilled"] = await merchants()
+
+        async with session_factory() as db:
+            steps["merchant_count"] = len((await db.execute(select(Merchant))).all())
+            steps["top"] = await analytics.get_top_merchants(db=db, limit=2)
+            steps["bounded_top"] = await analytics.get_top_merchants(
+                db=db, start_date=datetime(2024, 4, 2, 18), end_date=datetime(2024, 4, 3)
+            )
+    finally:
+        await engine.dispose()
+    return steps
+
+
+def test_merchants_are_stored_with_transactions(tmp_path):
+    pytest.importorskip("aiosqlite")
+
+    steps = asyncio.run(store_merchants(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"))
+
+    expected = [
+        ("UPI-ZOMATO-zomato@hdfc-1", "zomato"),
+        ("ME DC SI 4160XX1234 NETFLIX", "netflix"),
+        ("UPI-Swiggy Pvt Ltd-swiggy@icici-2", "swiggy"),
+        ("ATM WDL", None),
+        ("ME DC SI 4160XX1234 NETFLIX", "netflix"),
+        # Standing instructions are an HDFC layout
+        ("ME DC SI 4160XX1234 NETFLIX", None),
+        ("POS 4160XX1234 OLA", "ola"),
+    ]
+    assert steps["stored"] == expected
+    assert steps["batches"] == [(4, 3), (3, 2), (0, 0)]
+    assert steps["backfilled"] == expected
+    # The swiggy and uber merchants stay, unused
+    assert steps["merchant_count"] == 5
+
+    assert [(item.merchant_name, item.amount, item.count) for item in steps["top"]] == [
+        ("NETFLIX", 600.0, 2),
+        ("ZOMATO", 100.0, 1),
+    ]
+    # Whole days, as for the rollups
+    assert [(item.merchant_name, item.amount) for item in steps["bounded_top"]] == [
+        ("NETFLIX", 500.0),
+        ("SWIGGY", 50.0),
+    ]
@@ -0,0 +1,319 @@
+"""
+Query plan regression tests.
+
+Runs every query issued by the analytics endpoints, crud_transaction and
+recategorization jobs against a seeded PostgreSQL database, EXPLAINs each statement and fails if
+the plan reads the transaction, transaction_category or
+daily_category_rollup table with a sequential scan.
+
+    POSTGRES_PORT=5432 pytest tests/test_query_plans.py
+
+The database is QUERY_PLAN_DATABASE_URL, or the configured database name
+with a "_query_plans" suffix on the configured server. It is created if
+missing and its tables are rebuilt on every run. The tests are skipped when
+the server cannot be reached.
+
+On a seed this small the planner rightly prefers sequential scans for
+unselective queries, so plans are taken with enable_seqscan off: a
+sequential scan that still shows up means no index can serve the query.
+"""
+import asyncio
+import os
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.core.config import settings
+
+# Tables large enough that a sequential scan is a regression
+LARGE_TABLES = {"transaction", "transaction_category", "daily_category_rollup"}
+SEED_TRANSACTIONS = 20_000
+SEED_ACCOUNTS = 3
+SEED_CATEGORIES = ["others", "food", "travel", "bills", "shopping"]
+SEED_MERCHANTS = ["SWIGGY", "UBER", "AMAZON", "AIRTEL"]
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+START = datetime(2024, 1, 1)
+RANGE = {"start_date": datetime(2024, 3, 1), "end_date": datetime(2024, 3, 31)}
+
+
+def database_url() -> str:
+    default = str(settings.SQLALCHEMY_DATABASE_URI).rsplit("/", 1)[0] + f"/{settings.POSTGRES_DB}_query_plans"
+    return os.environ.get("QUERY_PLAN_DATABASE_URL", default)
+
+
+async def analytics_expenses_by_category(db, ids):
+    from app.api.v1.endpoints import analytics
+    await analytics.get_expenses_by_category(db=db)
+    await analytics.get_expenses_by_category(db=db, **RANGE)
+
+
+async def analytics_expenses_over_time(db, ids):
+    from app.api.v1.endpoints import analytics
+    from app.schemas.analytics import Granularity
+    await analytics.get_expenses_over_time(db=db)
+    await analytics.get_expenses_over_time(db=db, **RANGE)
+    await analytics.get_expenses_over_time(db=db, granularity=Granularity.auto)
+    await analytics.get_expenses_over_time(db=db, granularity=Granularity.month, max_points=3, **RANGE)
+
+
+async def analytics_dashboard(db, ids):
+    from app.api.v1.endpoints import analytics
+    from app.schemas.analytics import Granularity
+    await analytics.get_dashboard(db=db)
+    await analytics.get_dashboard(db=db, granularity=Granularity.week, **RANGE)
+
+
+async def analytics_top_merchants(db, ids):
+    from app.api.v1.endpoints import analytics
+    await analytics.get_top_merchants(db=db)
+    await analytics.get_top_merchants(db=db, limit=3, **RANGE)
+
+
+async def crud_get(db, ids):
+    from app.crud import crud_transaction
+    await crud_transaction.get(db, ids["transaction"])
+
+
+async def crud_get_multi(db, ids):
+    from app.crud import crud_transaction
+    from app.schemas.transaction import TransactionFilter
+    first_page = await crud_transaction.get_multi(db, limit=50)
+    await crud_transaction.get_multi(db, after=(first_page[-1].date, first_page[-1].id), limit=50)
+    for filters in (
+        TransactionFilter(account_id=ids["account"]),
+        TransactionFilter(category_id=ids["category"]),
+        TransactionFilter(**RANGE),
+        TransactionFilter(min_amount=Decimal(100), max_amount=Decimal(200)),
+        TransactionFilter(narration="swiggy"),
+    ):
+        await crud_transaction.get_multi(db, filters=filters, limit=50)
+
+
+async def crud_search(db, ids):
+    from app.crud import crud_transaction
+    from app.schemas.transaction import TransactionFilter
+    first_page = await crud_transaction.search(db, query="swiggy", limit=50)
+    await crud_transaction.search(db, query="swiggy", after=(first_page[-1][0], first_page[-1][1].date, first_page[-1][1].id), limit=50)
+    # Only prefix matches, from the second tier
+    await crud_transaction.search(db, query="swig", limit=50)
+    await crud_transaction.search(db, query="upi swiggy", filters=TransactionFilter(account_id=ids["account"], **RANGE), limit=50)
+
+
+async def crud_stream_export(db, ids):
+    from app.crud import crud_transaction
+    from app.schemas.transaction import TransactionFilter
+    for filters in (None, TransactionFilter(account_id=ids["account"], **RANGE)):
+        async for _ in crud_transaction.stream_export(db, filters=filters):
+            pass
+
+
+async def crud_create_update_remove(db, ids):
+    from app.crud import crud_transaction
+    from app.schemas.transaction import TransactionCreate, TransactionUpdate
+    transaction = await crud_transaction.create(db, TransactionCreate(
+        account_id=ids["account"], date=START, narration="PLAN-TEST", withdrawal_amount=Decimal(1)
+    ))
+    await crud_transaction.update(db, db_obj=transaction, obj_in=TransactionUpdate(
+        narration="PLAN-TEST-UPDATED", category_ids=[ids["category"]]
+    ))
+    await crud_transaction.remove(db, id=transaction.id)
+
+
+async def crud_update_many_remove_many(db, ids):
+    from app.crud import crud_transaction
+    from app.schemas.transaction import TransactionFilter, TransactionUpdate
+    selected = await crud_transaction.get_ids(db, filters=TransactionFilter(narration="swiggy"), limit=500)
+    await crud_transaction.update_many(db, ids=selected, obj_in=TransactionUpdate(
+        withdrawal_amount=Decimal(1), category_ids=[ids["category"]]
+    ))
+    await crud_transaction.remove_many(db, ids=selected[:100])
+
+
+async def crud_recategorization_run_batch(db, ids):
+    from app.crud import crud_category_rule, crud_recategorization
+    from app.schemas.category_rule import CategoryRuleCreate
+    from app.schemas.recategorization import RecategorizationCreate
+    from app.schemas.transaction import TransactionFilter
+    await crud_category_rule.create(db, CategoryRuleCreate(category_id=ids["category"], keyword="swiggy"))
+    for filters in (None, TransactionFilter(account_id=ids["account"])):
+        job = await crud_recategorization.create(db, RecategorizationCreate(filters=filters, reset_unmatched=True))
+        while job.status == "running":
+            job = await crud_recategorization.run_batch(db, job.id, batch_size=5000)
+
+
+# Analytics cases are keyed by route path so new endpoints must be added here
+ANALYTICS_CASES = {
+    "/expenses-by-category": analytics_expenses_by_category,
+    "/expenses-over-time": analytics_expenses_over_time,
+    "/dashboard": analytics_dashboard,
+    "/top-merchants": analytics_top_merchants,
+}
+CRUD_CASES = {
+    "get": crud_get,
+    "get_multi": crud_get_multi,
+    "search": crud_search,
+    "stream_export": crud_stream_export,
+    "create_update_remove": crud_create_update_remove,
+    "update_many_remove_many": crud_update_many_remove_many,
+}
+CASES = {**{f"analytics {path}": case for path, case in ANALYTICS_CASES.items()},
+         **{f"crud_transaction.{name}": case for name, case in CRUD_CASES.items()},
+         "crud_recategorization.run_batch": crud_recategorization_run_batch}
+
+
+async def create_database(url: str) -> None:
+    import asyncpg
+    from sqlalchemy.engine import make_url
+
+    target = make_url(url)
+    connection = await asyncpg.connect(
+        host=target.host, port=target.port, user=target.username, password=target.password, database="postgres"
+    )
+    try:
+        if not await connection.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", target.database):
+            await connection.execute(f'CREATE DATABASE "{target.database}"')
+    finally:
+        await connection.close()
+
+
+async def seed(engine) -> dict:
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.crud import crud_rollup
+    from app.db.base import Base
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(0)
+    async with engine.connect() as connection:
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        account_ids = [
+            await driver_connection.fetchval(
+                "INSERT INTO bankaccount (account_name, bank_name, account_type) VALUES ($1, 'Bank', 'debit') RETURNING id",
+                f"Account {i}",
+            )
+            for i in range(SEED_ACCOUNTS)
+        ]
+        category_ids = [
+            await driver_connection.fetchval("INSERT INTO category (name) VALUES ($1) RETURNING id", name)
+            for name in SEED_CATEGORIES
+        ]
+        merchant_ids = {
+            name: await driver_connection.fetchval(
+                "INSERT INTO merchant (key, name) VALUES ($1, $2) RETURNING id", name.lower(), name
+            )
+            for name in SEED_MERCHANTS
+        }
+        records = []
+        for i in range(SEED_TRANSACTIONS):
+            expense = rng.random() < 0.8
+            amount = Decimal(rng.randint(100, 500_000)).scaleb(-2)
+            merchant = rng.choice(SEED_MERCHANTS)
+            records.append((
+                i + 1,
+                rng.choice(account_ids),
+                START + timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+                f"UPI-{merchant}-{i}",
+                amount if expense else Decimal(0),
+                Decimal(0) if expense else amount,
+                merchant_ids[merchant],
+            ))
+        await driver_connection.copy_records_to_table(
+            "transaction",
+            records=records,
+            columns=("id", "account_id", "date", "narration", "withdrawal_amount", "deposit_amount", "merchant_id"),
+        )
+        await driver_connection.execute(
+            "SELECT setval(pg_get_serial_sequence('transaction', 'id'), $1)", SEED_TRANSACTIONS
+        )
+        await driver_connection.copy_records_to_table(
+            "transaction_category",
+            records=[(record[0], rng.choice(category_ids)) for record in records],
+            columns=("transaction_id", "category_id"),
+        )
+        await connection.commit()
+
+    async with AsyncSession(engine) as db:
+        await crud_rollup.rebuild(db)
+        await db.execute(text("ANALYZE"))
+        await db.commit()
+    return {"account": account_ids[0], "category": category_ids[1], "transaction": SEED_TRANSACTIONS // 2}
+
+
+async def collect_plans() -> dict:
+    """Run every case, returning {case name: [(statement, plan), ...]}."""
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import NullPool
+
+    url = database_url()
+    await create_database(url)
+    engine = create_async_engine(url, poolclass=NullPool)
+    try:
+        ids = await seed(engine)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(EXPLAINABLE):
+                # One set of parameters is enough to plan an executemany
+                statements.append((statement, parameters[0] if executemany else parameters))
+
+        plans = {}
+        for name, case in CASES.items():
+            statements.clear()
+            event.listen(engine.sync_engine, "before_cursor_execute", record)
+            try:
+                async with session_factory() as db:
+                    await case(db, ids)
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+            plans[name] = []
+            async with engine.connect() as connection:
+                await connection.exec_driver_sql("SET enable_seqscan = off")
+                for statement, parameters in list(statements):
+                    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                    plans[name].append((statement, result.scalar()[0]["Plan"]))
+        return plans
+    finally:
+        await engine.dispose()
+
+
+def sequential_scans(plan: dict):
+    """Relations in LARGE_TABLES read by a sequential scan anywhere in ``plan``."""
+    if "Seq Scan" in plan["Node Type"] and plan.get("Relation Name") in LARGE_TABLES:
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from sequential_scans(child)
+
+
+@pytest.fixture(scope="module")
+def plans():
+    pytest.importorskip("asyncpg")
+    try:
+        return asyncio.run(collect_plans())
+    except (OSError, ConnectionError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+
+def test_every_analytics_route_is_covered():
+    from app.api.v1.endpoints import analytics
+
+    assert {route.path for route in analytics.router.routes} == set(ANALYTICS_CASES)
+
+
+@pytest.mark.parametrize("case", list(CASES))
+def test_no_sequential_scans(plans, case):
+    assert plans[case], f"{case} issued no queries"
+    for statement, plan in plans[case]:
+        scanned = sorted(set(sequential_scans(plan)))
+        assert not scanned, f"{case} reads {', '.join(scanned)} with a sequential scan:\n{statement}"
@@ -0,0 +1,167 @@
+"""
+Tests for applying category rules to existing transactions.
+
+    pytest tests/test_recategorization.py
+
+The tests run crud_recategorization against a temporary SQLite database and
+are skipped when aiosqlite is not installed.
+"""
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.schemas.category_rule import CategoryRuleCreate
+from app.schemas.recategorization import RecategorizationCreate
+from app.schemas.transaction import TransactionCreate, TransactionFilter
+
+
+async def recategorize(database_url, reset_unmatched=False, overwrite=False, filters=None):
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.crud import crud_category_rule, crud_recategorization, crud_rollup, crud_table_version, crud_transaction
+    from app.db.base import Base
+    from app.models.account import AccountType, BankAccount
+    from app.models.category import Category, transaction_category
+    from app.models.transaction import Transaction
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def categories():
+        async with session_factory() as db:
+            result = await db.execute(
+                select(Transaction.narration, Category.name)
+                .join(transaction_category, transaction_category.c.transaction_id == Transaction.id)
+                .join(Category, Category.id == transaction_category.c.category_id)
+                .order_by(Transaction.id, Category.name)
+            )
+            return result.all()
+
+    def transaction(account_id, hour, narration, category_ids=None):
+        return TransactionCreate(
+            account_id=account_id,
+            date=datetime(2024, 4, 1, hour),
+            narration=narration,
+            withdrawal_amount=Decimal("100.00"),
+            deposit_amount=Decimal("0.00"),
+            category_ids=category_ids,
+        )
+
+    steps = {}
+    try:
+        async with session_factory() as db:
+            others, food, travel = Category(name="others"), Category(name="food"), Category(name="travel")
+            savings = BankAccount(account_name="Savings", bank_name="HDFC", account_type=AccountType.debit)
+            card = BankAccount(account_name="Card", bank_name="HDFC", account_type=AccountType.credit)
+            db.add_all([others, food, travel, savings, card])
+            await db.commit()
+
+        # Imported before there were rules, so everything is in 'others'
+        async with session_factory() as db:
+            await crud_transaction.create_bulk(db, [[
+                transaction(savings.id, 9, "UPI-SWIGGY-1"),
+                transaction(savings.id, 10, "UPI-UBER-2"),
+                transaction(card.id, 11, "POS SWIGGY INSTAMART"),
+                transaction(savings.id, 12, "ATM WDL"),
+            ]])
+        async with session_factory() as db:
+            await crud_transaction.create(db, transaction(savings.id, 13, "Dinner with Uber ride", [food.id, travel.id]))
+            await crud_transaction.create(db, transaction(savings.id, 14, "Gift", [food.id]))
+
+        async with session_factory() as db:
+            await crud_category_rule.create(db, CategoryRuleCreate(category_id=food.id, keyword="swiggy"))
+            await crud_category_rule.create(db, CategoryRuleCreate(category_id=travel.id, pattern=r"\buber\b"))
+            job = await crud_recategorization.create(
+                db, RecategorizationCreate(reset_unmatched=reset_unmatched, overwrite=overwrite, filters=filters)
+            )
+            versions = await crud_table_version.get_versions(db, [Transaction])
+
+        # Added after the job was created, and categorised by the rules already
+        async with session_factory() as db:
+            await crud_transaction.create(db, transaction(savings.id, 15, "UBER AUTO", [others.id]))
+
+        # One batch, then a pause: the job stops where it is
+        async with session_factory() as db:
+            job = await crud_recategorization.run_batch(db, job.id, batch_size=2)
+            await crud_recategorization.set_status(db, db_obj=job, status="paused")
+            job = await crud_recategorization.run_batch(db, job.id, batch_size=2)
+            steps["paused"] = (job.status, job.rows_scanned)
+
+        # Resumed in a new session, as after a restart
+        async with session_factory() as db:
+            job = await crud_recategorization.set_status(
+                db, db_obj=await crud_recategorization.get(db, job.id), status="running"
+            )
+            while job.status == "running":
+                job = await crud_recategorization.run_batch(db, job.id, batch_size=2)
+            steps["job"] = (job.status, job.rows_total, job.rows_scanned, job.rows_changed)
+            steps["bumped"] = (await crud_table_version.get_versions(db, [Transaction])) != versions
+            steps["mismatches"] = await crud_rollup.find_mismatches(db)
+        steps["categories"] = await categories()
+    finally:
+        await engine.dispose()
+    return steps
+
+
+def run_recategorization(tmp_path, **kwargs):
+    pytest.importorskip("aiosqlite")
+    return asyncio.run(recategorize(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", **kwargs))
+
+
+def test_rules_are_applied_to_existing_transactions(tmp_path):
+    steps = run_recategorization(tmp_path)
+
+    assert steps["paused"] == ("paused", 2)
+    assert steps["job"] == ("completed", 6, 6, 3)
+    assert steps["categories"] == [
+        ("UPI-SWIGGY-1", "food"),
+        ("UPI-UBER-2", "travel"),
+        ("POS SWIGGY INSTAMART", "food"),
+        # No rule matches, so the categories stay
+        ("ATM WDL", "others"),
+        # Chosen by hand, so the rules leave them alone
+        ("Dinner with Uber ride", "food"),
+        ("Dinner with Uber ride", "travel"),
+        ("Gift", "food"),
+        # Not part of the job
+        ("UBER AUTO", "others"),
+    ]
+    assert steps["bumped"]
+    assert steps["mismatches"] == []
+
+
+def test_overwrite_replaces_categories_chosen_by_hand(tmp_path):
+    steps = run_recategorization(tmp_path, overwrite=True)
+
+    assert steps["job"] == ("completed", 6, 6, 4)
+    assert ("Dinner with Uber ride", "travel") in steps["categories"]
+    assert ("Dinner with Uber ride", "food") not in steps["categories"]
+    assert ("Gift", "food") in steps["categories"]
+    assert steps["mismatches"] == []
+
+
+def test_reset_unmatched_moves_transactions_to_others(tmp_path):
+    # 'Gift' was put in 'food' by hand, so only with overwrite
+    steps = run_recategorization(tmp_path, reset_unmatched=True, overwrite=True)
+
+    assert steps["job"] == ("completed", 6, 6, 5)
+    assert ("Gift", "others") in steps["categories"]
+    assert steps["mismatches"] == []
+
+
+def test_filters_limit_the_transactions(tmp_path):
+    steps = run_recategorization(tmp_path, filters=TransactionFilter(account_id=2))
+
+    assert steps["job"] == ("completed", 1, 1, 1)
+    assert steps["categories"][:3] == [
+        ("UPI-SWIGGY-1", "others"),
+        ("UPI-UBER-2", "others"),
+        ("POS SWIGGY INSTAMART", "food"),
+    ]
+    assert steps["mismatches"] == []
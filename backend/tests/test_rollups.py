@@ -0,0 +1,146 @@
+"""
+Tests for the daily_category_rollup table.
+
+    pytest tests/test_rollups.py
+
+The tests run crud_transaction and crud_rollup against a temporary SQLite
+database and are skipped when aiosqlite is not installed.
+"""
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+
+
+async def change_transactions(database_url):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.future import select
+    from sqlalchemy.orm import sessionmaker
+
+    from app.crud import crud_category, crud_rollup, crud_transaction
+    from app.db.base import Base
+    from app.models.account import AccountType, BankAccount
+    from app.models.category import Category
+    from app.models.daily_category_rollup import DailyCategoryRollup
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def rollups():
+        async with session_factory() as db:
+            result = await db.execute(
+                select(DailyCategoryRollup.date, DailyCategoryRollup.category_id,
+                       DailyCategoryRollup.withdrawal_total, DailyCategoryRollup.transaction_count)
+                .where(DailyCategoryRollup.transaction_count != 0)
+                .order_by(DailyCategoryRollup.date, DailyCategoryRollup.category_id)
+            )
+            return result.all()
+
+    async def mismatches():
+        async with session_factory() as db:
+            return await crud_rollup.find_mismatches(db)
+
+    steps = {}
+    try:
+        async with session_factory() as db:
+            others, food = Category(name="others"), Category(name="food")
+            account = BankAccount(account_name="Savings", bank_name="HDFC", account_type=AccountType.debit)
+            db.add_all([others, food, account])
+            await db.commit()
+
+        async with session_factory() as db:
+            await crud_transaction.create_bulk(db, [[
+                TransactionCreate(
+                    account_id=account.id,
+                    date=datetime(2024, 4, day, 9 + i),
+                    narration=f"UPI-SWIGGY-{day}-{i}",
+                    withdrawal_amount=Decimal("10.00"),
+                    deposit_amount=Decimal("0.00"),
+                )
+                for day in (1, 2) for i in range(2)
+            ]])
+        steps["bulk"] = (await rollups(), await mismatches())
+
+        async with session_factory() as db:
+            created = await crud_transaction.create(db, TransactionCreate(
+                account_id=account.id,
+                date=datetime(2024, 4, 2, 18),
+                narration="SALARY",
+                withdrawal_amount=Decimal("0.00"),
+                deposit_amount=Decimal("500.00"),
+                category_ids=[food.id],
+            ))
+        steps["create"] = (await rollups(), await mismatches())
+
+        async with session_factory() as db:
+            db_obj = await crud_transaction.get(db, created.id)
+            await crud_transaction.update(db, db_obj=db_obj, obj_in=TransactionUpdate(
+                date=datetime(2024, 4, 3, 18),
+                withdrawal_amount=Decimal("25.00"),
+                deposit_amount=Decimal("0.00"),
+                category_ids=[food.id, others.id],
+            ))
+        steps["update"] = (await rollups(), await mismatches())
+
+        async with session_factory() as db:
+            await crud_transaction.remove(db, id=created.id)
+        steps["remove"] = (await rollups(), await mismatches())
+
+        async with session_factory() as db:
+            await crud_category.remove(db, id=others.id)
+        steps["remove category"] = (await rollups(), await mismatches())
+
+        async with session_factory() as db:
+            db.add(DailyCategoryRollup(
+                date=date(2024, 5, 1), account_id=account.id, category_id=food.id,
+                withdrawal_total=Decimal("1.00"), withdrawal_count=1,
+                deposit_total=Decimal(0), deposit_count=0, transaction_count=1,
+            ))
+            await db.commit()
+        stray = await mismatches()
+        async with session_factory() as db:
+            rebuilt = await crud_rollup.rebuild(db)
+        steps["rebuild"] = (await rollups(), await mismatches())
+    finally:
+        await engine.dispose()
+    return steps, stray, rebuilt
+
+
+def test_rollups_follow_every_change(tmp_path):
+    pytest.importorskip("aiosqlite")
+
+    steps, stray, rebuilt = asyncio.run(change_transactions(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"))
+
+    for step, (_, mismatches) in steps.items():
+        assert mismatches == [], step
+    # Categories are 1 = others, 2 = food; 0 totals every transaction
+    bulk = [
+        ("2024-04-01", 0, Decimal("20.00"), 2),
+        ("2024-04-01", 1, Decimal("20.00"), 2),
+        ("2024-04-02", 0, Decimal("20.00"), 2),
+        ("2024-04-02", 1, Decimal("20.00"), 2),
+    ]
+    assert [(str(d), c, w, n) for d, c, w, n in steps["bulk"][0]] == bulk
+    assert [(str(d), c, w, n) for d, c, w, n in steps["create"][0]] == [
+        *bulk[:2],
+        ("2024-04-02", 0, Decimal("20.00"), 3),
+        ("2024-04-02", 1, Decimal("20.00"), 2),
+        ("2024-04-02", 2, Decimal("0.00"), 1),
+    ]
+    assert [(str(d), c, w, n) for d, c, w, n in steps["update"][0]] == [
+        *bulk,
+        ("2024-04-03", 0, Decimal("25.00"), 1),
+        ("2024-04-03", 1, Decimal("25.00"), 1),
+        ("2024-04-03", 2, Decimal("25.00"), 1),
+    ]
+    assert [(str(d), c, w, n) for d, c, w, n in steps["remove"][0]] == bulk
+    assert [(str(d), c, w, n) for d, c, w, n in steps["remove category"][0]] == [bulk[0], bulk[2]]
+
+    assert [(m.category_id, m.stored_count, m.expected_count) for m in stray] == [(2, 1, None)]
+    assert rebuilt == 2
+    assert steps["rebuild"][0] == steps["remove category"][0]
@@ -0,0 +1,185 @@
+"""
+Tests for the statement parser service.
+
+These run without a server or database:
+
+    pytest tests/test_statement_parser.py
+"""
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import csv
+
+import openpyxl
+import pytest
+
+from app.services.statement_parser import extract_transactions, get_parse_plan, iter_transaction_batches
+from app.services.statement_readers import detect_file_kind, open_statement
+
+HEADER = ["Date", "Narration", "Chq./Ref.No.", "Value Dt", "Withdrawal Amt.", "Deposit Amt.", "Closing Balance"]
+
+ROWS = [
+    ["01/04/24", "UPI-SWIGGY-12345-PAYMENT", "0001", "01/04/24", 250.5, None, 9749.5],
+    [datetime(2024, 4, 2), "NEFT CR-SALARY APRIL", "0002", "02/04/24", None, "50,000.00", 59749.5],
+    ["03/04/24", "POS 4111XXXX AMAZON", "0003", "03/04/24", "1,200", None, 58549.5],
+]
+
+
+def make_format(**overrides):
+    config = {
+        "id": None,
+        "updated_at": None,
+        "format_name": "HDFC Bank Statement Format",
+        "bank_name": "HDFC Bank",
+        "data_start_row": 4,
+        "date_column": "A",
+        "narration_column": "B",
+        "withdrawal_column": "E",
+        "deposit_column": "F",
+    }
+    config.update(overrides)
+    return SimpleNamespace(**config)
+
+
+def write_statement(path, rows=ROWS):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["HDFC BANK Ltd."])
+    sheet.append(HEADER)
+    sheet.append(["*" * 8] * len(HEADER))
+    for row in rows:
+        sheet.append(row)
+    sheet.append(["*" * 8] * len(HEADER))
+    sheet.append(["STATEMENT SUMMARY :-"])
+    sheet.append(["Opening Balance", "Opening Balance", None, None, 10000])
+    workbook.save(path)
+    return str(path)
+
+
+def test_extracts_xlsx_rows(tmp_path):
+    path = write_statement(tmp_path / "statement.xlsx")
+
+    transactions = extract_transactions(path, make_format(), account_id=1)
+
+    assert [t.narration for t in transactions] == [row[1] for row in ROWS]
+    assert transactions[0].date == datetime(2024, 4, 1)
+    assert transactions[1].date == datetime(2024, 4, 2)
+    assert transactions[0].withdrawal_amount == Decimal("250.5")
+    assert transactions[1].deposit_amount == Decimal("50000.00")
+    assert transactions[2].withdrawal_amount == Decimal("1200")
+    assert transactions[0].metadata_ == {"source": "imported", "file": "statement.xlsx"}
+
+
+def test_resolves_header_names(tmp_path):
+    path = write_statement(tmp_path / "statement.xlsx")
+    statement_format = make_format(
+        date_column="Date",
+        narration_column="Narration",
+        withdrawal_column="Withdrawal Amt.",
+        deposit_column="Deposit Amt.",
+    )
+
+    by_name = extract_transactions(path, statement_format, account_id=1)
+    by_letter = extract_transactions(path, make_format(), account_id=1)
+
+    assert by_name == by_letter
+
+
+def test_parse_plans_are_cached_per_format_version(tmp_path):
+    path = write_statement(tmp_path / "statement.xlsx")
+    statement_format = make_format(id=7, updated_at=datetime(2024, 1, 1))
+
+    with open_statement(path) as reader:
+        plan = get_parse_plan(statement_format, reader)
+        assert get_parse_plan(statement_format, reader) is plan
+
+        # Editing the format bumps updated_at and compiles a fresh plan
+        statement_format.updated_at = datetime(2024, 1, 2)
+        statement_format.deposit_column = "G"
+        edited = get_parse_plan(statement_format, reader)
+
+    assert edited is not plan
+    assert (plan.deposit_col, edited.deposit_col) == (5, 6)
+
+
+
+def test_header_names_are_resolved_per_file(tmp_path):
+    statement_format = make_format(id=8, updated_at=datetime(2024, 1, 1), deposit_column="Deposit Amt.")
+    moved = HEADER[:5] + ["Closing Balance", "Deposit Amt."]
+    first = write_statement(tmp_path / "first.xlsx")
+    second = tmp_path / "second.xlsx"
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["HDFC BANK Ltd."])
+    workbook.active.append(moved)
+    workbook.save(second)
+
+    with open_statement(first) as reader:
+        first_plan = get_parse_plan(statement_format, reader)
+    with open_statement(str(second)) as reader:
+        second_plan = get_parse_plan(statement_format, reader)
+
+    assert (first_plan.deposit_col, second_plan.deposit_col) == (5, 6)
+
+
+@pytest.mark.parametrize("engine", ["row", "columnar"])
+def test_only_rows_without_a_date_are_separators(tmp_path, engine):
+    rows = ROWS + [["04/04/24", "-----", "0004", "04/04/24", 10, None, 0], ["-----", "UPI-X", None, None, 10, None, 0]]
+    path = write_statement(tmp_path / "statement.xlsx", rows)
+
+    narrations = []
+    for batch in iter_transaction_batches(path, make_format(), account_id=1, batch_size=100, engine=engine):
+        narrations += batch.narrations if engine == "columnar" else [t.narration for t in batch]
+
+    assert narrations == [row[1] for row in ROWS] + ["-----"]
+
+def test_engine_is_chosen_from_content(tmp_path):
+    # An .xlsx workbook uploaded with an .xls name still opens with openpyxl
+    path = write_statement(tmp_path / "mislabelled.xls")
+
+    assert detect_file_kind(path) == "xlsx"
+    assert len(extract_transactions(path, make_format(), account_id=1)) == len(ROWS)
+
+
+def test_rejects_unknown_content(tmp_path):
+    path = tmp_path / "statement.xls"
+    path.write_bytes(b"\x00\x01not a workbook")
+
+    with pytest.raises(Exception, match="Unsupported statement file format"):
+        extract_transactions(str(path), make_format(), account_id=1)
+
+
+def write_delimited(path, delimiter, encoding, rows=ROWS):
+    with open(path, "w", newline="", encoding=encoding) as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(["HDFC BANK Ltd."])
+        writer.writerow(HEADER)
+        writer.writerow(["*" * 8] * len(HEADER))
+        for row in rows:
+            writer.writerow(["" if value is None else value for value in row])
+        writer.writerow(["STATEMENT SUMMARY :-"])
+    return str(path)
+
+
+@pytest.mark.parametrize("delimiter,encoding", [(",", "utf-8"), (";", "cp1252"), ("\t", "utf-16")])
+def test_extracts_delimited_text(tmp_path, delimiter, encoding):
+    rows = [["02/04/24", "POS CAF\u00c9 COFFEE DAY", "0001", "02/04/24", "1,250.00", "", "0"]] + [
+        [row[0] if isinstance(row[0], str) else "02/04/24"] + row[1:] for row in ROWS
+    ]
+    path = write_delimited(tmp_path / "statement.csv", delimiter, encoding, rows)
+
+    assert detect_file_kind(path) == "csv"
+    transactions = extract_transactions(path, make_format(), account_id=1)
+
+    assert [t.narration for t in transactions] == [row[1] for row in rows]
+    assert transactions[0].withdrawal_amount == Decimal("1250.00")
+    assert transactions[0].date == datetime(2024, 4, 2)
+
+
+def test_batches_are_bounded(tmp_path):
+    rows = [["01/04/24", f"UPI-PAYEE{i}", str(i), "01/04/24", float(i + 1), None, 0] for i in range(25)]
+    path = write_statement(tmp_path / "statement.xlsx", rows)
+
+    batches = list(iter_transaction_batches(path, make_format(), account_id=1, batch_size=10))
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
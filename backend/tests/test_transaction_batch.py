@@ -0,0 +1,150 @@
+"""
+Tests for the batch transaction endpoints.
+
+    pytest tests/test_transaction_batch.py
+
+The tests call the transactions router with a temporary SQLite database and
+are skipped when aiosqlite is not installed.
+"""
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.schemas.transaction import TransactionBatchSelection, TransactionBatchUpdate, TransactionCreate
+
+
+def test_selection_needs_ids_or_filters():
+    with pytest.raises(ValueError):
+        TransactionBatchSelection()
+    with pytest.raises(ValueError):
+        TransactionBatchSelection(ids=[1], filters={"account_id": 1})
+    # Filters that match everything do not select anything by accident
+    with pytest.raises(ValueError):
+        TransactionBatchSelection(filters={})
+    with pytest.raises(ValueError):
+        TransactionBatchSelection(filters={"narration": "", "account_id": None})
+    assert TransactionBatchSelection(filters={"account_id": 1}).filters.account_id == 1
+
+
+@pytest.mark.parametrize("field", ["account_id", "date", "narration"])
+def test_batch_update_cannot_clear_required_fields(field):
+    with pytest.raises(ValueError):
+        TransactionBatchUpdate(ids=[1], changes={field: None})
+    assert TransactionBatchUpdate(ids=[1], changes={"withdrawal_amount": None}).changes.withdrawal_amount is None
+
+
+def test_batch_update_and_delete(tmp_path, monkeypatch):
+    pytest.importorskip("aiosqlite")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.api.v1.endpoints import transactions
+    from app.crud import crud_rollup, crud_transaction
+    from app.db.base import Base
+    from app.db.session import get_db
+    from app.models.account import AccountType, BankAccount
+    from app.models.category import Category, transaction_category
+    from app.models.transaction import Transaction
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def seed():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with session_factory() as db:
+            db.add_all([
+                Category(name="others"), Category(name="food"), Category(name="travel"),
+                BankAccount(account_name="Savings", bank_name="HDFC", account_type=AccountType.debit),
+            ])
+            await db.commit()
+        async with session_factory() as db:
+            await crud_transaction.create_bulk(db, [[
+                TransactionCreate(
+                    account_id=1,
+                    date=datetime(2024, 4, day, 9),
+                    narration=f"UPI-{merchant}-{day}",
+                    withdrawal_amount=Decimal("100.00"),
+                    deposit_amount=Decimal("0.00"),
+                )
+                for day, merchant in enumerate(["SWIGGY", "UBER", "SWIGGY", "AIRTEL"], start=1)
+            ]])
+
+    async def state():
+        async with session_factory() as db:
+            result = await db.execute(
+                select(Transaction.id, Transaction.narration, Transaction.withdrawal_amount, Category.name)
+                .outerjoin(transaction_category, transaction_category.c.transaction_id == Transaction.id)
+                .outerjoin(Category, Category.id == transaction_category.c.category_id)
+                .order_by(Transaction.id, Category.name)
+            )
+            return result.all(), await crud_rollup.find_mismatches(db)
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    asyncio.run(seed())
+    # Only the transactions router, so the app's startup does not need PostgreSQL
+    app = FastAPI()
+    app.include_router(transactions.router, prefix="/transactions")
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with TestClient(app) as client:
+            by_ids = client.post("/transactions/batch/update", json={
+                "ids": [3, 1, 99, 1],
+                "changes": {"withdrawal_amount": "250.00", "category_ids": [2, 3]},
+            })
+            by_filters = client.post("/transactions/batch/update", json={
+                "filters": {"narration": "uber"},
+                "changes": {"narration": "UPI-UBER-RIDE"},
+            })
+            missing_category = client.post("/transactions/batch/update", json={
+                "ids": [1], "changes": {"category_ids": [42]},
+            })
+            no_selection = client.post("/transactions/batch/delete", json={})
+            empty_filters = client.post("/transactions/batch/delete", json={"filters": {}})
+            null_narration = client.post("/transactions/batch/update", json={
+                "ids": [1], "changes": {"narration": None},
+            })
+            updated, updated_mismatches = asyncio.run(state())
+
+            monkeypatch.setattr(transactions, "MAX_BATCH_SIZE", 3)
+            too_many = client.post("/transactions/batch/delete", json={"filters": {"account_id": 1}})
+            deleted = client.post("/transactions/batch/delete", json={"ids": [4, 2, 5]})
+            remaining, remaining_mismatches = asyncio.run(state())
+    finally:
+        asyncio.run(engine.dispose())
+
+    assert by_ids.status_code == 200
+    assert by_ids.json() == {
+        "items": [{"id": 3, "status": "updated"}, {"id": 1, "status": "updated"}, {"id": 99, "status": "not_found"}],
+        "updated": 2,
+        "deleted": 0,
+        "not_found": 1,
+    }
+    assert by_filters.json()["items"] == [{"id": 2, "status": "updated"}]
+    assert missing_category.status_code == 404
+    assert no_selection.status_code == 422
+    assert empty_filters.status_code == 422
+    assert null_narration.status_code == 422
+    assert updated == [
+        (1, "UPI-SWIGGY-1", Decimal("250.00"), "food"),
+        (1, "UPI-SWIGGY-1", Decimal("250.00"), "travel"),
+        (2, "UPI-UBER-RIDE", Decimal("100.00"), "others"),
+        (3, "UPI-SWIGGY-3", Decimal("250.00"), "food"),
+        (3, "UPI-SWIGGY-3", Decimal("250.00"), "travel"),
+        (4, "UPI-AIRTEL-4", Decimal("100.00"), "others"),
+    ]
+    assert updated_mismatches == []
+
+    assert too_many.status_code == 400
+    assert deleted.json()["deleted"] == 2
+    assert deleted.json()["not_found"] == 1
+    assert [row.id for row in remaining] == [1, 1, 3, 3]
+    assert remaining_mismatches == []
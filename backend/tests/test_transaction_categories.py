@@ -82,7 +82,7 @@ async def main():
         # 3. Verify existing transactions
         print("4. Verifying existing transactions...")
         response = await client.get(f"{BASE_URL}/transactions/")
-        transactions = response.json()
+        transactions = response.json()["items"]
         
         # Check a few transactions
         count_others = 0
@@ -0,0 +1,115 @@
+"""
+Tests for streaming transaction exports.
+
+    pytest tests/test_transaction_export.py
+
+The tests export from a temporary SQLite database and are skipped when
+aiosqlite is not installed; the Parquet test also needs pyarrow.
+"""
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.schemas.transaction import ExportFormat, TransactionCreate, TransactionFilter
+
+
+async def export(database_url, format, filters=None):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.crud import crud_transaction
+    from app.db.base import Base
+    from app.models.account import AccountType, BankAccount
+    from app.models.category import Category
+    from app.services import transaction_export
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with session_factory() as db:
+            others, food, travel = Category(name="others"), Category(name="food"), Category(name="travel")
+            savings = BankAccount(account_name="Savings", bank_name="HDFC", account_type=AccountType.debit)
+            card = BankAccount(account_name="Card", bank_name="HDFC", account_type=AccountType.credit)
+            db.add_all([others, food, travel, savings, card])
+            await db.commit()
+
+        for day, account, categories, metadata in [
+            (1, savings, [food.id, travel.id], {"ref": "A1"}),
+            (2, savings, None, None),
+            (3, card, [food.id], None),
+            (4, savings, [food.id, travel.id, others.id], None),
+        ]:
+            async with session_factory() as db:
+                await crud_transaction.create(db, TransactionCreate(
+                    account_id=account.id,
+                    date=datetime(2024, 4, day, 9),
+                    narration=f"UPI-SWIGGY-{day}",
+                    withdrawal_amount=Decimal("10.50"),
+                    deposit_amount=Decimal("0.00"),
+                    category_ids=categories,
+                    metadata_=metadata,
+                ))
+
+        async with session_factory() as db:
+            # Batches of two rows split transactions with several categories across batches
+            batches = crud_transaction.stream_export(db, filters=filters, batch_size=2)
+            return b"".join([chunk async for chunk in transaction_export.encode(batches, format)])
+    finally:
+        await engine.dispose()
+
+
+def run_export(tmp_path, format, filters=None):
+    pytest.importorskip("aiosqlite")
+    return asyncio.run(export(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", format, filters))
+
+
+def test_ndjson_export_holds_every_transaction_once(tmp_path):
+    lines = run_export(tmp_path, ExportFormat.ndjson).decode().splitlines()
+
+    rows = [json.loads(line) for line in lines]
+    assert [row["narration"] for row in rows] == ["UPI-SWIGGY-4", "UPI-SWIGGY-3", "UPI-SWIGGY-2", "UPI-SWIGGY-1"]
+    assert [sorted(row["categories"]) for row in rows] == [
+        ["food", "others", "travel"], ["food"], ["others"], ["food", "travel"],
+    ]
+    assert rows[3]["metadata"] == {"ref": "A1"}
+    assert rows[3]["date"] == "2024-04-01T09:00:00"
+    assert rows[3]["withdrawal_amount"] == "10.50"
+
+
+def test_csv_export_applies_filters(tmp_path):
+    content = run_export(tmp_path, ExportFormat.csv, TransactionFilter(account_id=1, narration="swiggy-1"))
+
+    rows = list(csv.DictReader(io.StringIO(content.decode())))
+    assert len(rows) == 1
+    assert rows[0]["narration"] == "UPI-SWIGGY-1"
+    assert sorted(rows[0]["categories"].split("; ")) == ["food", "travel"]
+    assert json.loads(rows[0]["metadata"]) == {"ref": "A1"}
+    assert rows[0]["withdrawal_amount"] == "10.50"
+
+
+def test_csv_export_without_matches_is_only_a_header(tmp_path):
+    content = run_export(tmp_path, ExportFormat.csv, TransactionFilter(account_id=99))
+
+    assert content.decode().splitlines() == [
+        "id,date,account_id,narration,withdrawal_amount,deposit_amount,categories,metadata"
+    ]
+
+
+def test_parquet_export_reads_back(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    content = run_export(tmp_path, ExportFormat.parquet)
+
+    table = pq.read_table(io.BytesIO(content))
+    assert table.column("narration").to_pylist() == ["UPI-SWIGGY-4", "UPI-SWIGGY-3", "UPI-SWIGGY-2", "UPI-SWIGGY-1"]
+    assert sorted(table.column("categories").to_pylist()[0]) == ["food", "others", "travel"]
+    assert table.column("withdrawal_amount").to_pylist()[0] == Decimal("10.50")
+    assert table.column("date").to_pylist()[0] == datetime(2024, 4, 4, 9)
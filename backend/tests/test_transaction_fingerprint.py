@@ -0,0 +1,179 @@
+"""
+Tests for transaction fingerprints and duplicate-skipping bulk imports.
+
+    pytest tests/test_transaction_fingerprint.py
+
+The import tests run crud_transaction against a temporary SQLite database
+and are skipped when aiosqlite is not installed.
+"""
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services.transaction_fingerprint import FingerprintAssigner, format_amount, normalize_narration
+
+
+def make_row(narration="UPI-SWIGGY-PAYMENT", withdrawal=Decimal("250.00"), deposit=None, account_id=1):
+    return {
+        "account_id": account_id,
+        "date": datetime(2024, 4, 1),
+        "narration": narration,
+        "withdrawal_amount": withdrawal,
+        "deposit_amount": deposit,
+    }
+
+
+def test_narration_normalisation():
+    assert normalize_narration("  UPI-Swiggy\t\tPAYMENT \r\n") == "upi-swiggy payment"
+    # Only ASCII is folded, matching the SQL backfill
+    assert normalize_narration("CAFÉ") == "cafÉ"
+
+
+def test_amount_formatting():
+    assert format_amount(None) == "0.00"
+    assert format_amount(Decimal("0")) == "0.00"
+    assert format_amount(Decimal("12.5")) == "12.50"
+    assert format_amount(Decimal("12.345")) == "12.35"
+
+
+def test_equivalent_rows_share_a_fingerprint():
+    first = FingerprintAssigner()(make_row("UPI-SWIGGY-PAYMENT", Decimal("250")))
+    second = FingerprintAssigner()(make_row("  upi-swiggy-PAYMENT ", Decimal("250.00")))
+
+    assert first == second
+    assert FingerprintAssigner()(make_row(account_id=2)) != first
+    assert FingerprintAssigner()(make_row(withdrawal=None, deposit=Decimal("250"))) != first
+
+
+def test_repeated_rows_get_distinct_ordinals():
+    assign = FingerprintAssigner()
+    fingerprints = [assign(make_row()) for _ in range(3)]
+
+    assert len(set(fingerprints)) == 3
+    # A later import of the same rows reproduces the same sequence
+    replay = FingerprintAssigner()
+    assert [replay(make_row()) for _ in range(3)] == fingerprints
+
+
+async def import_twice(database_url):
+    from sqlalchemy import func, select
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.crud import crud_transaction
+    from app.db.base import Base
+    from app.models.category import Category, transaction_category
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    def statement(days):
+        return [[
+            TransactionCreate(
+                account_id=1,
+                date=datetime(2024, 4, day),
+                narration="UPI-SWIGGY-PAYMENT",
+                withdrawal_amount=Decimal("100.00"),
+                deposit_amount=Decimal("0.00"),
+            )
+            # Two identical transactions on each day
+            for day in days for _ in range(2)
+        ]]
+
+    try:
+        async with session_factory() as db:
+            db.add(Category(name="others"))
+            await db.commit()
+        async with session_factory() as db:
+            first = await crud_transaction.create_bulk(db, statement(range(1, 4)))
+        async with session_factory() as db:
+            # Overlaps the first statement on days 2 and 3
+            second = await crud_transaction.create_bulk(db, statement(range(2, 6)))
+        async with session_factory() as db:
+            categorised = await db.scalar(select(func.count()).select_from(transaction_category))
+    finally:
+        await engine.dispose()
+    return first, second, categorised
+
+
+def test_reimport_skips_known_rows(tmp_path):
+    pytest.importorskip("aiosqlite")
+
+    first, second, categorised = asyncio.run(import_twice(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"))
+
+    assert (first.count, first.skipped) == (6, 0)
+    assert (second.count, second.skipped) == (4, 4)
+    assert second.total_withdrawals == Decimal("400.00")
+    assert categorised == 10
+
+
+async def import_after_edits(database_url):
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.crud import crud_transaction
+    from app.db.base import Base
+    from app.models.category import Category
+    from app.models.transaction import Transaction
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    def transaction(day, narration):
+        return TransactionCreate(
+            account_id=1,
+            date=datetime(2024, 4, day),
+            narration=narration,
+            withdrawal_amount=Decimal("100.00"),
+            deposit_amount=Decimal("0.00"),
+        )
+
+    statement = [[transaction(1, "UPI-SWIGGY-PAYMENT"), transaction(2, "UPI-ZOMATO-PAYMENT")]]
+    steps = {}
+    try:
+        async with session_factory() as db:
+            db.add(Category(name="others"))
+            await db.commit()
+        async with session_factory() as db:
+            # Entered by hand before the statement was imported
+            manual = await crud_transaction.create(db, transaction(1, "UPI-SWIGGY-PAYMENT"))
+            steps["manual_fingerprint"] = manual.fingerprint
+        async with session_factory() as db:
+            steps["first"] = await crud_transaction.create_bulk(db, statement)
+        async with session_factory() as db:
+            imported = await crud_transaction.get(db, 3)
+            await crud_transaction.update(
+                db, db_obj=imported, obj_in=TransactionUpdate(narration="Zomato dinner", withdrawal_amount=Decimal("90.00"))
+            )
+        async with session_factory() as db:
+            steps["second"] = await crud_transaction.create_bulk(db, statement)
+            result = await db.execute(select(Transaction.narration, Transaction.fingerprint.is_not(None)).order_by(Transaction.id))
+            steps["rows"] = result.all()
+    finally:
+        await engine.dispose()
+    return steps
+
+
+def test_only_imported_rows_are_fingerprinted_and_edits_keep_them(tmp_path):
+    pytest.importorskip("aiosqlite")
+
+    steps = asyncio.run(import_after_edits(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"))
+
+    assert steps["manual_fingerprint"] is None
+    # A hand-made twin does not stop the imported row
+    assert (steps["first"].count, steps["first"].skipped) == (2, 0)
+    # The edited row still stands for its statement row
+    assert (steps["second"].count, steps["second"].skipped) == (0, 2)
+    assert steps["rows"] == [
+        ("UPI-SWIGGY-PAYMENT", False),
+        ("UPI-SWIGGY-PAYMENT", True),
+        ("Zomato dinner", True),
+    ]
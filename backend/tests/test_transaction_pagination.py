@@ -0,0 +1,108 @@
+"""
+Tests for keyset pagination and filtering of transactions.
+
+    pytest tests/test_transaction_pagination.py
+
+The query tests run crud_transaction.get_multi against a temporary SQLite
+database and are skipped when aiosqlite is not installed.
+"""
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.crud import crud_transaction
+from app.schemas.transaction import TransactionFilter
+
+
+def test_cursor_round_trip():
+    transaction = crud_transaction.Transaction(id=42, date=datetime(2024, 4, 1, 9, 30))
+
+    assert crud_transaction.decode_cursor(crud_transaction.encode_cursor(transaction)) == (datetime(2024, 4, 1, 9, 30), 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "MjAyNC0wNC0wMQ==", "eHx5"])
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValueError):
+        crud_transaction.decode_cursor(cursor)
+
+
+async def query_pages(database_url):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.db.base import Base
+    from app.models.account import AccountType, BankAccount
+    from app.models.category import Category
+    from app.models.transaction import Transaction
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with session_factory() as db:
+            food = Category(name="food")
+            accounts = [
+                BankAccount(account_name=name, bank_name="HDFC", account_type=AccountType.debit)
+                for name in ("Savings", "Salary")
+            ]
+            db.add_all([food, *accounts])
+            await db.flush()
+            for i in range(25):
+                db.add(Transaction(
+                    account_id=accounts[i % 2].id,
+                    # Five transactions a day, so pages split days
+                    date=datetime(2024, 4, 1 + i // 5),
+                    narration=f"UPI-{'SWIGGY' if i % 3 == 0 else 'UBER'}-{i}" + (" 100%" if i == 7 else ""),
+                    withdrawal_amount=Decimal(i),
+                    deposit_amount=Decimal(0),
+                    categories=[food] if i % 4 == 0 else [],
+                ))
+            await db.commit()
+
+        async def walk(filters=None, limit=4):
+            ids, after = [], None
+            while True:
+                async with session_factory() as db:
+                    page = await crud_transaction.get_multi(db, filters=filters, after=after, limit=limit)
+                ids.extend(transaction.id for transaction in page)
+                if len(page) < limit:
+                    return ids
+                after = (page[-1].date, page[-1].id)
+
+        async with session_factory() as db:
+            everything = await crud_transaction.get_multi(db, limit=100)
+
+        return {
+            "everything": [(transaction.date, transaction.id) for transaction in everything],
+            "walked": await walk(),
+            "account": await walk(TransactionFilter(account_id=accounts[1].id)),
+            "category": await walk(TransactionFilter(category_id=food.id)),
+            "dates": await walk(TransactionFilter(start_date=datetime(2024, 4, 2), end_date=datetime(2024, 4, 3))),
+            "amount": await walk(TransactionFilter(min_amount=Decimal(10), max_amount=Decimal(12))),
+            "narration": await walk(TransactionFilter(narration="swiggy")),
+            "escaped": await walk(TransactionFilter(narration="100%")),
+        }
+    finally:
+        await engine.dispose()
+
+
+def test_pages_and_filters(tmp_path):
+    pytest.importorskip("aiosqlite")
+
+    results = asyncio.run(query_pages(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"))
+
+    everything = results["everything"]
+    assert everything == sorted(everything, reverse=True)
+    newest_first = [id for _, id in everything]
+    # Transactions were inserted oldest first, so ids 1-25 map to i = 0-24
+    assert results["walked"] == newest_first
+    assert results["account"] == [id for id in newest_first if (id - 1) % 2 == 1]
+    assert results["category"] == [id for id in newest_first if (id - 1) % 4 == 0]
+    assert results["dates"] == [id for id in newest_first if 5 < id <= 15]
+    assert results["amount"] == [13, 12, 11]
+    assert results["narration"] == [id for id in newest_first if (id - 1) % 3 == 0]
+    assert results["escaped"] == [8]
@@ -0,0 +1,100 @@
+"""
+Tests for searching transaction narrations.
+
+    pytest tests/test_transaction_search.py
+
+The endpoint tests call the transactions router with a temporary SQLite
+database, which searches without the PostgreSQL index, and are skipped
+when aiosqlite is not installed.
+"""
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.crud.crud_transaction import search_terms
+from app.schemas.transaction import TransactionCreate
+
+
+def test_search_terms_split_like_the_index():
+    assert search_terms("UPI/Swiggy-1234") == ["upi", "swiggy", "1234"]
+    assert search_terms("  café_bill ") == ["café", "bill"]
+    assert search_terms("--") == []
+
+
+def test_search_pages_through_matches(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.api.v1.endpoints import transactions
+    from app.crud import crud_transaction
+    from app.db.base import Base
+    from app.db.session import get_db
+    from app.models.account import AccountType, BankAccount
+    from app.models.category import Category
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def seed():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with session_factory() as db:
+            db.add_all([
+                Category(name="others"),
+                BankAccount(account_name="Savings", bank_name="HDFC", account_type=AccountType.debit),
+                BankAccount(account_name="Card", bank_name="HDFC", account_type=AccountType.credit),
+            ])
+            await db.commit()
+        async with session_factory() as db:
+            await crud_transaction.create_bulk(db, [[
+                TransactionCreate(
+                    account_id=account_id,
+                    date=datetime(2024, 4, day, 9),
+                    narration=narration,
+                    withdrawal_amount=Decimal("100.00"),
+                    deposit_amount=Decimal("0.00"),
+                )
+                for day, (account_id, narration) in enumerate([
+                    (1, "UPI-SWIGGY-1"),
+                    (1, "UPI-UBER-2"),
+                    (2, "POS SWIGGY INSTAMART"),
+                    (1, "UPI/swiggy/4"),
+                    (1, "ATM WDL"),
+                ], start=1)
+            ]])
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    asyncio.run(seed())
+    # Only the transactions router, so the app's startup does not need PostgreSQL
+    app = FastAPI()
+    app.include_router(transactions.router, prefix="/transactions")
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with TestClient(app) as client:
+            first_page = client.get("/transactions/search", params={"q": "Swiggy", "limit": 2})
+            second_page = client.get(
+                "/transactions/search", params={"q": "Swiggy", "limit": 2, "cursor": first_page.json()["next_cursor"]}
+            )
+            all_words = client.get("/transactions/search", params={"q": "swiggy upi"})
+            filtered = client.get("/transactions/search", params={"q": "swiggy", "account_id": 2})
+            no_words = client.get("/transactions/search", params={"q": "--"})
+            bad_cursor = client.get("/transactions/search", params={"q": "swiggy", "cursor": "nope"})
+    finally:
+        asyncio.run(engine.dispose())
+
+    assert first_page.status_code == 200
+    assert [item["narration"] for item in first_page.json()["items"]] == ["UPI/swiggy/4", "POS SWIGGY INSTAMART"]
+    assert [item["narration"] for item in second_page.json()["items"]] == ["UPI-SWIGGY-1"]
+    assert second_page.json()["next_cursor"] is None
+    assert [item["id"] for item in all_words.json()["items"]] == [4, 1]
+    assert [item["id"] for item in filtered.json()["items"]] == [3]
+    assert no_words.json() == {"items": [], "next_cursor": None}
+    assert bad_cursor.status_code == 400
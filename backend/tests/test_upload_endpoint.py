@@ -23,6 +23,22 @@ BASE_URL = "http://localhost:8000/api/v1"
 TEST_FILE_PATH = "/home/abhijith/Downloads/Acct.xls"
 
 
+async def count_transactions(client: httpx.AsyncClient, account_id: int) -> int:
+    """Count an account's transactions by following page cursors."""
+    count, cursor = 0, None
+    while True:
+        params = {"account_id": account_id, "limit": 1000}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(f"{BASE_URL}/transactions/", params=params)
+        response.raise_for_status()
+        page = response.json()
+        count += len(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return count
+
+
 async def main():
     async with httpx.AsyncClient(timeout=60.0) as client:
         print("=" * 100)
@@ -90,15 +106,14 @@ async def main():
         
         # Step 4: Get initial transaction count
         print("Step 4: Getting initial transaction count...")
-        response = await client.get(f"{BASE_URL}/transactions/")
-        if response.status_code != 200:
-            print(f"❌ Failed to get transactions: {response.text}")
+        try:
+            initial_count = await count_transactions(client, account_id)
+        except httpx.HTTPStatusError as e:
+            print(f"❌ Failed to get transactions: {e.response.text}")
             # Clean up
             await client.delete(f"{BASE_URL}/statement-formats/{format_id}")
             await client.delete(f"{BASE_URL}/accounts/{account_id}")
             return
-        initial_transactions = response.json()
-        initial_count = len(initial_transactions)
         print(f"✓ Initial transaction count: {initial_count}")
         print()
         
@@ -123,7 +138,7 @@ async def main():
                 data=data
             )
         
-        if response.status_code != 200:
+        if response.status_code != 202:
             print(f"❌ Upload failed with status {response.status_code}")
             print(f"   Response: {response.text}")
             # Clean up
@@ -131,7 +146,31 @@ async def main():
             await client.delete(f"{BASE_URL}/accounts/{account_id}")
             return
         
-        result = response.json()
+        # The import runs in the background; poll the job until it finishes
+        job = response.json()
+        print(f"  Import job: {job['id']}")
+        while job["status"] in ("pending", "running"):
+            await asyncio.sleep(0.5)
+            job = (await client.get(f"{BASE_URL}/imports/{job['id']}")).json()
+            print(f"  {job['status']}: {job['rows_parsed']} parsed, {job['rows_inserted']} inserted, "
+                  f"{job['rows_skipped']} skipped "
+                  f"({job['rows_per_second']:,.0f} rows/s)")
+        
+        if job["status"] != "completed":
+            print(f"❌ Import failed: {'; '.join(job['errors'])}")
+            # Clean up
+            await client.delete(f"{BASE_URL}/statement-formats/{format_id}")
+            await client.delete(f"{BASE_URL}/accounts/{account_id}")
+            return
+        
+        result = {
+            "success": True,
+            "count": job["rows_inserted"],
+            "skipped": job["rows_skipped"],
+            "total_withdrawals": job["total_withdrawals"],
+            "total_deposits": job["total_deposits"],
+            "net": job["total_deposits"] - job["total_withdrawals"],
+        }
         print("✓ Upload successful!")
         print()
         
@@ -148,12 +187,11 @@ async def main():
         
         # Step 7: Verify transactions were created
         print("Step 6: Verifying transactions were created...")
-        response = await client.get(f"{BASE_URL}/transactions/")
-        if response.status_code != 200:
-            print(f"❌ Failed to get transactions: {response.text}")
+        try:
+            final_count = await count_transactions(client, account_id)
+        except httpx.HTTPStatusError as e:
+            print(f"❌ Failed to get transactions: {e.response.text}")
         else:
-            all_transactions = response.json()
-            final_count = len(all_transactions)
             new_transactions_count = final_count - initial_count
             print(f"✓ Final transaction count: {final_count}")
             print(f"  New transactions added: {new_transactions_count}")
@@ -167,9 +205,9 @@ async def main():
         # Step 8: Display sample transactions
         print("Step 7: Displaying sample imported transactions...")
         # Get transactions for this account
-        response = await client.get(f"{BASE_URL}/transactions/?limit=5")
+        response = await client.get(f"{BASE_URL}/transactions/", params={"account_id": account_id, "limit": 5})
         if response.status_code == 200:
-            sample_transactions = response.json()[:5]
+            sample_transactions = response.json()["items"]
             print(f"✓ Showing first {len(sample_transactions)} transactions:")
             print()
             for i, txn in enumerate(sample_transactions, 1):
@@ -221,8 +259,28 @@ async def main():
             print(f"⚠ Expected 404 error, got {response.status_code}")
         print()
         
-        # Step 11: Clean up
-        print("Step 10: Cleaning up test data...")
+        # Step 11: Test error handling - Invalid account ID
+        print("Step 10: Testing error handling (invalid account ID)...")
+        with open(test_file, "rb") as f:
+            files = {"file": (test_file.name, f, "application/vnd.ms-excel")}
+            data = {
+                "statement_format_id": format_id,
+                "account_id": 99999  # Non-existent ID
+            }
+            response = await client.post(
+                f"{BASE_URL}/transactions/upload",
+                files=files,
+                data=data
+            )
+        if response.status_code == 404:
+            print(f"✓ Correctly handled non-existent account")
+            print(f"  Error: {response.json()['detail']}")
+        else:
+            print(f"⚠ Expected 404 error, got {response.status_code}")
+        print()
+        
+        # Step 12: Clean up
+        print("Step 11: Cleaning up test data...")
         
         # Delete imported transactions
         response = await client.get(f"{BASE_URL}/transactions/")
@@ -12,9 +12,17 @@ export interface ExpensesByCategoryResponse {
     total_amount: number;
 }
 
+export type Granularity = 'auto' | 'day' | 'week' | 'month' | 'quarter' | 'year';
+
 export interface ExpenseOverTime {
-    date: string;
+    date: string;  // First day of the bucket
     amount: number;
+    days: number;  // Days with expenses in the bucket
+}
+
+export interface DashboardAnalytics {
+    by_category: ExpenseByCategory[];
+    over_time: ExpenseOverTime[];
 }
 
 export const getExpensesByCategory = async (startDate?: string, endDate?: string): Promise<ExpensesByCategoryResponse> => {
@@ -24,9 +32,26 @@ export const getExpensesByCategory = async (startDate?: string, endDate?: string
     return response.data;
 };
 
-export const getExpensesOverTime = async (startDate?: string, endDate?: string): Promise<ExpenseOverTime[]> => {
+export const getExpensesOverTime = async (
+    startDate?: string,
+    endDate?: string,
+    granularity: Granularity = 'day',
+    maxPoints?: number,
+): Promise<ExpenseOverTime[]> => {
     const response = await axios.get<ExpenseOverTime[]>(`${API_URL}/analytics/expenses-over-time`, {
-        params: { start_date: startDate, end_date: endDate },
+        params: { start_date: startDate, end_date: endDate, granularity, max_points: maxPoints },
+    });
+    return response.data;
+};
+
+export const getDashboardAnalytics = async (
+    startDate?: string,
+    endDate?: string,
+    granularity: Granularity = 'day',
+    maxPoints?: number,
+): Promise<DashboardAnalytics> => {
+    const response = await axios.get<DashboardAnalytics>(`${API_URL}/analytics/dashboard`, {
+        params: { start_date: startDate, end_date: endDate, granularity, max_points: maxPoints },
     });
     return response.data;
 };
@@ -12,6 +12,7 @@ export interface StatementFormat {
     narration_column: string;
     withdrawal_column: string;
     deposit_column: string;
+    date_format?: string | null;
     created_at: string;
     updated_at: string;
 }
@@ -24,6 +25,7 @@ export interface StatementFormatCreate {
     narration_column: string;
     withdrawal_column: string;
     deposit_column: string;
+    date_format?: string | null;
 }
 
 export interface StatementFormatUpdate {
@@ -34,6 +36,7 @@ export interface StatementFormatUpdate {
     narration_column?: string;
     withdrawal_column?: string;
     deposit_column?: string;
+    date_format?: string | null;
 }
 
 export const getStatementFormats = async (): Promise<StatementFormat[]> => {
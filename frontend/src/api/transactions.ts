@@ -33,17 +33,60 @@ export interface TransactionUpdate {
     metadata_?: Record<string, any>;
 }
 
+export interface TransactionFilters {
+    account_id?: number;
+    start_date?: string;
+    end_date?: string;
+    category_id?: number;
+    min_amount?: number;
+    max_amount?: number;
+    narration?: string;
+}
+
+export interface TransactionPage {
+    items: Transaction[];
+    next_cursor: string | null;
+}
+
 export interface UploadResult {
     success: boolean;
     count: number;
+    skipped: number;
+    duplicate: boolean;
     total_withdrawals: number;
     total_deposits: number;
     net: number;
 }
 
-export const getTransactions = async (skip = 0, limit = 100): Promise<Transaction[]> => {
+export interface ImportJob {
+    id: string;
+    status: 'pending' | 'running' | 'completed' | 'failed';
+    filename: string;
+    account_id: number;
+    statement_format_id: number;
+    sha256: string | null;
+    rows_parsed: number;
+    rows_inserted: number;
+    rows_skipped: number;
+    rows_per_second: number;
+    total_withdrawals: number;
+    total_deposits: number;
+    duplicate_of: number | null;
+    errors: string[];
+    created_at: string;
+    started_at: string | null;
+    finished_at: string | null;
+}
+
+const IMPORT_POLL_INTERVAL_MS = 500;
+
+export const getTransactions = async (
+    filters: TransactionFilters = {},
+    cursor: string | null = null,
+    limit = 100
+): Promise<TransactionPage> => {
     const response = await axios.get(`${API_URL}/transactions/`, {
-        params: { skip, limit }
+        params: { ...filters, cursor: cursor ?? undefined, limit }
     });
     return response.data;
 };
@@ -63,21 +106,47 @@ export const deleteTransaction = async (id: number): Promise<Transaction> => {
     return response.data;
 };
 
+export const getImportJob = async (id: string): Promise<ImportJob> => {
+    const response = await axios.get(`${API_URL}/imports/${id}`);
+    return response.data;
+};
+
 export const uploadTransactions = async (
     file: File,
     statementFormatId: number,
-    accountId: number
+    accountId: number,
+    onProgress?: (job: ImportJob) => void,
+    force = false
 ): Promise<UploadResult> => {
     const formData = new FormData();
     formData.append('file', file);
     formData.append('statement_format_id', statementFormatId.toString());
     formData.append('account_id', accountId.toString());
+    formData.append('force', force.toString());
 
     const response = await axios.post(`${API_URL}/transactions/upload`, formData, {
         headers: {
             'Content-Type': 'multipart/form-data',
         },
     });
-    return response.data;
-};
 
+    // The import runs in the background; poll the job until it finishes
+    let job: ImportJob = response.data;
+    while (job.status === 'pending' || job.status === 'running') {
+        onProgress?.(job);
+        await new Promise(resolve => setTimeout(resolve, IMPORT_POLL_INTERVAL_MS));
+        job = await getImportJob(job.id);
+    }
+    if (job.status === 'failed') {
+        throw new Error(job.errors.join('; ') || 'Import failed');
+    }
+    return {
+        success: true,
+        count: job.rows_inserted,
+        skipped: job.rows_skipped,
+        duplicate: job.duplicate_of !== null,
+        total_withdrawals: job.total_withdrawals,
+        total_deposits: job.total_deposits,
+        net: job.total_deposits - job.total_withdrawals,
+    };
+};
@@ -1,19 +1,30 @@
 import React, { useEffect, useState } from 'react';
-import {
-    getExpensesByCategory,
-    getExpensesOverTime
-} from '../api/analytics';
+import { getDashboardAnalytics } from '../api/analytics';
 import type {
-    ExpensesByCategoryResponse,
-    ExpenseOverTime
+    ExpenseByCategory,
+    ExpenseOverTime,
+    Granularity
 } from '../api/analytics';
 import ExpenseByCategoryChart from './charts/ExpenseByCategoryChart';
 import ExpenseOverTimeChart from './charts/ExpenseOverTimeChart';
 import { TrendingDown, PieChart, Calendar, DollarSign } from 'lucide-react';
 
+const GRANULARITIES: { value: Granularity; label: string }[] = [
+    { value: 'auto', label: 'Auto' },
+    { value: 'day', label: 'Daily' },
+    { value: 'week', label: 'Weekly' },
+    { value: 'month', label: 'Monthly' },
+    { value: 'quarter', label: 'Quarterly' },
+    { value: 'year', label: 'Yearly' },
+];
+
+// Most points the line chart can show apart at its width
+const MAX_CHART_POINTS = 400;
+
 const Dashboard: React.FC = () => {
-    const [byCategory, setByCategory] = useState<ExpensesByCategoryResponse | null>(null);
+    const [byCategory, setByCategory] = useState<ExpenseByCategory[]>([]);
     const [overTime, setOverTime] = useState<ExpenseOverTime[]>([]);
+    const [granularity, setGranularity] = useState<Granularity>('auto');
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
 
@@ -21,12 +32,9 @@ const Dashboard: React.FC = () => {
         const fetchData = async () => {
             try {
                 setLoading(true);
-                const [categoryData, timeData] = await Promise.all([
-                    getExpensesByCategory(),
-                    getExpensesOverTime()
-                ]);
-                setByCategory(categoryData);
-                setOverTime(timeData);
+                const data = await getDashboardAnalytics(undefined, undefined, granularity, MAX_CHART_POINTS);
+                setByCategory(data.by_category);
+                setOverTime(data.over_time);
             } catch (err) {
                 console.error('Error fetching dashboard data:', err);
                 setError('Failed to load dashboard data. Please make sure the backend is running.');
@@ -36,7 +44,10 @@ const Dashboard: React.FC = () => {
         };
 
         fetchData();
-    }, []);
+    }, [granularity]);
+
+    const daysTracked = overTime.reduce((days, point) => days + point.days, 0);
+    const totalAmount = byCategory.reduce((total, item) => total + item.amount, 0);
 
     if (loading) {
         return (
@@ -64,7 +75,7 @@ const Dashboard: React.FC = () => {
                     </div>
                     <div>
                         <p className="text-sm text-gray-500 font-medium">Total Expenses</p>
-                        <p className="text-2xl font-bold text-gray-900">${byCategory?.total_amount.toLocaleString()}</p>
+                        <p className="text-2xl font-bold text-gray-900">${totalAmount.toLocaleString()}</p>
                     </div>
                 </div>
 
@@ -74,7 +85,7 @@ const Dashboard: React.FC = () => {
                     </div>
                     <div>
                         <p className="text-sm text-gray-500 font-medium">Categories</p>
-                        <p className="text-2xl font-bold text-gray-900">{byCategory?.items.length}</p>
+                        <p className="text-2xl font-bold text-gray-900">{byCategory.length}</p>
                     </div>
                 </div>
 
@@ -84,7 +95,7 @@ const Dashboard: React.FC = () => {
                     </div>
                     <div>
                         <p className="text-sm text-gray-500 font-medium">Days Tracked</p>
-                        <p className="text-2xl font-bold text-gray-900">{overTime.length}</p>
+                        <p className="text-2xl font-bold text-gray-900">{daysTracked}</p>
                     </div>
                 </div>
 
@@ -95,7 +106,7 @@ const Dashboard: React.FC = () => {
                     <div>
                         <p className="text-sm text-gray-500 font-medium">Avg. Daily</p>
                         <p className="text-2xl font-bold text-gray-900">
-                            ${overTime.length > 0 ? (byCategory!.total_amount / overTime.length).toFixed(2) : '0'}
+                            ${daysTracked > 0 ? (totalAmount / daysTracked).toFixed(2) : '0'}
                         </p>
                     </div>
                 </div>
@@ -107,14 +118,25 @@ const Dashboard: React.FC = () => {
                         <PieChart className="mr-2 text-indigo-600" size={20} />
                         Expenses by Category
                     </h3>
-                    {byCategory && <ExpenseByCategoryChart data={byCategory.items} />}
+                    <ExpenseByCategoryChart data={byCategory} />
                 </div>
 
                 <div className="bg-white p-6 rounded-xl shadow-sm border border-gray-100">
-                    <h3 className="text-lg font-semibold text-gray-800 mb-6 flex items-center">
-                        <TrendingDown className="mr-2 text-indigo-600" size={20} />
-                        Expenses Over Time
-                    </h3>
+                    <div className="flex items-center justify-between mb-6">
+                        <h3 className="text-lg font-semibold text-gray-800 flex items-center">
+                            <TrendingDown className="mr-2 text-indigo-600" size={20} />
+                            Expenses Over Time
+                        </h3>
+                        <select
+                            value={granularity}
+                            onChange={(e) => setGranularity(e.target.value as Granularity)}
+                            className="border border-gray-300 rounded-md px-2 py-1 text-sm text-gray-700"
+                        >
+                            {GRANULARITIES.map(({ value, label }) => (
+                                <option key={value} value={value}>{label}</option>
+                            ))}
+                        </select>
+                    </div>
                     <ExpenseOverTimeChart data={overTime} />
                 </div>
             </div>
@@ -16,6 +16,7 @@ const StatementFormatForm: React.FC<StatementFormatFormProps> = ({ initialData,
         narration_column: '',
         withdrawal_column: '',
         deposit_column: '',
+        date_format: '',
     });
 
     useEffect(() => {
@@ -28,6 +29,7 @@ const StatementFormatForm: React.FC<StatementFormatFormProps> = ({ initialData,
                 narration_column: initialData.narration_column,
                 withdrawal_column: initialData.withdrawal_column,
                 deposit_column: initialData.deposit_column,
+                date_format: initialData.date_format || '',
             });
         }
     }, [initialData]);
@@ -42,7 +44,7 @@ const StatementFormatForm: React.FC<StatementFormatFormProps> = ({ initialData,
 
     const handleSubmit = (e: React.FormEvent) => {
         e.preventDefault();
-        onSubmit(formData);
+        onSubmit({ ...formData, date_format: formData.date_format || null });
     };
 
     return (
@@ -145,6 +147,19 @@ const StatementFormatForm: React.FC<StatementFormatFormProps> = ({ initialData,
                 </div>
             </div>
 
+            <div>
+                <label className="block text-sm font-medium text-gray-700">Date Format</label>
+                <input
+                    type="text"
+                    name="date_format"
+                    value={formData.date_format || ''}
+                    onChange={handleChange}
+                    placeholder="e.g., %d/%m/%y"
+                    className="mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring-blue-500 sm:text-sm p-2 border"
+                />
+                <p className="mt-1 text-xs text-gray-500">strptime format of text dates; detected from the file when left empty</p>
+            </div>
+
             <div className="flex justify-end space-x-3 pt-4">
                 <button
                     type="button"
@@ -1,13 +1,21 @@
 import React, { useEffect, useState } from 'react';
-import { Plus, Edit2, Trash2, Upload } from 'lucide-react';
+import { Plus, Edit2, Trash2, Upload, Search } from 'lucide-react';
 import { getTransactions, createTransaction, updateTransaction, deleteTransaction } from '../api/transactions';
-import type { Transaction, TransactionCreate, TransactionUpdate } from '../api/transactions';
+import type { Transaction, TransactionCreate, TransactionFilters, TransactionUpdate } from '../api/transactions';
+import { getAccounts, type Account } from '../api/accounts';
+import { getCategories, type Category } from '../api/categories';
 import TransactionForm from './TransactionForm';
 import TransactionUpload from './TransactionUpload';
 import ConfirmationModal from './ConfirmationModal';
 
 const TransactionList: React.FC = () => {
     const [transactions, setTransactions] = useState<Transaction[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [filters, setFilters] = useState<TransactionFilters>({});
+    const [draftFilters, setDraftFilters] = useState<TransactionFilters>({});
+    const [accounts, setAccounts] = useState<Account[]>([]);
+    const [categories, setCategories] = useState<Category[]>([]);
     const [isFormOpen, setIsFormOpen] = useState(false);
     const [isUploadOpen, setIsUploadOpen] = useState(false);
     const [editingTransaction, setEditingTransaction] = useState<Transaction | undefined>(undefined);
@@ -17,8 +25,9 @@ const TransactionList: React.FC = () => {
 
     const fetchTransactions = async () => {
         try {
-            const data = await getTransactions();
-            setTransactions(data);
+            const page = await getTransactions(filters);
+            setTransactions(page.items);
+            setNextCursor(page.next_cursor);
         } catch (err) {
             setError('Failed to fetch transactions');
             console.error(err);
@@ -27,10 +36,52 @@ const TransactionList: React.FC = () => {
         }
     };
 
+    const loadMore = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const page = await getTransactions(filters, nextCursor);
+            setTransactions(current => [...current, ...page.items]);
+            setNextCursor(page.next_cursor);
+        } catch (err) {
+            console.error('Failed to load more transactions', err);
+            alert('Failed to load more transactions');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         fetchTransactions();
+    }, [filters]);
+
+    useEffect(() => {
+        Promise.all([getAccounts(), getCategories()])
+            .then(([accountsData, categoriesData]) => {
+                setAccounts(accountsData);
+                setCategories(categoriesData);
+            })
+            .catch(err => console.error('Failed to load filter options', err));
     }, []);
 
+    const updateDraftFilter = (key: keyof TransactionFilters, value: string) => {
+        const numeric = ['account_id', 'category_id', 'min_amount', 'max_amount'].includes(key);
+        setDraftFilters(current => ({
+            ...current,
+            [key]: value === '' ? undefined : numeric ? Number(value) : value,
+        }));
+    };
+
+    const applyFilters = (e: React.FormEvent) => {
+        e.preventDefault();
+        setFilters(draftFilters);
+    };
+
+    const clearFilters = () => {
+        setDraftFilters({});
+        setFilters({});
+    };
+
     const handleCreate = async (data: TransactionCreate) => {
         try {
             await createTransaction(data);
@@ -143,6 +194,86 @@ const TransactionList: React.FC = () => {
                 onCancel={() => setDeleteId(null)}
             />
 
+            <form onSubmit={applyFilters} className="bg-white rounded-lg shadow p-4 grid grid-cols-1 md:grid-cols-4 gap-3">
+                <select
+                    value={draftFilters.account_id ?? ''}
+                    onChange={(e) => updateDraftFilter('account_id', e.target.value)}
+                    className="px-3 py-2 border border-gray-300 rounded-lg text-sm"
+                >
+                    <option value="">All accounts</option>
+                    {accounts.map((account) => (
+                        <option key={account.id} value={account.id}>
+                            {account.account_name} - {account.bank_name}
+                        </option>
+                    ))}
+                </select>
+                <select
+                    value={draftFilters.category_id ?? ''}
+                    onChange={(e) => updateDraftFilter('category_id', e.target.value)}
+                    className="px-3 py-2 border border-gray-300 rounded-lg text-sm"
+                >
+                    <option value="">All categories</option>
+                    {categories.map((category) => (
+                        <option key={category.id} value={category.id}>{category.name}</option>
+                    ))}
+                </select>
+                <input
+                    type="date"
+                    value={draftFilters.start_date ?? ''}
+                    onChange={(e) => updateDraftFilter('start_date', e.target.value)}
+                    className="px-3 py-2 border border-gray-300 rounded-lg text-sm"
+                    title="From date"
+                />
+                <input
+                    type="date"
+                    value={draftFilters.end_date ?? ''}
+                    onChange={(e) => updateDraftFilter('end_date', e.target.value)}
+                    className="px-3 py-2 border border-gray-300 rounded-lg text-sm"
+                    title="To date"
+                />
+                <input
+                    type="text"
+                    placeholder="Narration contains..."
+                    value={draftFilters.narration ?? ''}
+                    onChange={(e) => updateDraftFilter('narration', e.target.value)}
+                    className="px-3 py-2 border border-gray-300 rounded-lg text-sm md:col-span-2"
+                />
+                <input
+                    type="number"
+                    step="0.01"
+                    min="0"
+                    placeholder="Min amount"
+                    value={draftFilters.min_amount ?? ''}
+                    onChange={(e) => updateDraftFilter('min_amount', e.target.value)}
+                    className="px-3 py-2 border border-gray-300 rounded-lg text-sm"
+                />
+                <input
+                    type="number"
+                    step="0.01"
+                    min="0"
+                    placeholder="Max amount"
+                    value={draftFilters.max_amount ?? ''}
+                    onChange={(e) => updateDraftFilter('max_amount', e.target.value)}
+                    className="px-3 py-2 border border-gray-300 rounded-lg text-sm"
+                />
+                <div className="flex justify-end space-x-3 md:col-span-4">
+                    <button
+                        type="button"
+                        onClick={clearFilters}
+                        className="px-4 py-2 border border-gray-300 rounded-lg text-sm text-gray-700 hover:bg-gray-50"
+                    >
+                        Clear
+                    </button>
+                    <button
+                        type="submit"
+                        className="flex items-center px-4 py-2 bg-blue-600 text-white rounded-lg text-sm hover:bg-blue-700"
+                    >
+                        <Search size={16} className="mr-2" />
+                        Apply Filters
+                    </button>
+                </div>
+            </form>
+
             <div className="bg-white rounded-lg shadow overflow-hidden">
                 <table className="min-w-full divide-y divide-gray-200">
                     <thead className="bg-gray-50">
@@ -187,6 +318,20 @@ const TransactionList: React.FC = () => {
                         ))}
                     </tbody>
                 </table>
+                {transactions.length === 0 && (
+                    <div className="px-6 py-8 text-center text-sm text-gray-500">No transactions found</div>
+                )}
+                {nextCursor && (
+                    <div className="px-6 py-4 border-t border-gray-200 text-center">
+                        <button
+                            onClick={loadMore}
+                            disabled={loadingMore}
+                            className="px-4 py-2 border border-gray-300 rounded-lg text-sm text-gray-700 hover:bg-gray-50 disabled:opacity-50"
+                        >
+                            {loadingMore ? 'Loading...' : 'Load more'}
+                        </button>
+                    </div>
+                )}
             </div>
         </div>
     );
@@ -17,6 +17,8 @@ const TransactionUpload: React.FC<TransactionUploadProps> = ({ onSuccess, onCanc
     const [selectedAccountId, setSelectedAccountId] = useState<number | ''>('');
     const [uploading, setUploading] = useState(false);
     const [uploadResult, setUploadResult] = useState<UploadResult | null>(null);
+    const [rowsImported, setRowsImported] = useState(0);
+    const [forceImport, setForceImport] = useState(false);
     const [error, setError] = useState('');
 
     useEffect(() => {
@@ -41,8 +43,8 @@ const TransactionUpload: React.FC<TransactionUploadProps> = ({ onSuccess, onCanc
         const selectedFile = e.target.files?.[0];
         if (selectedFile) {
             // Validate file type
-            if (!selectedFile.name.endsWith('.xls') && !selectedFile.name.endsWith('.xlsx')) {
-                setError('Please select a valid Excel file (.xls or .xlsx)');
+            if (!/\.(xlsx?|csv|tsv)$/i.test(selectedFile.name)) {
+                setError('Please select a valid statement file (.xls, .xlsx, .csv or .tsv)');
                 return;
             }
             setFile(selectedFile);
@@ -69,13 +71,16 @@ const TransactionUpload: React.FC<TransactionUploadProps> = ({ onSuccess, onCanc
         }
 
         setUploading(true);
+        setRowsImported(0);
         setError('');
 
         try {
             const result = await uploadTransactions(
                 file,
                 Number(selectedFormatId),
-                Number(selectedAccountId)
+                Number(selectedAccountId),
+                job => setRowsImported(job.rows_inserted + job.rows_skipped),
+                forceImport
             );
             setUploadResult(result);
 
@@ -84,7 +89,7 @@ const TransactionUpload: React.FC<TransactionUploadProps> = ({ onSuccess, onCanc
                 onSuccess();
             }, 3000);
         } catch (err: any) {
-            setError(err.response?.data?.detail || 'Failed to upload file');
+            setError(err.response?.data?.detail || err.message || 'Failed to upload file');
             console.error(err);
         } finally {
             setUploading(false);
@@ -112,11 +117,22 @@ const TransactionUpload: React.FC<TransactionUploadProps> = ({ onSuccess, onCanc
                     </div>
                     <div className="text-center">
                         <h4 className="text-xl font-bold text-gray-800 mb-4">Upload Successful!</h4>
+                        {uploadResult.duplicate && (
+                            <p className="text-sm text-gray-600 mb-4">
+                                This file was imported before, so nothing new was added. Showing the earlier import.
+                            </p>
+                        )}
                         <div className="bg-gray-50 rounded-lg p-4 space-y-2">
                             <div className="flex justify-between">
                                 <span className="text-gray-600">Transactions Imported:</span>
                                 <span className="font-bold">{uploadResult.count}</span>
                             </div>
+                            {uploadResult.skipped > 0 && (
+                                <div className="flex justify-between">
+                                    <span className="text-gray-600">Already Imported (Skipped):</span>
+                                    <span className="font-bold text-gray-500">{uploadResult.skipped}</span>
+                                </div>
+                            )}
                             <div className="flex justify-between">
                                 <span className="text-gray-600">Total Withdrawals:</span>
                                 <span className="font-bold text-red-600">₹{uploadResult.total_withdrawals.toLocaleString('en-IN', { minimumFractionDigits: 2 })}</span>
@@ -218,13 +234,13 @@ const TransactionUpload: React.FC<TransactionUploadProps> = ({ onSuccess, onCanc
                                                     name="file-upload"
                                                     type="file"
                                                     className="sr-only"
-                                                    accept=".xls,.xlsx"
+                                                    accept=".xls,.xlsx,.csv,.tsv"
                                                     onChange={handleFileChange}
                                                 />
                                             </label>
                                             <p className="pl-1">or drag and drop</p>
                                         </div>
-                                        <p className="text-xs text-gray-500">Excel files only (.xls, .xlsx)</p>
+                                        <p className="text-xs text-gray-500">Excel or CSV files (.xls, .xlsx, .csv, .tsv)</p>
                                     </>
                                 )}
                             </div>
@@ -240,6 +256,16 @@ const TransactionUpload: React.FC<TransactionUploadProps> = ({ onSuccess, onCanc
                         )}
                     </div>
 
+                    <label className="flex items-center space-x-2 text-sm text-gray-700">
+                        <input
+                            type="checkbox"
+                            checked={forceImport}
+                            onChange={(e) => setForceImport(e.target.checked)}
+                            className="rounded border-gray-300"
+                        />
+                        <span>Import again even if this file was uploaded before</span>
+                    </label>
+
                     {/* Action Buttons */}
                     <div className="flex justify-end space-x-3 pt-4">
                         <button
@@ -261,7 +287,7 @@ const TransactionUpload: React.FC<TransactionUploadProps> = ({ onSuccess, onCanc
                                         <circle className="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" strokeWidth="4"></circle>
                                         <path className="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4zm2 5.291A7.962 7.962 0 014 12H0c0 3.042 1.135 5.824 3 7.938l3-2.647z"></path>
                                     </svg>
-                                    Uploading...
+                                    {rowsImported > 0 ? `Importing... ${rowsImported.toLocaleString()} rows` : 'Uploading...'}
                                 </>
                             ) : (
                                 <>
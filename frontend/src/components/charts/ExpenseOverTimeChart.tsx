@@ -41,7 +41,8 @@ const ExpenseOverTimeChart: React.FC<Props> = ({ data }) => {
         // Add X axis
         g.append('g')
             .attr('transform', `translate(0, ${height})`)
-            .call(d3.axisBottom(x).ticks(width / 80).tickFormat(d3.timeFormat('%b %d') as any))
+            // Default multi-scale labels suit daily through yearly buckets
+            .call(d3.axisBottom(x).ticks(width / 80))
             .selectAll('text')
             .style('text-anchor', 'end')
             .attr('dx', '-.8em')